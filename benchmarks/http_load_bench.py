@@ -0,0 +1,227 @@
+"""HTTP 모드(gunicorn + wsgi.py) 부하 벤치마크
+
+gunicorn.conf.py 설정 그대로 봇을 띄우고, 서명한 버튼 클릭(block_actions) 요청을 동시에 보내
+워커 수별 처리량(초당 ack 수)과 ack 지연 시간을 측정합니다. 봇의 Slack Web API 호출(auth.test,
+chat.postMessage)은 slack_http_bench의 로컬 Slack API 서버로 보내고, 로그/이벤트 저장소/상태 저장소는
+임시 디렉터리에 쓰고 측정 후 지웁니다.
+
+    python benchmarks/http_load_bench.py --workers 1,4 --requests 2000 --concurrency 16
+"""
+import os
+import sys
+import hmac
+import json
+import time
+import socket
+import shutil
+import signal
+import hashlib
+import argparse
+import tempfile
+import threading
+import subprocess
+import http.client
+from urllib.parse import urlencode
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+SIGNING_SECRET = "bench-signing-secret"
+READY_TIMEOUT_SECONDS = 60
+
+
+def make_application():
+    """gunicorn 앱 팩토리: 봇의 Slack API 호출을 로컬 서버로 보내도록 설정한 뒤 wsgi 로드"""
+    from slack_http import PooledWebClient
+
+    base_url = os.environ["BENCH_SLACK_API_URL"]
+    original = PooledWebClient.__init__
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault("base_url", base_url)
+        original(self, *args, **kwargs)
+
+    PooledWebClient.__init__ = __init__
+    import wsgi
+    return wsgi.application
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def signed_click(i: int):
+    """과정 선택 버튼 클릭 요청 -> (본문, 헤더) (요청마다 사용자/메시지가 달라 중복 제거에 걸리지 않음)"""
+    payload = {
+        "type": "block_actions",
+        "user": {"id": f"UBENCH{i % 500}"},
+        "team": {"id": "TBENCH"},
+        "api_app_id": "ABENCH",
+        "channel": {"id": "CBENCH"},
+        "container": {"message_ts": f"{i}.000000"},
+        "trigger_id": f"trigger-{i}",
+        "actions": [{"action_id": "select_bda_course", "value": "BDA 과정", "type": "button",
+                     "block_id": "courses", "action_ts": f"{time.time():.6f}"}],
+    }
+    body = urlencode({"payload": json.dumps(payload, ensure_ascii=False)})
+    timestamp = str(int(time.time()))
+    digest = hmac.new(SIGNING_SECRET.encode(), f"v0:{timestamp}:{body}".encode(), hashlib.sha256).hexdigest()
+    headers = {
+        "Content-Type": "application/x-www-form-urlencoded",
+        "X-Slack-Request-Timestamp": timestamp,
+        "X-Slack-Signature": f"v0={digest}",
+    }
+    return body, headers
+
+
+def wait_ready(port: int, proc) -> bool:
+    deadline = time.monotonic() + READY_TIMEOUT_SECONDS
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            return False
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/readyz")
+            if conn.getresponse().status == 200:
+                return True
+        except OSError:
+            pass
+        time.sleep(0.2)
+    return False
+
+
+def run_load(port: int, requests: int, concurrency: int):
+    """keep-alive 연결로 요청을 동시에 보내 ack 지연 시간 측정"""
+    latencies = []
+    errors = {"count": 0}
+    lock = threading.Lock()
+    local = threading.local()
+
+    def send(i):
+        body, headers = signed_click(i)
+        started = time.perf_counter()
+        try:
+            conn = getattr(local, "conn", None)
+            if conn is None:
+                conn = local.conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+            conn.request("POST", "/slack/events", body=body, headers=headers)
+            resp = conn.getresponse()
+            resp.read()
+            ok = resp.status == 200
+        except (OSError, http.client.HTTPException):
+            local.conn = None
+            ok = False
+        elapsed = (time.perf_counter() - started) * 1000
+        with lock:
+            if ok:
+                latencies.append(elapsed)
+            else:
+                errors["count"] += 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(send, range(requests)))
+    total = time.perf_counter() - started
+    latencies.sort()
+    result = {"requests": requests, "errors": errors["count"], "seconds": round(total, 3),
+              "acks_per_second": round(len(latencies) / total, 1)}
+    if latencies:
+        result.update({
+            "mean_ms": round(sum(latencies) / len(latencies), 2),
+            "p50_ms": round(latencies[len(latencies) // 2], 2),
+            "p95_ms": round(latencies[int(len(latencies) * 0.95)], 2),
+            "p99_ms": round(latencies[int(len(latencies) * 0.99)], 2),
+        })
+    return result
+
+
+def run_workers(workers: int, args, base_url: str) -> dict:
+    """gunicorn을 워커 수만큼 띄워 측정하고 종료"""
+    port = free_port()
+    log_dir = tempfile.mkdtemp(prefix="http-load-bench-logs-")
+    env = dict(os.environ, HTTP_WORKERS=str(workers), HTTP_THREADS=str(args.threads), HTTP_BIND=f"127.0.0.1:{port}",
+               FAQ_BOT_MODULE=args.bot, SLACK_SIGNING_SECRET1=SIGNING_SECRET, SLACK_SIGNING_SECRET2=SIGNING_SECRET,
+               SLACK_BOT_TOKEN1="xoxb-bench", SLACK_BOT_TOKEN2="xoxb-bench", BENCH_SLACK_API_URL=base_url,
+               LOG_ARCHIVE_ENABLED="false", LOG_DIR=log_dir,
+               EVENT_STORE_PATH=os.path.join(log_dir, "events.db"),
+               STATE_DB_PATH=os.path.join(log_dir, "state.db"),
+               POPULARITY_SNAPSHOT_PATH=os.path.join(log_dir, "popularity.json"),
+               PROFILE_DIR=os.path.join(log_dir, "profiles"))
+    if args.state_backend:
+        env["STATE_BACKEND"] = args.state_backend
+    command = [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "--pythonpath", "benchmarks",
+               "http_load_bench:make_application()"]
+    # gunicorn.conf.py와 봇 모듈이 data/의 FAQ 파일을 읽도록 저장소 루트에서 실행
+    # 요청마다 콘솔 로그가 나오므로 파이프 대신 파일로 받음 (파이프가 차면 워커가 멈춤)
+    console_path = os.path.join(log_dir, "gunicorn.log")
+    with open(console_path, "w") as console:
+        proc = subprocess.Popen(command, cwd=ROOT, env=env, stdout=console, stderr=subprocess.STDOUT)
+    try:
+        if not wait_ready(port, proc):
+            proc.kill()
+            proc.wait()
+            with open(console_path, errors="replace") as f:
+                error = (f.read().strip().splitlines() or ["gunicorn이 준비되지 않았습니다"])[-1]
+            return {"workers": workers, "error": error}
+        # 워커마다 첫 요청에서 만드는 연결 등을 제외하도록 먼저 데워 둠
+        run_load(port, args.warmup, args.concurrency)
+        result = {"workers": workers}
+        result.update(run_load(port, args.requests, args.concurrency))
+        return result
+    finally:
+        if proc.poll() is None:
+            proc.send_signal(signal.SIGTERM)
+            try:
+                proc.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+        shutil.rmtree(log_dir, ignore_errors=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="HTTP 모드(gunicorn) 부하 벤치마크")
+    parser.add_argument("--workers", default="1,4", help="측정할 gunicorn 워커 수 목록 (기본 1,4)")
+    parser.add_argument("--threads", type=int, default=4, help="워커당 스레드 수 (HTTP_THREADS)")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--bot", default="main_case2", help="실행할 봇 모듈 (FAQ_BOT_MODULE)")
+    parser.add_argument("--state-backend", choices=["memory", "sqlite"],
+                        help="상태 저장소 (기본: gunicorn.conf.py 설정, 워커가 여러 개면 sqlite)")
+    parser.add_argument("--latency-ms", type=float, default=5, help="로컬 Slack API 서버 응답 지연 (기본 5ms)")
+    parser.add_argument("--json", action="store_true", help="JSON으로 출력")
+    args = parser.parse_args(argv)
+
+    from slack_http_bench import start_stand_in
+
+    server, _ = start_stand_in(args.latency_ms, handshake_ms=0)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/api/"
+    try:
+        results = [run_workers(int(workers), args, base_url) for workers in args.workers.split(",")]
+    finally:
+        server.shutdown()
+
+    report = {
+        "settings": {key: getattr(args, key) for key in ("threads", "requests", "concurrency", "bot",
+                                                         "state_backend", "latency_ms")},
+        "results": results,
+    }
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+        return 0
+    print(f"{'workers':<10}{'errors':>8}{'mean':>10}{'p50':>10}{'p95':>10}{'p99':>10}{'acks/s':>10}")
+    for result in results:
+        if "error" in result:
+            print(f"{result['workers']:<10}  실패: {result['error']}")
+            continue
+        print(f"{result['workers']:<10}{result['errors']:>8}{result.get('mean_ms', 0):>10.2f}"
+              f"{result.get('p50_ms', 0):>10.2f}{result.get('p95_ms', 0):>10.2f}{result.get('p99_ms', 0):>10.2f}"
+              f"{result['acks_per_second']:>10.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,368 @@
+"""FAQ 조회/화면 생성 확장성 벤치마크 (합성 코퍼스 1천 ~ 100만 항목)
+
+data/*.json과 같은 형식(question/category/answer{title,items}/course)의 합성 한국어 FAQ를 만들고
+크기별로 로드 시간, 스냅샷/검색 인덱스 생성 시간, 메모리, 검색어 종류별 지연,
+과정(카테고리 선택)/카테고리(질문 선택)/홈 화면의 필터·생성 지연을 측정합니다.
+크기마다 별도 프로세스에서 메모리 상한을 두고 실행해 메모리를 따로 재고(상한을 넘는 크기는 실패로 기록),
+결과는 benchmarks/results/(git 제외)에 JSON 파일로 저장해 버전 간에 비교합니다.
+
+    python benchmarks/retrieval_bench.py
+    python benchmarks/retrieval_bench.py --sizes 1000,10000 --output benchmarks/results/quick.json
+    python benchmarks/retrieval_bench.py --compare before.json after.json
+"""
+import os
+import sys
+import json
+import math
+import time
+import random
+import shutil
+import platform
+import argparse
+import tempfile
+import importlib
+import subprocess
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from faq_store import FAQStore, FAQ_FILES  # noqa: E402
+from faq_search import QuestionIndex, normalize_words, CHOSEONG  # noqa: E402
+
+DEFAULT_SIZES = "1000,10000,100000,1000000"
+# 크기별 프로세스 메모리 상한 기본값 (100만 개에서 메모리가 부족하면 OOM 종료 대신 실패로 기록)
+DEFAULT_MEMORY_LIMIT_MB = 4096
+# 결과 파일 기본 위치 (저장소 루트 기준, .gitignore에 포함)
+DEFAULT_OUTPUT = os.path.join(ROOT, "benchmarks", "results", "retrieval_bench.json")
+# 비교 시 변화율을 보여줄 지표 (결과 JSON 경로)
+COMPARE_METRICS = [
+    ("load_ms",), ("snapshot_ms",), ("index_ms",), ("rss_mb", "total"),
+    ("queries", "prefix", "p50_us"), ("queries", "jamo", "p50_us"), ("queries", "phrase", "p50_us"),
+    ("screens", "filter", "p50_us"), ("screens", "categories", "p50_us"),
+    ("screens", "questions", "p50_us"), ("screens", "home", "p50_us"), ("screens", "cached", "p50_us"),
+]
+
+
+def rss_mb() -> float:
+    """현재 프로세스 메모리(RSS, MB)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+    except OSError:
+        import resource
+        # /proc이 없으면 최대 RSS로 대신함 (macOS는 bytes, Linux는 KB)
+        usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return usage / 1024 / 1024 if sys.platform == "darwin" else usage / 1024
+
+
+def load_templates():
+    """실제 FAQ 데이터 (합성 항목의 카테고리/답변 형식과 단어를 가져옴)"""
+    templates = []
+    for path in FAQ_FILES:
+        with open(os.path.join(ROOT, path), encoding="utf-8") as f:
+            templates.extend(json.load(f))
+    return templates
+
+
+def generate_corpus(size: int, per_course: int, seed: int):
+    """실제 FAQ를 바탕으로 단어를 섞어 만든 합성 FAQ (하나씩 생성)
+
+    과정 수는 size / per_course(최소 2개: AI, BDA)로 늘려 과정을 추가로 받는 상황을 재현하고,
+    카테고리와 답변 형식은 실제 데이터에서 가져옵니다.
+    """
+    rng = random.Random(seed)
+    templates = load_templates()
+    vocabulary = sorted({word for faq in templates for word in normalize_words(faq["question"]) if len(word) > 1})
+    courses = ["AI 과정", "BDA 과정"]
+    courses += [f"신규{i} 과정" for i in range(1, max(2, math.ceil(size / per_course)) - 1)]
+    for i in range(size):
+        template = templates[i % len(templates)]
+        words = template["question"].split()
+        # 단어 몇 개를 바꾸고 일련번호를 붙여 질문이 서로 다르도록 함
+        for _ in range(rng.randint(1, 3)):
+            words[rng.randrange(len(words))] = rng.choice(vocabulary)
+        answer = template["answer"]
+        if isinstance(answer, dict):
+            answer = {"title": f"{answer['title']} #{i}", "items": list(answer["items"])}
+        yield {
+            "question": f"{' '.join(words)} {rng.choice(vocabulary)}{i}",
+            "category": template["category"],
+            "answer": answer,
+            "course": courses[i % len(courses)],
+        }
+
+
+def write_corpus(path: str, size: int, per_course: int, seed: int):
+    """합성 FAQ를 항목 단위로 JSON 배열 파일에 기록 (100만 개도 코퍼스 전체를 메모리에 두지 않음)"""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("[")
+        for i, faq in enumerate(generate_corpus(size, per_course, seed)):
+            f.write(",\n" if i else "\n")
+            f.write(json.dumps(faq, ensure_ascii=False))
+        f.write("\n]")
+
+
+def make_queries(snapshot, count: int, seed: int):
+    """검색어 종류별 목록: 음절 접두사, 단어, 입력 중(자모), 여러 단어, 없는 단어"""
+    rng = random.Random(seed)
+    courses = list(snapshot.course_ids)
+    queries = {"prefix": [], "word": [], "jamo": [], "phrase": [], "miss": []}
+    while len(queries["miss"]) < count:
+        course = rng.choice(courses)
+        words = normalize_words(snapshot.data[rng.choice(snapshot.course_ids[course])]["question"])
+        word = rng.choice(words)
+        queries["prefix"].append((course, word[:rng.randint(1, 2)]))
+        queries["word"].append((course, word))
+        # "출석" -> "출ㅅ": 마지막 음절의 초성만 입력한 상태
+        syllable = word[1] if len(word) > 1 else word[0]
+        if "가" <= syllable <= "힣":
+            queries["jamo"].append((course, word[0] + CHOSEONG[(ord(syllable) - 0xAC00) // 588]))
+        queries["phrase"].append((course, " ".join(rng.sample(words, min(2, len(words))))))
+        queries["miss"].append((course, f"없는검색어{rng.randint(0, 10 ** 6)}"))
+    return queries
+
+
+def percentiles(samples_us):
+    samples_us = sorted(samples_us)
+    if not samples_us:
+        return {}
+    return {
+        "count": len(samples_us),
+        "mean_us": round(sum(samples_us) / len(samples_us), 1),
+        "p50_us": round(samples_us[len(samples_us) // 2], 1),
+        "p95_us": round(samples_us[int(len(samples_us) * 0.95)], 1),
+        "p99_us": round(samples_us[int(len(samples_us) * 0.99)], 1),
+        "max_us": round(samples_us[-1], 1),
+    }
+
+
+def timed(func, *args):
+    started = time.perf_counter()
+    func(*args)
+    return (time.perf_counter() - started) * 1_000_000
+
+
+def import_bot():
+    """화면 블록 생성 함수를 쓰기 위해 main_case2 로드
+
+    Slack 앱 생성 시 auth.test를 호출하므로 slack_http_bench의 로컬 Slack API 서버로 보냅니다.
+    """
+    from slack_http import PooledWebClient
+    from slack_http_bench import start_stand_in
+
+    server, _ = start_stand_in(latency_ms=0, handshake_ms=0)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/api/"
+    original = PooledWebClient.__init__
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault("base_url", base_url)
+        original(self, *args, **kwargs)
+
+    os.environ.setdefault("SLACK_BOT_TOKEN1", "xoxb-bench")
+    PooledWebClient.__init__ = __init__
+    try:
+        return importlib.import_module("main_case2")
+    finally:
+        PooledWebClient.__init__ = original
+        server.shutdown()
+
+
+def run_size(size: int, args) -> dict:
+    """코퍼스 하나를 만들어 측정 (이 프로세스에서 한 번만 실행)"""
+    bot = import_bot()
+    result = {"size": size}
+    rss = {"start": rss_mb()}
+
+    # 코퍼스 파일 생성 (--corpus-dir가 있으면 재사용)
+    corpus_dir = args.corpus_dir or tempfile.mkdtemp()
+    path = os.path.join(corpus_dir, f"synthetic-faq-{size}-{args.seed}.json")
+    if not os.path.exists(path):
+        started = time.perf_counter()
+        write_corpus(path, size, args.per_course, args.seed)
+        result["generate_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    result["file_mb"] = round(os.path.getsize(path) / 1024 / 1024, 1)
+    rss["before_load"] = rss_mb()
+
+    try:
+        # 로드: JSON 파싱 -> 스냅샷(과정/카테고리 분류) -> 검색 인덱스
+        started = time.perf_counter()
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        result["load_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        rss["after_load"] = rss_mb()
+
+        store = FAQStore(lambda: data, files=[path])
+        started = time.perf_counter()
+        snapshot = store.reload()
+        result["snapshot_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        rss["after_snapshot"] = rss_mb()
+
+        started = time.perf_counter()
+        index = store.render("search_index", QuestionIndex, snapshot)
+        result["index_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        rss["after_index"] = rss_mb()
+    finally:
+        if not args.corpus_dir:
+            os.remove(path)
+            os.rmdir(corpus_dir)
+
+    result["courses"] = len(snapshot.course_ids)
+    result["categories"] = len(snapshot.category_ids)
+    result["rss_mb"] = {
+        "data": round(rss["after_load"] - rss["before_load"], 1),
+        "snapshot": round(rss["after_snapshot"] - rss["after_load"], 1),
+        "index": round(rss["after_index"] - rss["after_snapshot"], 1),
+        "total": round(rss["after_index"] - rss["start"], 1),
+    }
+
+    # 검색어 종류별 지연 (/faq는 여러 단어 검색, 검색 메뉴는 과정 안 접두사 검색)
+    queries = make_queries(snapshot, args.queries, args.seed)
+    result["queries"] = {}
+    for kind, items in queries.items():
+        if kind == "phrase":
+            samples = [timed(index.resolve_query, query, course, 5) for course, query in items]
+        else:
+            samples = [timed(index.search, course, query) for course, query in items]
+        result["queries"][kind] = percentiles(samples)
+
+    # 화면 필터/생성 지연 (캐시를 거치지 않고 매번 생성, cached는 faq_store.render 캐시 적중)
+    rng = random.Random(args.seed)
+    pairs = [rng.choice(list(snapshot.category_ids)) for _ in range(args.screens)]
+    screens = {"filter": [], "categories": [], "questions": [], "home": [], "cached": []}
+    for course, category in pairs:
+        screens["filter"].append(timed(lambda: [snapshot.data[qid] for qid in snapshot.questions(course, category)]))
+        screens["categories"].append(timed(bot.create_category_blocks, snapshot, course))
+        screens["questions"].append(timed(bot.create_question_blocks, snapshot, course, category))
+        screens["home"].append(timed(bot.create_home_view, snapshot, course))
+        key = ("questions", course, category)
+        store.render(key, lambda snap: bot.create_question_blocks(snap, course, category), snapshot)
+        screens["cached"].append(timed(store.render, key, None, snapshot))
+    result["screens"] = {name: percentiles(samples) for name, samples in screens.items()}
+    result["questions_per_category"] = max(len(ids) for ids in snapshot.category_ids.values())
+    return result
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def lookup(result, path):
+    for key in path:
+        if not isinstance(result, dict) or key not in result:
+            return None
+        result = result[key]
+    return result
+
+
+def compare(before_path: str, after_path: str):
+    """두 결과 파일의 크기별 주요 지표 변화율 출력"""
+    with open(before_path, encoding="utf-8") as f:
+        before = {result["size"]: result for result in json.load(f)["results"]}
+    with open(after_path, encoding="utf-8") as f:
+        after = {result["size"]: result for result in json.load(f)["results"]}
+    print(f"{'size':>9}  {'metric':<26}{'before':>12}{'after':>12}{'change':>9}")
+    for size in sorted(set(before) & set(after)):
+        for path in COMPARE_METRICS:
+            old, new = lookup(before[size], path), lookup(after[size], path)
+            if old is None or new is None:
+                continue
+            change = f"{(new - old) / old * 100:+.1f}%" if old else "-"
+            print(f"{size:>9}  {'.'.join(path):<26}{old:>12}{new:>12}{change:>9}")
+
+
+def print_summary(results):
+    print(f"{'size':>9}{'load':>10}{'snapshot':>10}{'index':>10}{'rss':>9}"
+          f"{'prefix':>9}{'phrase':>9}{'questions':>11}{'home':>9}  (ms / MB / p50 us)")
+    for result in results:
+        if "error" in result:
+            print(f"{result['size']:>9}  실패: {result['error']}")
+            continue
+        print(f"{result['size']:>9}{result['load_ms']:>10}{result['snapshot_ms']:>10}{result['index_ms']:>10}"
+              f"{result['rss_mb']['total']:>9}{result['queries']['prefix']['p50_us']:>9}"
+              f"{result['queries']['phrase']['p50_us']:>9}{result['screens']['questions']['p50_us']:>11}"
+              f"{result['screens']['home']['p50_us']:>9}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="FAQ 조회/화면 생성 확장성 벤치마크")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"코퍼스 크기 목록 (기본 {DEFAULT_SIZES})")
+    parser.add_argument("--per-course", type=int, default=5000, help="과정당 항목 수 (과정 수 = 크기 / 이 값, 최소 2)")
+    parser.add_argument("--queries", type=int, default=2000, help="검색어 종류별 측정 횟수")
+    parser.add_argument("--screens", type=int, default=200, help="화면 종류별 측정 횟수")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--corpus-dir", help="합성 코퍼스를 저장하고 다음 실행에 재사용할 디렉터리")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help=f"결과 JSON 파일 (기본 {DEFAULT_OUTPUT})")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="두 결과 파일 비교")
+    parser.add_argument("--memory-limit-mb", type=int, default=DEFAULT_MEMORY_LIMIT_MB,
+                        help=f"크기별 프로세스 메모리 상한 (넘으면 MemoryError로 실패 기록, OOM 종료 방지, "
+                             f"기본 {DEFAULT_MEMORY_LIMIT_MB}, 0이면 제한 없음)")
+    parser.add_argument("--single", type=int, help=argparse.SUPPRESS)  # 크기 하나를 이 프로세스에서 측정
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        compare(*args.compare)
+        return 0
+    if args.corpus_dir:
+        args.corpus_dir = os.path.abspath(args.corpus_dir)
+        os.makedirs(args.corpus_dir, exist_ok=True)
+    if args.single:
+        if args.memory_limit_mb:
+            import resource
+            limit = args.memory_limit_mb * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        print(json.dumps(run_size(args.single, args), ensure_ascii=False))
+        return 0
+
+    # 크기마다 새 프로세스에서 측정 (메모리를 따로 재고, 큰 크기에서 메모리가 부족해도 나머지는 기록)
+    # 봇 모듈이 쓰는 로그/이벤트 저장소는 저장소의 logs/ 대신 임시 디렉터리에 (측정 후 삭제)
+    log_dir = tempfile.mkdtemp(prefix="retrieval-bench-logs-")
+    env = dict(os.environ, LOG_ARCHIVE_ENABLED="false", LOG_DIR=log_dir,
+               EVENT_STORE_PATH=os.path.join(log_dir, "events.db"),
+               STATE_DB_PATH=os.path.join(log_dir, "state.db"),
+               POPULARITY_SNAPSHOT_PATH=os.path.join(log_dir, "popularity.json"),
+               PROFILE_DIR=os.path.join(log_dir, "profiles"))
+    results = []
+    for size in [int(size) for size in args.sizes.split(",")]:
+        command = [sys.executable, os.path.abspath(__file__), "--single", str(size),
+                   "--per-course", str(args.per_course), "--queries", str(args.queries),
+                   "--screens", str(args.screens), "--seed", str(args.seed)]
+        if args.corpus_dir:
+            command += ["--corpus-dir", args.corpus_dir]
+        command += ["--memory-limit-mb", str(args.memory_limit_mb)]
+        # 봇 모듈이 data/의 FAQ 파일을 읽도록 저장소 루트에서 실행
+        proc = subprocess.run(command, cwd=ROOT, capture_output=True, text=True, env=env)
+        lines = proc.stdout.strip().splitlines()
+        if proc.returncode == 0 and lines:
+            results.append(json.loads(lines[-1]))
+        else:
+            error = (proc.stderr.strip().splitlines() or [f"종료 코드 {proc.returncode}"])[-1]
+            results.append({"size": size, "error": error})
+        print_summary(results[-1:])
+
+    shutil.rmtree(log_dir, ignore_errors=True)
+
+    report = {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "settings": {key: getattr(args, key) for key in ("per_course", "queries", "screens", "seed",
+                                                             "memory_limit_mb")},
+        },
+        "results": results,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"결과 저장: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+"""Slack Web API 클라이언트 벤치마크 (기본 WebClient vs PooledWebClient)
+
+로컬에 Slack API를 흉내 내는 서버를 띄우고 chat.postMessage를 동시에 호출해 지연 시간을 비교합니다.
+새 연결마다 --handshake-ms만큼 지연을 주어 실제 환경의 TCP/TLS 연결 비용을 재현하고,
+--tls를 주면 자체 서명 인증서(openssl 필요)로 실제 TLS 핸드셰이크까지 포함합니다.
+
+    python benchmarks/slack_http_bench.py --calls 2000 --concurrency 8
+"""
+import os
+import sys
+import ssl
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from slack_sdk import WebClient  # noqa: E402
+from slack_http import PooledWebClient, ConnectionPool, HttpMetrics  # noqa: E402
+
+
+def start_stand_in(latency_ms: float, handshake_ms: float, cert_file: str = None):
+    """chat.postMessage 등에 {"ok": true}로 응답하는 로컬 Slack API 서버 -> (서버, 새 연결 수 집계)"""
+    connections = {"count": 0}
+    lock = threading.Lock()
+
+    class SlackHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive
+        disable_nagle_algorithm = True
+
+        def setup(self):
+            super().setup()
+            with lock:
+                connections["count"] += 1
+            time.sleep(handshake_ms / 1000)
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            time.sleep(latency_ms / 1000)
+            body = json.dumps({"ok": True, "channel": "C0BENCH", "ts": f"{time.time():.6f}"}).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlackHandler)
+    server.daemon_threads = True
+    if cert_file:
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(cert_file)
+        server.socket = context.wrap_socket(server.socket, server_side=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, connections
+
+
+def make_certificate(directory: str) -> str:
+    """localhost용 자체 서명 인증서 생성 (openssl 사용)"""
+    path = os.path.join(directory, "stand-in.pem")
+    subprocess.run([
+        "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+        "-subj", "/CN=localhost", "-addext", "subjectAltName=DNS:localhost,IP:127.0.0.1",
+        "-keyout", path, "-out", path,
+    ], check=True, capture_output=True)
+    return path
+
+
+def run(client, calls: int, concurrency: int):
+    latencies = []
+    lock = threading.Lock()
+
+    def post(i):
+        started = time.perf_counter()
+        client.chat_postMessage(channel="C0BENCH", text=f"bench {i}")
+        elapsed = (time.perf_counter() - started) * 1000
+        with lock:
+            latencies.append(elapsed)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(post, range(calls)))
+    total = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "calls": calls,
+        "seconds": round(total, 3),
+        "calls_per_second": round(calls / total, 1),
+        "mean_ms": round(sum(latencies) / len(latencies), 2),
+        "p50_ms": round(latencies[len(latencies) // 2], 2),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95)], 2),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99)], 2),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Slack Web API 클라이언트 벤치마크")
+    parser.add_argument("--calls", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=5, help="서버 응답 지연 (기본 5ms)")
+    parser.add_argument("--handshake-ms", type=float, default=30, help="새 연결마다 추가되는 지연 (기본 30ms)")
+    parser.add_argument("--tls", action="store_true", help="자체 서명 인증서로 HTTPS 사용 (openssl 필요)")
+    parser.add_argument("--json", action="store_true", help="JSON으로 출력")
+    args = parser.parse_args(argv)
+
+    temp_dir = tempfile.mkdtemp()
+    try:
+        cert_file = make_certificate(temp_dir) if args.tls else None
+        server, connections = start_stand_in(args.latency_ms, args.handshake_ms, cert_file)
+        scheme = "https" if args.tls else "http"
+        base_url = f"{scheme}://127.0.0.1:{server.server_address[1]}/api/"
+        client_ssl = ssl.create_default_context(cafile=cert_file) if cert_file else None
+
+        clients = {
+            "default": WebClient(token="xoxb-bench", base_url=base_url, ssl=client_ssl),
+            "pooled": PooledWebClient(token="xoxb-bench", base_url=base_url, ssl=client_ssl,
+                                      pool=ConnectionPool(size=args.concurrency), metrics=HttpMetrics()),
+        }
+        results = {}
+        for name, client in clients.items():
+            before = connections["count"]
+            results[name] = run(client, args.calls, args.concurrency)
+            results[name]["connections"] = connections["count"] - before
+        server.shutdown()
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    report = {
+        "settings": {key: getattr(args, key) for key in ("calls", "concurrency", "latency_ms", "handshake_ms", "tls")},
+        "results": results,
+        "speedup_p50": round(results["default"]["p50_ms"] / results["pooled"]["p50_ms"], 2),
+    }
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+    print(f"{'client':<10}{'conns':>8}{'mean':>10}{'p50':>10}{'p95':>10}{'p99':>10}{'calls/s':>10}")
+    for name, result in results.items():
+        print(f"{name:<10}{result['connections']:>8}{result['mean_ms']:>10.2f}{result['p50_ms']:>10.2f}"
+              f"{result['p95_ms']:>10.2f}{result['p99_ms']:>10.2f}{result['calls_per_second']:>10.1f}")
+    print(f"p50 {report['speedup_p50']}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,24 @@
+import os
+from dotenv import load_dotenv
+
+# 모듈 임포트 시점에 설정값을 읽으므로 .env를 먼저 로드
+load_dotenv()
+
+def env_str(name: str, default: str = None):
+    """문자열 환경 변수 (미설정 시 기본값)"""
+    return os.environ.get(name, default)
+
+def env_int(name: str, default: int) -> int:
+    """정수 환경 변수 (미설정 시 기본값)"""
+    return int(os.environ.get(name, default))
+
+def env_float(name: str, default: float) -> float:
+    """실수 환경 변수 (미설정 시 기본값)"""
+    return float(os.environ.get(name, default))
+
+def env_bool(name: str, default: bool = False) -> bool:
+    """불리언 환경 변수 (1/true/yes/on 이면 True)"""
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
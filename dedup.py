@@ -0,0 +1,134 @@
+import time
+import threading
+from collections import OrderedDict
+from typing import Dict, Any
+from config import env_int, env_float
+from state import state_backend
+
+# Slack 재전송 판별용 키 보관 시간 (Slack은 최대 수 분 동안 재전송)
+DEDUP_TTL_SECONDS = env_float("DEDUP_TTL_SECONDS", 600)
+# 같은 버튼 연속 클릭(더블 클릭) 판별 시간
+DEDUP_CLICK_WINDOW_SECONDS = env_float("DEDUP_CLICK_WINDOW_SECONDS", 2)
+DEDUP_MAX_ENTRIES = env_int("DEDUP_MAX_ENTRIES", 10000)
+
+
+class TTLCache:
+    """최대 크기와 만료 시간이 있는 키 집합
+
+    보관 시간(TTL)별로 키를 따로 모읍니다. 같은 TTL 안에서는 추가한 순서가 곧 만료 순서이므로,
+    2초짜리 클릭 키가 600초짜리 이벤트 키 뒤에 막혀 만료 후에도 남아 있는 일 없이 앞에서부터 정리됩니다.
+    """
+
+    def __init__(self, max_entries: int = DEDUP_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.buckets = {}  # TTL -> OrderedDict(키 -> 만료 시각)
+        self.size = 0
+        self.counts = {"expired": 0, "evicted": 0}
+        self.lock = threading.Lock()
+
+    def add_if_absent(self, key: str, ttl: float) -> bool:
+        """키가 없거나 만료됐으면 추가하고 True, 이미 있으면 False"""
+        now = time.monotonic()
+        with self.lock:
+            self._expire(now)
+            entries = self.buckets.get(ttl)
+            if entries is None:
+                entries = self.buckets[ttl] = OrderedDict()
+            if key in entries:
+                # 만료된 키는 위에서 정리됐으므로 남아 있으면 아직 유효
+                return False
+            entries[key] = now + ttl
+            self.size += 1
+            # 최대 크기 초과 시 가장 먼저 만료될 키부터 정리
+            while self.size > self.max_entries:
+                oldest = min((e for e in self.buckets.values() if e), key=lambda e: next(iter(e.values())))
+                oldest.popitem(last=False)
+                self.size -= 1
+                self.counts["evicted"] += 1
+            return True
+
+    def _expire(self, now: float):
+        """TTL별로 앞에서부터 만료된 키 정리"""
+        for entries in self.buckets.values():
+            while entries:
+                oldest_key, oldest_expires = next(iter(entries.items()))
+                if oldest_expires > now:
+                    break
+                del entries[oldest_key]
+                self.size -= 1
+                self.counts["expired"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            result = dict(self.counts)
+            result["keys_by_ttl"] = {f"{ttl:g}s": len(entries) for ttl, entries in self.buckets.items()}
+        return result
+
+    def __len__(self):
+        return self.size
+
+
+class DedupCache:
+    """Slack 재전송 이벤트와 버튼 중복 클릭을 걸러내는 캐시"""
+
+    def __init__(self, backend=state_backend):
+        self.local = TTLCache()
+        # 공유 상태 저장소(sqlite)를 쓰는 경우 다른 프로세스가 처리한 요청도 걸러냄
+        self.shared = backend if backend.shared else None
+        self.counts = {"checked": 0, "duplicates": 0}
+        self.lock = threading.Lock()
+
+    def _keys(self, body: Dict[Any, Any]):
+        """요청 본문에서 (키, 보관 시간) 목록 추출"""
+        keys = []
+        if body.get("event_id"):
+            keys.append((f"event:{body['event_id']}", DEDUP_TTL_SECONDS))
+        actions = body.get("actions") or []
+        user_id = (body.get("user") or {}).get("id", "")
+        if actions:
+            action = actions[0]
+            keys.append((f"action:{user_id}:{action.get('action_ts')}", DEDUP_TTL_SECONDS))
+            # 같은 메시지의 같은 버튼을 짧은 시간 안에 다시 누른 경우 (선택 메뉴는 선택한 옵션 값으로 구분)
+            message_ts = (body.get("container") or {}).get("message_ts", "")
+            value = action.get("value") or (action.get("selected_option") or {}).get("value")
+            keys.append(
+                (f"click:{user_id}:{message_ts}:{action.get('action_id')}:{value}",
+                 DEDUP_CLICK_WINDOW_SECONDS)
+            )
+        return keys
+
+    def _add_if_absent(self, key: str, ttl: float) -> bool:
+        if not self.local.add_if_absent(key, ttl):
+            return False
+        if self.shared is not None:
+            try:
+                return self.shared.add_if_absent("dedup", key, ttl)
+            except Exception:
+                # 공유 저장소 오류 시 프로세스 내 판별 결과만 사용
+                return True
+        return True
+
+    def is_duplicate(self, body: Dict[Any, Any]) -> bool:
+        """이미 처리한 요청이면 True"""
+        duplicate = False
+        for key, ttl in self._keys(body):
+            if not self._add_if_absent(key, ttl):
+                duplicate = True
+                break
+        with self.lock:
+            self.counts["checked"] += 1
+            if duplicate:
+                self.counts["duplicates"] += 1
+        return duplicate
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            result = dict(self.counts)
+        result["cached_keys"] = len(self.local)
+        result.update(self.local.stats())
+        result["shared"] = self.shared is not None
+        return result
+
+
+# 전역 중복 제거 캐시 인스턴스
+dedup_cache = DedupCache()
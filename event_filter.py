@@ -0,0 +1,80 @@
+import threading
+from typing import Dict, Any
+from config import env_str
+
+# 이벤트 종류별 로깅 규칙 (쉼표로 구분, "종류=규칙")
+# - 규칙: keep (모두 기록), drop (기록하지 않음), sample:N (N건 중 1건만 기록)
+# - "message.bot_message"처럼 subtype별로 지정할 수 있고, "*"는 지정하지 않은 종류의 기본 규칙
+LOG_EVENT_RULES = env_str("LOG_EVENT_RULES", "message=sample:100,*=keep")
+
+
+def parse_rules(spec: str) -> Dict[str, int]:
+    """규칙 문자열 -> {이벤트 종류: 샘플링 간격} (0: drop, 1: keep, N: N건 중 1건)"""
+    rules = {}
+    for item in (spec or "").split(","):
+        if not item.strip():
+            continue
+        name, _, rule = item.partition("=")
+        name, rule = name.strip(), rule.strip().lower()
+        if rule == "keep":
+            rules[name] = 1
+        elif rule == "drop":
+            rules[name] = 0
+        elif rule.startswith("sample:") and rule[7:].isdigit() and int(rule[7:]) > 0:
+            rules[name] = int(rule[7:])
+        else:
+            raise ValueError(f"LOG_EVENT_RULES 규칙 오류: {item!r} (keep, drop, sample:N 중 하나)")
+    return rules
+
+
+class EventFilter:
+    """이벤트를 직렬화(텍스트/JSON/CSV/SQLite)하기 전에 종류별 규칙으로 거르는 단계
+
+    채널의 모든 메시지가 들어오는 message 이벤트처럼 봇이 처리하지 않는 이벤트는
+    기록 비용이 가장 크므로 버리거나 N건 중 1건만 남깁니다. 샘플링은 종류별 카운터로
+    정확히 N번째마다 남기므로 기록된 건수 x N으로 전체 건수를 추정할 수 있습니다.
+    """
+
+    def __init__(self, spec: str = LOG_EVENT_RULES):
+        self.rules = parse_rules(spec)
+        self.lock = threading.Lock()
+        self.seen = {}     # 규칙 키(또는 이벤트 종류) -> 받은 건수
+        self.kept = {}     # 규칙 키 -> 기록한 건수
+        self.skipped = {}  # 규칙 키 -> 거른 건수
+
+    def rule_key(self, event_type: str, event_data: Dict[Any, Any]) -> str:
+        subtype = event_data.get("subtype") if isinstance(event_data, dict) else None
+        if subtype and f"{event_type}.{subtype}" in self.rules:
+            return f"{event_type}.{subtype}"
+        if event_type in self.rules:
+            return event_type
+        return "*"
+
+    def allow(self, event_type: str, event_data: Dict[Any, Any]) -> bool:
+        """이 이벤트를 기록해야 하면 True"""
+        key = self.rule_key(event_type, event_data)
+        every = self.rules.get(key, 1)
+        # 기본 규칙("*")이 적용된 이벤트도 종류별로 집계
+        if key == "*":
+            key = event_type
+        with self.lock:
+            count = self.seen[key] = self.seen.get(key, 0) + 1
+            allowed = every > 0 and (count - 1) % every == 0
+            counter = self.kept if allowed else self.skipped
+            counter[key] = counter.get(key, 0) + 1
+        return allowed
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            keys = sorted(self.seen)
+            return {
+                "rules": {key: ("drop" if every == 0 else "keep" if every == 1 else f"sample:{every}")
+                          for key, every in self.rules.items()},
+                "events": {key: {"seen": self.seen[key], "kept": self.kept.get(key, 0),
+                                 "skipped": self.skipped.get(key, 0)} for key in keys},
+                "total_skipped": sum(self.skipped.values()),
+            }
+
+
+# 전역 이벤트 필터 인스턴스
+event_filter = EventFilter()
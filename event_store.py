@@ -0,0 +1,367 @@
+import os
+import re
+import csv
+import sys
+import json
+import time
+import atexit
+import sqlite3
+import argparse
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional, List
+from config import env_str, env_float, env_int
+from log_archive import open_log, find_logs, COMPRESSED_SUFFIXES
+from faq_store import FAQ_FILES
+
+EVENT_STORE_PATH = env_str("EVENT_STORE_PATH", "logs/events.db")
+# 모아둔 이벤트를 반영하는 주기(초)와 한 트랜잭션의 최대 건수
+EVENT_STORE_FLUSH_SECONDS = env_float("EVENT_STORE_FLUSH_SECONDS", 1)
+EVENT_STORE_BATCH = env_int("EVENT_STORE_BATCH", 500)
+
+COLUMNS = [
+    "ts", "ts_epoch", "kind", "level", "event_type", "action_type", "user_id", "channel_id",
+    "course", "category", "question_id", "selected_value", "message", "payload",
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    ts TEXT NOT NULL,
+    ts_epoch REAL NOT NULL,
+    kind TEXT NOT NULL,
+    level TEXT,
+    event_type TEXT,
+    action_type TEXT,
+    user_id TEXT,
+    channel_id TEXT,
+    course TEXT,
+    category TEXT,
+    question_id INTEGER,
+    selected_value TEXT,
+    message TEXT,
+    payload TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_events_ts ON events (ts_epoch);
+CREATE INDEX IF NOT EXISTS idx_events_action_ts ON events (action_type, ts_epoch);
+-- 대시보드 대표 쿼리(액션+과정+기간, 카테고리별 집계)를 테이블 조회 없이 인덱스만으로 처리
+CREATE INDEX IF NOT EXISTS idx_events_action_course_category ON events (action_type, course, category, ts_epoch);
+-- 과정별 기간 집계(--course만 지정)
+CREATE INDEX IF NOT EXISTS idx_events_course ON events (course, ts_epoch);
+CREATE INDEX IF NOT EXISTS idx_events_user ON events (user_id);
+CREATE INDEX IF NOT EXISTS idx_events_category ON events (category);
+-- 가져온 CSV 로그 (같은 파일을 다시 가져오지 않도록, 압축 전후 같은 이름)
+CREATE TABLE IF NOT EXISTS imported_files (
+    name TEXT PRIMARY KEY,
+    rows INTEGER NOT NULL,
+    imported_at TEXT NOT NULL
+);
+"""
+
+# 버튼 값에서 과정으로 인정할 이름 (FAQ 데이터의 과정, 처음 필요할 때 FAQ 파일에서 읽음)
+_known_courses = None
+
+
+def known_courses() -> frozenset:
+    global _known_courses
+    if _known_courses is None:
+        courses = set()
+        for path in FAQ_FILES:
+            try:
+                with open(path, encoding="utf-8") as f:
+                    courses.update(faq["course"] for faq in json.load(f))
+            except (OSError, ValueError, KeyError, TypeError):
+                continue
+        _known_courses = frozenset(courses)
+    return _known_courses
+
+
+def set_known_courses(courses):
+    """FAQ 데이터를 다시 로드했을 때 과정 목록 갱신"""
+    global _known_courses
+    _known_courses = frozenset(courses)
+
+
+def parse_selected_value(selected_value: Optional[str]):
+    """버튼 값("과정|카테고리|질문 ID", "과정|질문 ID" 등)에서 (과정, 카테고리) 추출
+
+    질문 ID는 값에서 추측하지 않고 핸들러가 찾은 질문으로 따로 기록합니다.
+    """
+    course = category = None
+    if not selected_value:
+        return course, category
+    parts = selected_value.split("|")
+    if parts[0] in known_courses():
+        course = parts[0]
+    for part in parts[1:]:
+        if not part.isdigit():
+            category = part
+            break
+    return course, category
+
+
+def make_row(kind: str, timestamp: datetime, message: str, level: Optional[str] = None,
+             event_type: Optional[str] = None, action_type: Optional[str] = None,
+             user_id: Optional[str] = None, channel_id: Optional[str] = None,
+             selected_value: Optional[str] = None, question_id: Optional[int] = None,
+             payload: Optional[Dict[Any, Any]] = None) -> tuple:
+    """정규화된 이벤트 행 생성 (question_id는 핸들러가 찾은 질문의 ID)"""
+    course, category = parse_selected_value(selected_value)
+    return (
+        timestamp.isoformat(), timestamp.timestamp(), kind, level, event_type, action_type, user_id,
+        channel_id, course, category, question_id, selected_value, message,
+        json.dumps(payload, ensure_ascii=False, default=str) if payload else None,
+    )
+
+
+class SQLiteEventSink:
+    """로그 이벤트를 정규화해 SQLite에 모아서(batch) 저장하는 로그 출력"""
+
+    def __init__(self, path: str = EVENT_STORE_PATH, flush_seconds: float = EVENT_STORE_FLUSH_SECONDS,
+                 batch_size: int = EVENT_STORE_BATCH):
+        self.path = path
+        self.flush_seconds = flush_seconds
+        self.batch_size = batch_size
+        self.buffer = []
+        self.lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+        self.flush_event = threading.Event()
+        self.conn = None
+        self._pid = None
+        self._started = None
+        atexit.register(self.flush)
+
+    def _connection(self):
+        if self.conn is None or self._pid != os.getpid():
+            self.conn = connect(self.path)
+            self._pid = os.getpid()
+        return self.conn
+
+    def start(self):
+        """이 프로세스의 백그라운드 저장 스레드 시작 (pre-fork 서버에서는 fork 이후 워커에서 호출)"""
+        with self.flush_lock:
+            if self._started == os.getpid():
+                return
+            self._started = os.getpid()
+        threading.Thread(target=self._flush_loop, name="event-store-flush", daemon=True).start()
+
+    def close(self):
+        """모아둔 이벤트를 저장하고 연결을 닫음 (fork 전 마스터에서 호출해 워커에 복사되지 않도록)"""
+        self.flush()
+        with self.flush_lock:
+            if self.conn is not None and self._pid == os.getpid():
+                self.conn.close()
+            self.conn = None
+            self._pid = None
+
+    def reset_for_worker(self):
+        """fork 직후 워커에서 호출: 마스터에서 복사된 미저장 이벤트와 연결을 버림"""
+        with self.lock:
+            self.buffer = []
+        self.conn = None
+        self._pid = None
+
+    def _flush_loop(self):
+        pid = os.getpid()
+        while pid == os.getpid():
+            self.flush_event.wait(self.flush_seconds)
+            self.flush_event.clear()
+            try:
+                self.flush()
+            except sqlite3.Error as e:
+                print(f"이벤트 저장소 저장 오류: {e}")
+
+    def write(self, row: tuple):
+        """이벤트 1건 추가 (실제 저장은 백그라운드에서 묶어서 처리)"""
+        with self.lock:
+            self.buffer.append(row)
+            full = len(self.buffer) >= self.batch_size
+        if full:
+            if self._started == os.getpid():
+                self.flush_event.set()
+            else:
+                # 저장 스레드를 시작하기 전(fork 전 마스터, 분석 도구 등)에는 직접 저장
+                self.flush()
+
+    def flush(self):
+        """모아둔 이벤트를 한 트랜잭션으로 저장"""
+        with self.lock:
+            rows, self.buffer = self.buffer, []
+        if not rows:
+            return
+        with self.flush_lock:
+            insert_rows(self._connection(), rows)
+
+
+def connect(path: str) -> sqlite3.Connection:
+    directory = os.path.dirname(path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+    conn = sqlite3.connect(path, timeout=10, isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(events)")}
+    if "question_id" not in columns:
+        # 이전 버전 저장소(question_index 컬럼)에 질문 ID 컬럼 추가 (다른 프로세스가 먼저 추가했으면 무시)
+        try:
+            conn.execute("ALTER TABLE events ADD COLUMN question_id INTEGER")
+        except sqlite3.OperationalError:
+            pass
+    return conn
+
+
+def insert_rows(conn: sqlite3.Connection, rows: List[tuple], imported_file: Optional[str] = None):
+    """이벤트 행을 한 트랜잭션으로 저장 (imported_file이 있으면 가져온 파일로 함께 기록)"""
+    conn.execute("BEGIN")
+    try:
+        conn.executemany(
+            f"INSERT INTO events ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})", rows
+        )
+        if imported_file is not None:
+            conn.execute("INSERT INTO imported_files (name, rows, imported_at) VALUES (?, ?, ?)",
+                         (imported_file, len(rows), datetime.now().isoformat(timespec="seconds")))
+        conn.execute("COMMIT")
+    except sqlite3.Error:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def parse_since(value: str) -> float:
+    """'7d', '12h', '30m' 또는 ISO 날짜를 epoch 초로 변환"""
+    match = re.fullmatch(r"(\d+)([dhm])", value)
+    if match:
+        amount, unit = int(match.group(1)), match.group(2)
+        delta = {"d": timedelta(days=amount), "h": timedelta(hours=amount), "m": timedelta(minutes=amount)}[unit]
+        return (datetime.now() - delta).timestamp()
+    return datetime.fromisoformat(value).timestamp()
+
+
+def import_name(path: str) -> str:
+    """가져온 파일 기록용 이름 (압축 전 파일 이름, 압축한 뒤 다시 가져와도 같은 파일로 판단)"""
+    name = os.path.basename(path)
+    for suffix in COMPRESSED_SUFFIXES:
+        if name.endswith(suffix):
+            return name[:-len(suffix)]
+    return name
+
+
+def import_csv_logs(conn: sqlite3.Connection, paths: List[str]) -> int:
+    """기존 bot_data_*.csv 로그를 이벤트 저장소로 가져오기 (압축된 .csv.gz/.csv.zst도 바로 읽음)
+
+    이미 가져온 파일은 건너뛰므로 여러 번 실행해도 이벤트가 중복 저장되지 않습니다.
+    """
+    total = 0
+    for path in paths:
+        name = import_name(path)
+        if conn.execute("SELECT 1 FROM imported_files WHERE name = ?", (name,)).fetchone():
+            print(f"{path}: 이미 가져온 파일이므로 건너뜀")
+            continue
+        rows = []
+        with open_log(path, newline='') as f:
+            for record in csv.DictReader(f):
+                if not record.get("timestamp"):
+                    continue
+                timestamp = datetime.fromisoformat(record["timestamp"])
+                if record.get("action_type"):
+                    kind = "interaction"
+                elif record.get("event_type"):
+                    kind = "event"
+                else:
+                    kind = "error" if record.get("level") == "ERROR" else "info"
+                rows.append(make_row(
+                    kind, timestamp, record.get("message", ""),
+                    level=record.get("level") or None,
+                    event_type=record.get("event_type") or None,
+                    action_type=record.get("action_type") or None,
+                    user_id=record.get("user_id") or record.get("event_user") or None,
+                    channel_id=record.get("interaction_channel_id") or record.get("event_channel") or None,
+                    selected_value=record.get("selected_value") or None,
+                    question_id=int(record["question_id"]) if record.get("question_id") else None,
+                ))
+        insert_rows(conn, rows, imported_file=name)
+        total += len(rows)
+        print(f"{path}: {len(rows)}건 가져옴")
+    return total
+
+
+def query_counts(conn: sqlite3.Connection, by: List[str], action: Optional[str] = None,
+                 course: Optional[str] = None, category: Optional[str] = None,
+                 since: Optional[float] = None, until: Optional[float] = None, limit: int = 50):
+    """조건에 맞는 이벤트 수를 그룹별로 집계"""
+    conditions, params = [], []
+    for column, value in (("action_type", action), ("course", course), ("category", category)):
+        if value is not None:
+            conditions.append(f"{column} = ?")
+            params.append(value)
+    if since is not None:
+        conditions.append("ts_epoch >= ?")
+        params.append(since)
+    if until is not None:
+        conditions.append("ts_epoch < ?")
+        params.append(until)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    group_columns = ", ".join(by)
+    if by:
+        sql = (f"SELECT {group_columns}, COUNT(*) AS count FROM events {where} "
+               f"GROUP BY {group_columns} ORDER BY count DESC LIMIT ?")
+    else:
+        sql = f"SELECT COUNT(*) AS count FROM events {where} LIMIT ?"
+    return conn.execute(sql, params + [limit]).fetchall()
+
+
+GROUP_COLUMNS = {
+    "day": "substr(ts, 1, 10)",
+    "hour": "substr(ts, 1, 13)",
+    "action": "action_type",
+    "event": "event_type",
+    "user": "user_id",
+    "course": "course",
+    "category": "category",
+    "question": "question_id",
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="FAQ 봇 이벤트 저장소 조회 도구")
+    parser.add_argument("--db", default=EVENT_STORE_PATH, help="이벤트 저장소 SQLite 파일 경로")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    counts_parser = subparsers.add_parser("counts", help="이벤트 수 집계")
+    counts_parser.add_argument("--by", default="", help=f"그룹 기준 (쉼표 구분: {', '.join(GROUP_COLUMNS)})")
+    counts_parser.add_argument("--action", help="action_type (예: question_selection)")
+    counts_parser.add_argument("--course", help="과정 (예: 'BDA 과정')")
+    counts_parser.add_argument("--category", help="카테고리")
+    counts_parser.add_argument("--since", help="시작 시점 (예: 7d, 12h, 2025-06-01)")
+    counts_parser.add_argument("--until", help="종료 시점 (예: 1d, 2025-06-08)")
+    counts_parser.add_argument("--limit", type=int, default=50)
+
+    import_parser = subparsers.add_parser("import", help="기존 CSV 로그 가져오기")
+    import_parser.add_argument("paths", nargs="*", help="CSV 파일 (기본: logs/bot_data_*.csv, 압축 파일 포함)")
+
+    args = parser.parse_args(argv)
+    conn = connect(args.db)
+
+    if args.command == "import":
+        paths = args.paths or find_logs("logs/bot_data_*.csv")
+        total = import_csv_logs(conn, paths)
+        print(f"총 {total}건 가져오기 완료")
+        return
+
+    by = [GROUP_COLUMNS[name.strip()] for name in args.by.split(",") if name.strip()]
+    started = time.perf_counter()
+    rows = query_counts(
+        conn, by, action=args.action, course=args.course, category=args.category,
+        since=parse_since(args.since) if args.since else None,
+        until=parse_since(args.until) if args.until else None,
+        limit=args.limit,
+    )
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    writer = csv.writer(sys.stdout, delimiter="\t")
+    writer.writerow([name.strip() for name in args.by.split(",") if name.strip()] + ["count"])
+    writer.writerows(rows)
+    print(f"({len(rows)}행, {elapsed_ms:.1f}ms)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+import re
+import sys
+import json
+import time
+import zlib
+import argparse
+from typing import Dict, Any, List
+from faq_store import FAQ_FILES
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# 해시 벡터 차원과 한 번에 계산할 유사도 블록 크기 (메모리 사용량: 블록 크기^2 x 4바이트)
+DEFAULT_DIM = 1024
+DEFAULT_BLOCK = 2048
+DEFAULT_NGRAMS = (2, 3)
+
+NORMALIZE_PATTERN = re.compile(r"[^0-9a-z가-힣]+")
+
+
+def load_entries(files: List[str] = FAQ_FILES) -> List[Dict[str, Any]]:
+    """FAQ 파일의 질문을 원본 위치(파일, 순번)와 함께 로드"""
+    entries = []
+    for path in files:
+        with open(path, 'r', encoding='utf-8') as f:
+            for position, faq in enumerate(json.load(f)):
+                entries.append({
+                    "file": path,
+                    "position": position,
+                    "course": faq.get("course", ""),
+                    "category": faq.get("category", ""),
+                    "question": faq.get("question", ""),
+                })
+    return entries
+
+
+def char_ngrams(text: str, sizes=DEFAULT_NGRAMS) -> List[str]:
+    """공백/문장부호를 제거한 문자 n-gram 목록"""
+    text = NORMALIZE_PATTERN.sub("", text.lower())
+    grams = []
+    for n in sizes:
+        grams.extend(text[i:i + n] for i in range(len(text) - n + 1))
+    return grams or [text]
+
+
+def embed(texts: List[str], dim: int = DEFAULT_DIM, sizes=DEFAULT_NGRAMS):
+    """문자 n-gram을 해시해 L2 정규화된 벡터 행렬(float32)로 변환"""
+    rows, cols, signs = [], [], []
+    for row, text in enumerate(texts):
+        for gram in char_ngrams(text, sizes):
+            # 프로세스마다 바뀌는 hash() 대신 crc32 사용, 최상위 비트로 부호를 정해 충돌 편향을 줄임
+            h = zlib.crc32(gram.encode('utf-8'))
+            rows.append(row)
+            cols.append(h % dim)
+            signs.append(1.0 if h & 0x80000000 else -1.0)
+    vectors = np.zeros((len(texts), dim), dtype=np.float32)
+    np.add.at(vectors, (np.array(rows, dtype=np.int64), np.array(cols, dtype=np.int64)),
+              np.array(signs, dtype=np.float32))
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def similar_pairs(vectors, groups, threshold: float, block: int = DEFAULT_BLOCK):
+    """같은 그룹 안에서 코사인 유사도가 threshold 이상인 쌍 (i 배열, j 배열, 유사도 배열)
+
+    전체 유사도 행렬을 블록 단위(block x block)로 나눠 위쪽 삼각형만 계산하므로
+    항목 수가 많아도 메모리는 블록 크기에만 비례합니다. 항목을 그룹 순으로 정렬해 두고
+    각 행 블록은 해당 그룹들이 차지하는 열 범위만 계산합니다.
+    """
+    groups = np.asarray(groups)
+    order = np.argsort(groups, kind="stable")
+    vectors, groups = vectors[order], groups[order]
+    # 그룹별로 정렬된 위치에서 각 그룹이 끝나는 지점
+    group_end = np.searchsorted(groups, groups, side="right")
+    count = len(vectors)
+    found_i, found_j, found_sim = [], [], []
+    for start_i in range(0, count, block):
+        end_i = min(start_i + block, count)
+        left = vectors[start_i:end_i]
+        for start_j in range(start_i, int(group_end[end_i - 1]), block):
+            end_j = min(start_j + block, int(group_end[end_i - 1]))
+            sims = left @ vectors[start_j:end_j].T
+            mask = sims >= threshold
+            mask &= groups[start_i:end_i, None] == groups[None, start_j:end_j]
+            if start_i == start_j:
+                mask = np.triu(mask, k=1)
+            i, j = np.nonzero(mask)
+            found_i.append(order[start_i + i])
+            found_j.append(order[start_j + j])
+            found_sim.append(sims[i, j])
+    if not found_i:
+        return np.array([], dtype=np.int64), np.array([], dtype=np.int64), np.array([], dtype=np.float32)
+    return np.concatenate(found_i), np.concatenate(found_j), np.concatenate(found_sim)
+
+
+def cluster(count: int, pairs_i, pairs_j) -> List[List[int]]:
+    """유사한 쌍을 연결해 묶음(union-find)으로 만들기"""
+    parent = list(range(count))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for i, j in zip(pairs_i.tolist(), pairs_j.tolist()):
+        root_i, root_j = find(i), find(j)
+        if root_i != root_j:
+            parent[max(root_i, root_j)] = min(root_i, root_j)
+    clusters = {}
+    for index in range(count):
+        clusters.setdefault(find(index), []).append(index)
+    return [members for members in clusters.values() if len(members) > 1]
+
+
+def find_duplicates(entries: List[Dict[str, Any]], threshold: float, scope: str = "category",
+                    dim: int = DEFAULT_DIM, block: int = DEFAULT_BLOCK) -> List[Dict[str, Any]]:
+    """유사한 질문 묶음 목록 (과정/카테고리별, 유사도 높은 순)"""
+    if scope == "category":
+        keys = [(entry["course"], entry["category"]) for entry in entries]
+    elif scope == "course":
+        keys = [(entry["course"],) for entry in entries]
+    else:
+        keys = [()] * len(entries)
+    group_ids = {}
+    groups = [group_ids.setdefault(key, len(group_ids)) for key in keys]
+
+    vectors = embed([entry["question"] for entry in entries], dim)
+    pairs_i, pairs_j, sims = similar_pairs(vectors, groups, threshold, block)
+    # 항목별로 가장 비슷한 다른 질문과의 유사도
+    best = np.zeros(len(entries), dtype=np.float32)
+    np.maximum.at(best, pairs_i, sims)
+    np.maximum.at(best, pairs_j, sims)
+    best = best.tolist()
+
+    results = []
+    for members in cluster(len(entries), pairs_i, pairs_j):
+        first = entries[members[0]]
+        results.append({
+            "course": first["course"] if scope in ("category", "course") else None,
+            "category": first["category"] if scope == "category" else None,
+            "max_similarity": round(max(best[m] for m in members), 4),
+            "entries": [dict(entries[m], similarity=round(best[m], 4)) for m in members],
+        })
+    results.sort(key=lambda r: (r["course"] or "", r["category"] or "", -r["max_similarity"]))
+    return results
+
+
+def print_report(results: List[Dict[str, Any]]):
+    current = None
+    for result in results:
+        group = (result["course"], result["category"])
+        if group != current:
+            current = group
+            title = " > ".join(part for part in group if part) or "전체"
+            print(f"\n## {title}")
+        print(f"\n- 유사 질문 {len(result['entries'])}개 (최대 유사도 {result['max_similarity']:.2f})")
+        for entry in result["entries"]:
+            print(f"    [{entry['file']} #{entry['position']}] {entry['question']} ({entry['similarity']:.2f})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="유사(중복) FAQ 질문 탐지 도구")
+    parser.add_argument("files", nargs="*", help=f"FAQ 파일 (기본: {', '.join(FAQ_FILES)})")
+    parser.add_argument("--threshold", type=float, default=0.5, help="유사도 기준 (0~1, 기본 0.5)")
+    parser.add_argument("--scope", choices=["category", "course", "all"], default="category",
+                        help="비교 범위 (기본: 같은 과정과 카테고리 안에서만 비교)")
+    parser.add_argument("--dim", type=int, default=DEFAULT_DIM, help="해시 벡터 차원")
+    parser.add_argument("--block", type=int, default=DEFAULT_BLOCK, help="유사도 계산 블록 크기")
+    parser.add_argument("--json", action="store_true", help="JSON으로 출력")
+    args = parser.parse_args(argv)
+
+    if np is None:
+        print("이 도구는 numpy가 필요합니다. 'pip install numpy'로 설치한 뒤 다시 실행해주세요.", file=sys.stderr)
+        return 1
+
+    started = time.perf_counter()
+    entries = load_entries(args.files or FAQ_FILES)
+    results = find_duplicates(entries, args.threshold, args.scope, args.dim, args.block)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+    else:
+        print_report(results)
+    print(f"\n(질문 {len(entries)}개, 유사 묶음 {len(results)}개, {elapsed_ms:.1f}ms)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,232 @@
+import re
+import copy
+import time
+import threading
+from array import array
+from typing import Dict, Any, List
+from config import env_int
+
+# 검색 결과 최대 개수 (Slack 선택 메뉴는 최대 100개)
+SEARCH_MAX_RESULTS = env_int("SEARCH_MAX_RESULTS", 20)
+# 색인으로 찾는 검색어 최대 길이(음절) (이보다 긴 검색어는 후보 안에서만 추가 확인)
+SEARCH_MAX_PREFIX = env_int("SEARCH_MAX_PREFIX", 24)
+# 음절 1개가 자모 몇 개까지 되는지 (초성 + 이중모음 2 + 겹받침 2)
+JAMO_PER_SYLLABLE = 5
+
+NORMALIZE_PATTERN = re.compile(r"[^0-9a-z가-힣ㄱ-ㅣ]+")
+
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+JONGSEONG = ["", "ㄱ", "ㄲ", "ㄳ", "ㄴ", "ㄵ", "ㄶ", "ㄷ", "ㄹ", "ㄺ", "ㄻ", "ㄼ", "ㄽ", "ㄾ", "ㄿ", "ㅀ",
+             "ㅁ", "ㅂ", "ㅄ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ"]
+# 겹받침/이중모음은 입력 도중 상태와 맞도록 기본 자모로 분리 (예: "달" 입력 중에도 "닭"이 검색되도록)
+COMPOUND_JAMO = {
+    "ㄳ": "ㄱㅅ", "ㄵ": "ㄴㅈ", "ㄶ": "ㄴㅎ", "ㄺ": "ㄹㄱ", "ㄻ": "ㄹㅁ", "ㄼ": "ㄹㅂ", "ㄽ": "ㄹㅅ",
+    "ㄾ": "ㄹㅌ", "ㄿ": "ㄹㅍ", "ㅀ": "ㄹㅎ", "ㅄ": "ㅂㅅ", "ㅘ": "ㅗㅏ", "ㅙ": "ㅗㅐ", "ㅚ": "ㅗㅣ",
+    "ㅝ": "ㅜㅓ", "ㅞ": "ㅜㅔ", "ㅟ": "ㅜㅣ", "ㅢ": "ㅡㅣ",
+}
+
+
+def _build_jamo_table() -> Dict[int, str]:
+    table = {ord(jamo): basic for jamo, basic in COMPOUND_JAMO.items()}
+    for code in range(0xAC00, 0xD7A4):
+        offset = code - 0xAC00
+        jamo = CHOSEONG[offset // 588] + JUNGSEONG[(offset % 588) // 28] + JONGSEONG[offset % 28]
+        table[code] = "".join(COMPOUND_JAMO.get(ch, ch) for ch in jamo)
+    return table
+
+
+JAMO_TABLE = _build_jamo_table()
+
+
+def normalize_words(text: str) -> List[str]:
+    """소문자로 바꾸고 문장부호를 제거한 단어 목록"""
+    return NORMALIZE_PATTERN.sub(" ", text.lower()).split()
+
+
+def to_jamo(text: str) -> str:
+    """한글 음절을 자모로 분리 ("출석" -> "ㅊㅜㄹㅅㅓㄱ")"""
+    return text.translate(JAMO_TABLE)
+
+
+class PrefixIndex:
+    """접미사 시작 위치를 정렬해 둔 접두사 색인 (이분 탐색으로 검색어로 시작하는 접미사 범위를 찾음)
+
+    접미사 문자열을 따로 저장하지 않고 (질문 순서, 시작 위치)만 정수 배열로 정렬해 두므로
+    메모리는 질문 텍스트 크기에 비례합니다.
+    """
+
+    def __init__(self, texts: List[str], starts: List[List[int]], max_key: int):
+        self.texts = texts      # 질문 순서 -> 공백 제거한 질문 (음절 또는 자모)
+        self.max_key = max_key  # 정렬에 쓰는 접미사 길이 (검색어는 이보다 길 수 없음)
+        entries = [(rank << 16) | start for rank, positions in enumerate(starts)
+                   for start in positions if start < 0x10000]
+        entries.sort(key=lambda entry: self._suffix(entry, max_key))
+        self.entries = array("Q", entries)
+
+    def _suffix(self, entry: int, length: int) -> str:
+        start = entry & 0xFFFF
+        return self.texts[entry >> 16][start:start + length]
+
+    def _bisect(self, prefix: str, right: bool) -> int:
+        # 정렬된 접미사를 검색어 길이로 잘라도 순서가 유지되므로 잘라서 비교
+        lo, hi = 0, len(self.entries)
+        length = len(prefix)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            suffix = self._suffix(self.entries[mid], length)
+            if suffix < prefix or (right and suffix == prefix):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def search(self, prefix: str) -> List[int]:
+        """prefix로 시작하는 접미사가 있는 질문 순서 목록 (오름차순)"""
+        prefix = prefix[:self.max_key]
+        lo = self._bisect(prefix, False)
+        hi = self._bisect(prefix, True)
+        return sorted({entry >> 16 for entry in self.entries[lo:hi]})
+
+
+class QuestionIndex:
+    """과정별 질문 검색 인덱스 (음절 접두사 + 자모 접두사)
+
+    질문의 각 단어 시작 위치부터의 접미사(공백 제거)를 색인하므로
+    "강의자료", "자료", "강의 자료" 모두 "실시간 강의의 강의 자료는..."을 찾고,
+    입력 중인 "출ㅅ", "추"처럼 음절이 완성되지 않은 검색어도 자모 색인에서 찾습니다.
+    색인은 파일 순서로 만들고 결과만 스냅샷의 정렬 순서(인기순 등)로 정렬하므로, 정렬 순서가 바뀌면
+    reordered()로 색인을 공유하는 인덱스를 만들어 씁니다.
+    """
+
+    def __init__(self, snapshot, max_results: int = SEARCH_MAX_RESULTS, max_prefix: int = SEARCH_MAX_PREFIX):
+        self.snapshot = snapshot
+        self.max_results = max_results
+        self.max_prefix = max_prefix
+        self.syllable_indexes = {}  # 과정 -> 음절 접두사 색인
+        self.jamo_indexes = {}      # 과정 -> 자모 접두사 색인
+        self.compact = {}           # 질문 ID -> 공백 제거한 질문 (긴 검색어 확인용)
+        self.ids = {}               # 과정 -> 질문 ID 목록 (파일 순서, 색인의 질문 순서)
+        self.positions = snapshot.positions() if snapshot.ordered else None
+        self.counts = {"searches": 0, "total_us": 0}
+        self.lock = threading.Lock()
+        for qid, faq in enumerate(snapshot.data):
+            self.ids.setdefault(faq["course"], array("I")).append(qid)
+        for course, ids in self.ids.items():
+            syllable_texts, syllable_starts, jamo_texts, jamo_starts = [], [], [], []
+            for qid in ids:
+                words = normalize_words(snapshot.data[qid]["question"])
+                self.compact[qid] = "".join(words)
+                syllable_texts.append(self.compact[qid])
+                jamo_words = [to_jamo(word) for word in words]
+                jamo_texts.append("".join(jamo_words))
+                # 각 단어의 시작 위치부터의 접미사를 색인 ("강의자료"와 "자료" 모두 찾도록)
+                for texts_words, starts in ((words, syllable_starts), (jamo_words, jamo_starts)):
+                    positions, position = [], 0
+                    for word in texts_words:
+                        positions.append(position)
+                        position += len(word)
+                    starts.append(positions)
+            self.syllable_indexes[course] = PrefixIndex(syllable_texts, syllable_starts, max_prefix)
+            self.jamo_indexes[course] = PrefixIndex(jamo_texts, jamo_starts, max_prefix * JAMO_PER_SYLLABLE)
+
+    def reordered(self, snapshot) -> "QuestionIndex":
+        """같은 FAQ 데이터의 다른 정렬 순서 스냅샷용 인덱스 (색인과 검색 통계는 공유)"""
+        index = copy.copy(self)
+        index.snapshot = snapshot
+        index.positions = snapshot.positions() if snapshot.ordered else None
+        return index
+
+    def _ordered(self, ids, ranks: List[int]) -> List[int]:
+        # 색인 순서(파일 순서)의 결과를 스냅샷 정렬 순서로
+        results = [ids[rank] for rank in ranks]
+        if self.positions is not None:
+            results.sort(key=self.positions.__getitem__)
+        return results
+
+    def _position(self, qid: int) -> int:
+        return self.positions[qid] if self.positions is not None else qid
+
+    def _lookup(self, course: str, compact: str) -> List[int]:
+        # 음절 일치를 먼저, 자모로만 일치한 질문을 뒤에
+        prefix = compact[:self.max_prefix]
+        ids = self.ids[course]
+        ranks = self.syllable_indexes[course].search(prefix)
+        seen = set(ranks)
+        jamo_ranks = [rank for rank in self.jamo_indexes[course].search(to_jamo(prefix)) if rank not in seen]
+        results = self._ordered(ids, ranks) + self._ordered(ids, jamo_ranks)
+        if len(compact) > self.max_prefix:
+            results = [qid for qid in results if compact in self.compact[qid]]
+        return results
+
+    def _record(self, started: float):
+        with self.lock:
+            self.counts["searches"] += 1
+            self.counts["total_us"] += int((time.perf_counter() - started) * 1_000_000)
+
+    def search(self, course: str, query: str, limit: int = None) -> List[int]:
+        """과정 안에서 검색어로 시작하는 단어가 있는 질문 ID 목록 (음절 일치 우선)"""
+        started = time.perf_counter()
+        limit = limit or self.max_results
+        compact = "".join(normalize_words(query))
+        if not compact:
+            results = self.snapshot.questions(course)[:limit]
+        elif course not in self.syllable_indexes:
+            results = []
+        else:
+            results = self._lookup(course, compact)[:limit]
+        self._record(started)
+        return results
+
+    def match(self, courses: List[str], query: str, limit: int = None) -> List[int]:
+        """여러 과정에서 자유 입력 검색어로 질문 찾기
+
+        검색어 전체가 이어지는 질문을 먼저, 그다음 검색어의 단어 중 접두사가 일치하는 단어가 많은 순입니다.
+        """
+        started = time.perf_counter()
+        limit = limit or self.max_results
+        words = normalize_words(query)
+        compact = "".join(words)
+        scores = {}  # 질문 ID -> (전체 일치 여부, 일치한 단어 수)
+        for course in courses:
+            if not compact or course not in self.syllable_indexes:
+                continue
+            for qid in self._lookup(course, compact):
+                scores[qid] = (1, len(words))
+            if len(words) > 1:
+                for word in words:
+                    for qid in self._lookup(course, word):
+                        phrase, count = scores.get(qid, (0, 0))
+                        if not phrase:
+                            scores[qid] = (0, count + 1)
+        course_order = {course: i for i, course in enumerate(courses)}
+        results = sorted(scores, key=lambda qid: (
+            -scores[qid][0], -scores[qid][1],
+            course_order[self.snapshot.data[qid]["course"]], self._position(qid),
+        ))[:limit]
+        self._record(started)
+        return results
+
+    def resolve_query(self, query: str, default_course: str = None, limit: int = None):
+        """슬래시 명령 검색어 처리 -> (검색한 과정 목록, 질문 ID 목록)
+
+        검색어에 과정명(AI, BDA 등)이 있으면 그 과정에서, 없으면 기본 과정(사용자가 마지막으로 본 과정),
+        그것도 없으면 모든 과정에서 찾습니다.
+        """
+        words = normalize_words(query)
+        courses = [course for course in self.syllable_indexes if course.split()[0].lower() in words]
+        if courses:
+            course_words = {word.lower() for course in courses for word in course.split()}
+            words = [word for word in words if word not in course_words]
+        elif default_course in self.syllable_indexes:
+            courses = [default_course]
+        else:
+            courses = list(self.syllable_indexes)
+        return courses, self.match(courses, " ".join(words), limit)
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            result = dict(self.counts)
+        result["avg_us"] = result["total_us"] / result["searches"] if result["searches"] else 0
+        result["courses"] = len(self.syllable_indexes)
+        return result
@@ -0,0 +1,188 @@
+import os
+import gc
+import time
+import hashlib
+import threading
+from array import array
+from typing import Dict, Any, List, Callable, Optional
+from config import env_float
+
+# FAQ 파일 변경 여부를 확인하는 최소 간격(초)
+FAQ_RELOAD_CHECK_SECONDS = env_float("FAQ_RELOAD_CHECK_SECONDS", 30)
+
+FAQ_FILES = [
+    'data/attendance-faq.json',
+    'data/live-lecture-faq.json',
+    'data/online-lecture-faq.json',
+    'data/cource-etc-faq.json',
+]
+
+
+class FAQSnapshot:
+    """한 번 로드한 FAQ 데이터와 인덱스, 화면 블록 캐시 (로드 후에는 변경하지 않음)"""
+
+    def __init__(self, data: List[Dict[str, Any]], version: int,
+                 score: Optional[Callable[[Dict[str, Any]], float]] = None, data_version: Optional[int] = None,
+                 data_blocks: Optional[Dict[Any, Any]] = None):
+        self.data = data
+        self.version = version
+        # 데이터를 다시 로드할 때만 바뀌는 버전 (정렬 순서만 바뀐 스냅샷은 이전 값을 유지)
+        self.data_version = version if data_version is None else data_version
+        # 정렬 순서와 관계없이 데이터로만 만드는 객체 캐시 (정렬 순서만 바뀐 스냅샷과 공유)
+        self.data_blocks = {} if data_blocks is None else data_blocks
+        self.ordered = score is not None
+        self._positions = None
+        self.course_ids = {}      # 과정 -> 질문 ID 목록
+        self.category_ids = {}    # (과정, 카테고리) -> 질문 ID 목록
+        self.categories = {}      # 과정 -> 카테고리 목록 (파일 등장 순서)
+        self.blocks = {}          # 화면 키 -> 미리 만든 블록
+        for qid, faq in enumerate(data):
+            course, category = faq["course"], faq["category"]
+            self.course_ids.setdefault(course, []).append(qid)
+            ids = self.category_ids.get((course, category))
+            if ids is None:
+                ids = self.category_ids[(course, category)] = []
+                self.categories.setdefault(course, []).append(category)
+            ids.append(qid)
+        
+        # 정렬 점수가 있으면 점수가 높은 질문부터 (같은 점수는 파일 순서 유지)
+        if score is not None:
+            scores = [score(faq) for faq in data]
+            for ids in list(self.course_ids.values()) + list(self.category_ids.values()):
+                ids.sort(key=lambda qid: -scores[qid])
+
+    def questions(self, course: str, category: Optional[str] = None) -> List[int]:
+        """과정(및 카테고리)에 해당하는 질문 ID 목록"""
+        if category is None:
+            return self.course_ids.get(course, [])
+        return self.category_ids.get((course, category), [])
+
+    def positions(self) -> array:
+        """질문 ID -> 과정 질문 목록에서의 순서 (처음 필요할 때 계산)"""
+        if self._positions is None:
+            positions = array("I", bytes(4 * len(self.data)))
+            for ids in self.course_ids.values():
+                for position, qid in enumerate(ids):
+                    positions[qid] = position
+            self._positions = positions
+        return self._positions
+
+    def question_key(self, question_id: int) -> str:
+        """질문의 과정/카테고리/문구로 만든 키 (FAQ 데이터를 다시 로드해도 같은 질문이면 같은 값, 숫자만 사용)"""
+        faq = self.data[question_id]
+        text = f"{faq['course']}\x1f{faq['category']}\x1f{faq['question']}"
+        return str(int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=6).digest(), "big"))
+
+    def question_ref(self, question_id: int) -> str:
+        """버튼/옵션 값에 넣는 질문 참조 ("질문 ID|질문 키")"""
+        return f"{question_id}|{self.question_key(question_id)}"
+
+    def resolve_ref(self, value: str) -> Optional[int]:
+        """버튼/옵션 값("과정|...|질문 ID|질문 키")에서 현재 데이터의 질문 ID 찾기
+
+        버튼을 만든 뒤 FAQ 데이터가 다시 로드되어 위치가 바뀐 질문은 질문 키로 찾고,
+        질문이 없어졌거나 질문 키가 없는 이전 형식의 값이면 None을 반환합니다.
+        """
+        parts = value.split("|")
+        if len(parts) < 3 or not (parts[-2].isdigit() and parts[-1].isdigit()):
+            return None
+        question_id, key = int(parts[-2]), parts[-1]
+        if not (question_id < len(self.data) and self.question_key(question_id) == key):
+            keys = self.data_blocks.get("question_keys")
+            if keys is None:
+                keys = self.data_blocks["question_keys"] = {self.question_key(qid): qid for qid in range(len(self.data))}
+            question_id = keys.get(key)
+        if question_id is None or self.data[question_id]["course"] != parts[0]:
+            return None
+        return question_id
+
+
+class FAQStore:
+    """FAQ 데이터를 한 번만 로드해 두고 파일이 바뀌면 다시 로드하는 저장소"""
+
+    def __init__(self, loader: Callable[[], List[Dict[str, Any]]], files: List[str] = FAQ_FILES):
+        self.loader = loader
+        self.files = files
+        self.current = None
+        self.score = None         # 질문 정렬 점수 함수 (None이면 파일 순서)
+        self.mtimes = None
+        self.checked_at = 0.0
+        self.lock = threading.Lock()
+        self.reload_listeners = []
+        self.data_listeners = []
+
+    def _file_mtimes(self):
+        mtimes = []
+        for path in self.files:
+            try:
+                mtimes.append(os.path.getmtime(path))
+            except OSError:
+                mtimes.append(None)
+        return mtimes
+
+    def reload(self) -> FAQSnapshot:
+        """FAQ 파일을 다시 읽어 새 스냅샷으로 교체"""
+        with self.lock:
+            mtimes = self._file_mtimes()
+            version = self.current.version + 1 if self.current else 1
+            self.current = FAQSnapshot(self.loader(), version, self.score)
+            self.mtimes = mtimes
+            self.checked_at = time.monotonic()
+            snapshot = self.current
+        for listener in self.data_listeners + self.reload_listeners:
+            listener(snapshot)
+        return snapshot
+
+    def snapshot(self) -> FAQSnapshot:
+        """현재 스냅샷 반환 (주기적으로 파일 변경을 확인해 다시 로드)"""
+        snapshot = self.current
+        if snapshot is None:
+            return self.reload()
+        if time.monotonic() - self.checked_at >= FAQ_RELOAD_CHECK_SECONDS:
+            self.checked_at = time.monotonic()
+            if self._file_mtimes() != self.mtimes:
+                return self.reload()
+        return snapshot
+
+    def reorder(self, score: Callable[[Dict[str, Any]], float]) -> bool:
+        """질문 정렬 기준을 바꿔 새 스냅샷으로 교체 (순서가 그대로면 기존 스냅샷과 화면 캐시 유지)"""
+        with self.lock:
+            self.score = score
+            current = self.current
+            if current is None:
+                return False
+            snapshot = FAQSnapshot(current.data, current.version + 1, score, current.data_version, current.data_blocks)
+            if snapshot.course_ids == current.course_ids and snapshot.category_ids == current.category_ids:
+                return False
+            self.current = snapshot
+        for listener in self.reload_listeners:
+            listener(snapshot)
+        return True
+
+    def on_reload(self, listener: Callable[[FAQSnapshot], None]):
+        """스냅샷이 바뀔 때마다(다시 로드, 순서 변경) 호출할 함수 등록"""
+        self.reload_listeners.append(listener)
+
+    def on_data_reload(self, listener: Callable[[FAQSnapshot], None]):
+        """FAQ 파일을 다시 로드했을 때만 호출할 함수 등록 (순서 변경에는 호출하지 않음)"""
+        self.data_listeners.append(listener)
+
+    def render(self, key, builder: Callable[[FAQSnapshot], List[Dict[str, Any]]],
+               snapshot: Optional[FAQSnapshot] = None, per_data: bool = False) -> List[Dict[str, Any]]:
+        """화면 블록을 스냅샷별로 한 번만 만들어 재사용
+
+        per_data=True면 정렬 순서와 관계없는 객체(검색 색인, 키워드 라우팅 표 등)로 보고
+        FAQ 데이터를 다시 로드할 때만 새로 만듭니다.
+        """
+        if snapshot is None:
+            snapshot = self.snapshot()
+        cache = snapshot.data_blocks if per_data else snapshot.blocks
+        blocks = cache.get(key)
+        if blocks is None:
+            blocks = cache[key] = builder(snapshot)
+        return blocks
+
+    def freeze(self):
+        """pre-fork 전에 호출: 로드된 객체를 GC 대상에서 제외해 워커 간 copy-on-write 공유를 유지"""
+        gc.collect()
+        gc.freeze()
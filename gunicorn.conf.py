@@ -0,0 +1,48 @@
+import os
+import sys
+import multiprocessing
+from config import env_int, env_str
+
+# HTTP 모드 운영 서버 설정: gunicorn -c gunicorn.conf.py
+wsgi_app = "wsgi:application"
+bind = env_str("HTTP_BIND", "0.0.0.0:3000")
+
+# 마스터에서 FAQ를 로드한 뒤 fork (워커 간 copy-on-write 공유, 스레드는 fork 이후 워커에서 시작)
+preload_app = True
+
+workers = env_int("HTTP_WORKERS", multiprocessing.cpu_count() * 2 + 1)
+
+# memory 상태 저장소는 워커마다 따로라서 중복 판별 키/세션/인기순 집계가 워커 사이에 공유되지 않음
+# 워커가 여러 개인데 STATE_BACKEND를 정하지 않았으면 sqlite로 공유 (앱을 로드하기 전에 설정해야 함)
+if workers > 1 and not os.environ.get("STATE_BACKEND"):
+    os.environ["STATE_BACKEND"] = "sqlite"
+# 워커당 스레드 수 (say() 등 I/O 대기 동안 다른 요청 처리)
+worker_class = "gthread"
+threads = env_int("HTTP_THREADS", 4)
+
+# Slack 쪽 연결을 재사용하도록 keep-alive 유지
+keepalive = env_int("HTTP_KEEPALIVE", 75)
+# Slack은 3초 안에 응답을 받아야 하므로 오래 걸리는 워커는 재시작
+timeout = env_int("HTTP_TIMEOUT", 30)
+graceful_timeout = env_int("HTTP_GRACEFUL_TIMEOUT", 30)
+# 메모리 누수 대비 주기적 워커 교체 (지터로 동시에 재시작하지 않도록)
+max_requests = env_int("HTTP_MAX_REQUESTS", 10000)
+max_requests_jitter = env_int("HTTP_MAX_REQUESTS_JITTER", 1000)
+
+def on_starting(server):
+    """시작 시 상태 저장소 설정 확인"""
+    backend = env_str("STATE_BACKEND", "memory")
+    if workers > 1 and backend == "memory":
+        server.log.warning(
+            "STATE_BACKEND=memory로 워커 %d개를 실행합니다. 워커마다 중복 판별 키, 세션, 인기순 집계가 따로 관리되어 "
+            "Slack 재전송/더블 클릭이 다른 워커에서 다시 처리될 수 있습니다. STATE_BACKEND=sqlite를 권장합니다.", workers)
+    else:
+        server.log.info("상태 저장소: %s (워커 %d개)", backend, workers)
+
+def post_fork(server, worker):
+    """워커별로 로그 파일을 분리하고 발송/저장/압축 스레드 시작"""
+    os.environ["FAQ_WORKER_ID"] = str(worker.pid)
+    # preload를 끈 경우에는 워커가 앱을 로드할 때 wsgi에서 시작
+    wsgi = sys.modules.get("wsgi")
+    if wsgi is not None:
+        wsgi.start_worker(worker.pid)
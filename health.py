@@ -0,0 +1,130 @@
+import json
+import time
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, Callable, Tuple
+from config import env_str, env_int
+
+# 헬스 체크 서버 주소 (포트를 0으로 설정하면 사용하지 않음)
+HEALTH_BIND = env_str("HEALTH_BIND", "127.0.0.1")
+HEALTH_PORT = env_int("HEALTH_PORT", 8080)
+
+
+class HealthServer:
+    """liveness/readiness 확인용 HTTP 서버와 시작 단계별 소요 시간 기록
+
+    - /healthz: 프로세스가 살아 있으면 200
+    - /readyz: 시작 준비(warm-up, Slack 연결)가 끝나고 등록된 확인이 모두 통과하면 200, 아니면 503
+    add_route()로 다른 모듈이 조회 경로를 추가할 수 있습니다.
+    """
+
+    def __init__(self, bind: str = HEALTH_BIND, port: int = HEALTH_PORT):
+        self.bind = bind
+        self.port = port
+        self.started_at = time.time()
+        self.ready_at = None
+        self.ready = False
+        self.phases = []   # (단계 이름, 소요 시간 ms)
+        self.checks = {}   # 이름 -> 통과 여부를 반환하는 함수
+        self.routes = {"/healthz": self.liveness, "/readyz": self.readiness}
+        self.server = None
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name: str):
+        """시작 단계 소요 시간 측정"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self.lock:
+                self.phases.append((name, round((time.perf_counter() - started) * 1000, 1)))
+
+    def mark_ready(self):
+        self.ready = True
+        self.ready_at = time.time()
+
+    def add_check(self, name: str, check: Callable[[], bool]):
+        """readiness에 포함할 확인 등록 (예: Slack 연결 여부)"""
+        self.checks[name] = check
+
+    def add_route(self, path: str, handler: Callable[[], Tuple[int, Dict[str, Any]]]):
+        """조회 경로 추가 (handler는 (상태 코드, JSON 본문) 반환)"""
+        self.routes[path] = handler
+
+    def startup_report(self) -> Dict[str, Any]:
+        with self.lock:
+            phases = dict(self.phases)
+        return {
+            "phases_ms": phases,
+            "total_ms": round(sum(phases.values()), 1),
+            "ready_after_seconds": round(self.ready_at - self.started_at, 3) if self.ready_at else None,
+        }
+
+    def liveness(self) -> Tuple[int, Dict[str, Any]]:
+        return 200, {"status": "alive", "uptime_seconds": round(time.time() - self.started_at, 1)}
+
+    def readiness(self) -> Tuple[int, Dict[str, Any]]:
+        checks = {}
+        for name, check in self.checks.items():
+            try:
+                checks[name] = bool(check())
+            except Exception:
+                checks[name] = False
+        ready = self.ready and all(checks.values())
+        return (200 if ready else 503), {"ready": ready, "checks": checks, "startup": self.startup_report()}
+
+    def handle(self, path: str) -> Tuple[int, bytes]:
+        handler = self.routes.get(path.split("?", 1)[0])
+        if handler is None:
+            return 404, b'{"error": "not found"}'
+        try:
+            status, body = handler()
+        except Exception as e:
+            status, body = 500, {"error": str(e)}
+        return status, json.dumps(body, ensure_ascii=False, default=str).encode('utf-8')
+
+    def start(self):
+        """헬스 체크 서버를 백그라운드 스레드로 시작 (포트 사용 중이면 경고만 출력)"""
+        if self.port <= 0 or self.server is not None:
+            return
+        health = self
+
+        class RequestHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                status, body = health.handle(self.path)
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        try:
+            self.server = ThreadingHTTPServer((self.bind, self.port), RequestHandler)
+        except OSError as e:
+            print(f"헬스 체크 서버 시작 실패 ({self.bind}:{self.port}): {e}")
+            return
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, name="health", daemon=True).start()
+
+    def wsgi(self, app):
+        """HTTP 모드용: 헬스 체크 경로는 직접 응답하고 나머지는 Slack 앱으로 전달하는 WSGI 앱"""
+        def application(environ, start_response):
+            if environ.get("REQUEST_METHOD") == "GET" and environ.get("PATH_INFO") in self.routes:
+                status, body = self.handle(environ["PATH_INFO"])
+                reason = {200: "OK", 404: "Not Found", 500: "Internal Server Error", 503: "Service Unavailable"}
+                start_response(f"{status} {reason.get(status, '')}".strip(), [
+                    ("Content-Type", "application/json; charset=utf-8"),
+                    ("Content-Length", str(len(body))),
+                ])
+                return [body]
+            return app(environ, start_response)
+        return application
+
+
+# 전역 헬스 체크 서버 인스턴스
+health = HealthServer()
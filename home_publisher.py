@@ -0,0 +1,162 @@
+import os
+import time
+import threading
+from collections import OrderedDict, deque
+from typing import Dict, Any, Callable, Optional
+from slack_sdk.errors import SlackApiError
+from config import env_int, env_float
+from outbound import TokenBucket, SLACK_TIER_LIMITS_PER_MINUTE
+from log import log_error
+
+# 데이터가 바뀌었을 때 홈 탭을 다시 게시할 사용자 범위 (최근 이 시간(초) 안에 홈을 연 사용자)
+HOME_ACTIVE_SECONDS = env_float("HOME_ACTIVE_SECONDS", 86400)
+HOME_ACTIVE_MAX_USERS = env_int("HOME_ACTIVE_MAX_USERS", 5000)
+# 일괄 재게시 속도 (views.publish는 Tier 4: 분당 100회, 나머지는 사용자가 직접 여는 홈 탭 몫으로 남김)
+HOME_REPUBLISH_PER_MINUTE = env_int("HOME_REPUBLISH_PER_MINUTE", SLACK_TIER_LIMITS_PER_MINUTE[4] * 6 // 10)
+HOME_REPUBLISH_BURST = 10
+
+
+class HomePublisher:
+    """App Home 탭 화면 게시
+
+    화면은 과정별로 스냅샷마다 한 번만 만들어(faq_store.render) 모든 사용자에게 재사용합니다.
+    화면의 private_metadata에 (과정, 데이터 버전)을 넣어 두므로, 홈을 다시 열었을 때 이미 최신
+    화면이면 게시하지 않습니다. FAQ 데이터가 다시 로드되면 최근 활동한 사용자의 홈 탭을 속도 제한에 맞춰
+    백그라운드에서 차례로 다시 게시합니다. 인기순 정렬로 순서만 바뀐 경우에는 다시 게시하지 않고,
+    다음에 데이터가 바뀌거나 과정을 바꿀 때 새 순서가 반영됩니다.
+    """
+
+    def __init__(self, active_seconds: float = HOME_ACTIVE_SECONDS, max_users: int = HOME_ACTIVE_MAX_USERS,
+                 rate_per_minute: int = HOME_REPUBLISH_PER_MINUTE, burst: int = HOME_REPUBLISH_BURST):
+        self.active_seconds = active_seconds
+        self.max_users = max_users
+        self.bucket = TokenBucket(rate_per_minute / 60, burst)
+        self.store = None
+        self.client = None
+        self.build_view = None
+        self.users = OrderedDict()  # 사용자 ID -> (과정, 마지막 활동 시각), 오래된 순
+        self.published = {}         # 사용자 ID -> 마지막으로 게시한 화면의 private_metadata
+        self.pending = deque()      # 재게시 대기 사용자
+        self.cond = threading.Condition()
+        self.counts = {"opened": 0, "published": 0, "skipped_current": 0, "republished": 0,
+                       "rate_limited": 0, "failed": 0}
+        self._pid = None
+
+    def attach(self, store, client, build_view: Callable[[Any, Optional[str]], Dict[str, Any]]):
+        """FAQ 저장소와 연결: build_view(스냅샷, 과정)로 화면을 만들고, 데이터가 다시 로드되면 재게시"""
+        self.store = store
+        self.client = client
+        self.build_view = build_view
+        store.on_data_reload(self.republish)
+
+    def _ensure_started(self):
+        # fork 이후에는 프로세스별로 재게시 스레드를 띄움
+        if self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+        threading.Thread(target=self._worker, name="home-publisher", daemon=True).start()
+
+    def view(self, course: Optional[str], snapshot=None) -> Dict[str, Any]:
+        """과정별 홈 화면 (스냅샷마다 한 번만 생성)"""
+        def build(snap):
+            return dict(self.build_view(snap, course), private_metadata=f"{course or ''}|{snap.data_version}")
+        return self.store.render(("home", course), build, snapshot)
+
+    def course_of(self, user_id: str) -> Optional[str]:
+        with self.cond:
+            entry = self.users.get(user_id)
+        return entry[0] if entry else None
+
+    def _touch(self, user_id: str, course: Optional[str]):
+        with self.cond:
+            self.users[user_id] = (course, time.monotonic())
+            self.users.move_to_end(user_id)
+            while len(self.users) > self.max_users:
+                evicted, _ = self.users.popitem(last=False)
+                self.published.pop(evicted, None)
+
+    def open(self, user_id: str, course: Optional[str] = None, current_view: Optional[Dict[str, Any]] = None,
+             client=None):
+        """사용자가 홈 탭을 열거나 과정을 바꿨을 때 게시 (이미 최신 화면이면 건너뜀)"""
+        course = course or self.course_of(user_id)
+        self._touch(user_id, course)
+        view = self.view(course)
+        with self.cond:
+            self.counts["opened"] += 1
+        if current_view and current_view.get("private_metadata") == view["private_metadata"]:
+            with self.cond:
+                self.counts["skipped_current"] += 1
+            return
+        self._publish(client or self.client, user_id, view)
+
+    def _publish(self, client, user_id: str, view: Dict[str, Any]):
+        client.views_publish(user_id=user_id, view=view)
+        with self.cond:
+            self.published[user_id] = view["private_metadata"]
+            self.counts["published"] += 1
+
+    def republish(self, snapshot=None):
+        """최근 활동한 사용자를 재게시 대기열에 추가 (FAQ 데이터를 다시 로드할 때 호출)"""
+        cutoff = time.monotonic() - self.active_seconds
+        with self.cond:
+            # 오래된 순으로 정렬되어 있으므로 앞에서부터 만료된 사용자 제거
+            while self.users:
+                user_id, (_, last_active) = next(iter(self.users.items()))
+                if last_active >= cutoff:
+                    break
+                self.users.popitem(last=False)
+                self.published.pop(user_id, None)
+            queued = set(self.pending)
+            for user_id in self.users:
+                if user_id not in queued:
+                    self.pending.append(user_id)
+            if self.pending:
+                self._ensure_started()
+                self.cond.notify_all()
+
+    def _worker(self):
+        while True:
+            with self.cond:
+                while not self.pending:
+                    self.cond.wait()
+                user_id = self.pending.popleft()
+                entry = self.users.get(user_id)
+            if entry is None:
+                continue
+            # 대기하는 동안 데이터가 또 바뀌었으면 가장 최신 화면으로 게시
+            view = self.view(entry[0])
+            if self.published.get(user_id) == view["private_metadata"]:
+                continue
+            delay = self.bucket.try_acquire()
+            while delay > 0:
+                time.sleep(delay)
+                delay = self.bucket.try_acquire()
+            try:
+                self._publish(self.client, user_id, view)
+                with self.cond:
+                    self.counts["republished"] += 1
+            except SlackApiError as e:
+                if getattr(e.response, "status_code", None) == 429:
+                    with self.cond:
+                        self.counts["rate_limited"] += 1
+                        self.pending.appendleft(user_id)
+                    time.sleep(float(e.response.headers.get("Retry-After", 1)))
+                else:
+                    with self.cond:
+                        self.counts["failed"] += 1
+                    log_error(f"홈 탭 재게시 실패: 사용자 {user_id}", e)
+            except Exception as e:
+                with self.cond:
+                    self.counts["failed"] += 1
+                log_error(f"홈 탭 재게시 실패: 사용자 {user_id}", e)
+
+    def stats(self) -> Dict[str, Any]:
+        with self.cond:
+            result = dict(self.counts)
+            result["active_users"] = len(self.users)
+            result["pending"] = len(self.pending)
+        return result
+
+
+# 전역 홈 탭 게시 인스턴스
+home_publisher = HomePublisher()
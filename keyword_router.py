@@ -0,0 +1,228 @@
+import re
+import json
+import time
+import threading
+from collections import Counter, deque
+from typing import Dict, Any, List, Optional, Iterator, Tuple
+from config import env_str
+from log import log_info, log_error
+
+# 멘션 문장의 키워드 -> 과정/카테고리/질문 라우팅 표 (FAQ 데이터와 함께 다시 로드)
+KEYWORD_ROUTES_PATH = env_str("KEYWORD_ROUTES_PATH", "data/keyword-routes.json")
+
+# 멘션(<@U123>), 채널/링크 표기는 검색 대상에서 제외
+SLACK_MARKUP_PATTERN = re.compile(r"<[^>]*>")
+ASCII_WORD_PATTERN = re.compile(r"[0-9a-z]")
+
+
+def normalize_text(text: str) -> str:
+    """소문자로 바꾸고 공백을 하나로 합침 (키워드와 문장에 같이 적용)"""
+    return " ".join(SLACK_MARKUP_PATTERN.sub(" ", text or "").lower().split())
+
+
+class AhoCorasick:
+    """여러 키워드를 문장 한 번 스캔으로 모두 찾는 오토마톤
+
+    키워드들로 트라이를 만들고 각 노드에 실패 링크(현재까지 읽은 문자열의 가장 긴 접미사 노드)를
+    연결해 두므로, 키워드 수와 관계없이 문장 길이에 비례하는 시간에 일치하는 키워드를 모두 찾습니다.
+    """
+
+    def __init__(self, patterns: List[str]):
+        self.goto = [{}]    # 노드 -> {문자: 다음 노드}
+        self.fail = [0]     # 노드 -> 실패 시 이동할 노드
+        self.output = [[]]  # 노드 -> 이 노드에서 끝나는 키워드 번호 목록
+        for pattern_id, pattern in enumerate(patterns):
+            node = 0
+            for ch in pattern:
+                child = self.goto[node].get(ch)
+                if child is None:
+                    child = self.goto[node][ch] = len(self.goto)
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                node = child
+            self.output[node].append(pattern_id)
+
+        # 너비 우선으로 실패 링크 연결 (얕은 노드의 링크가 먼저 정해져야 함)
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self.goto[node].items():
+                queue.append(child)
+                fallback = self.fail[node]
+                while fallback and ch not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(ch, 0)
+                self.fail[child] = target if target != child else 0
+                # 접미사로 끝나는 키워드도 이 노드에서 함께 보고
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+
+    def find(self, text: str) -> Iterator[Tuple[int, int]]:
+        """(키워드 끝 위치(포함하지 않음), 키워드 번호)"""
+        node = 0
+        for position, ch in enumerate(text):
+            while node and ch not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(ch, 0)
+            for pattern_id in self.output[node]:
+                yield position + 1, pattern_id
+
+
+class RouteStats:
+    """키워드 라우팅 결과 집계 (FAQ 데이터를 다시 로드해도 유지)"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counts = {"scans": 0, "routed": 0, "unmatched": 0, "no_course": 0, "total_us": 0}
+        self.keywords = Counter()  # 라우팅에 쓰인 키워드 -> 건수
+        self.targets = Counter()   # "category:카테고리", "question:질문", "course:과정" -> 건수
+        self.loaded = {}
+
+    def record(self, started: float, keyword: Optional[str] = None, target: Optional[str] = None,
+               no_course: bool = False):
+        with self.lock:
+            self.counts["scans"] += 1
+            self.counts["total_us"] += int((time.perf_counter() - started) * 1_000_000)
+            if target:
+                self.counts["routed"] += 1
+                self.keywords[keyword] += 1
+                self.targets[target] += 1
+            elif no_course:
+                self.counts["no_course"] += 1
+            else:
+                self.counts["unmatched"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            result = dict(self.counts)
+            result["keywords"] = dict(self.keywords.most_common(20))
+            result["targets"] = dict(self.targets.most_common(20))
+            result["loaded"] = dict(self.loaded)
+        result["avg_us"] = round(result["total_us"] / result["scans"], 1) if result["scans"] else 0
+        return result
+
+
+class KeywordRoutes:
+    """FAQ 스냅샷별로 만드는 키워드 라우팅 표 (faq_store.render로 스냅샷마다 한 번만 생성)
+
+    라우팅 표 파일의 과정 키워드와 주제 키워드(카테고리 또는 질문)를 오토마톤 하나로 합쳐
+    멘션 문장을 한 번만 스캔합니다. 질문 키워드가 카테고리 키워드보다 우선이고, 같은 종류면
+    더 긴 키워드, 그다음 문장에서 먼저 나온 키워드를 따릅니다.
+    """
+
+    def __init__(self, snapshot, path: str = KEYWORD_ROUTES_PATH):
+        self.keywords = []  # 키워드 번호 -> (정규화한 키워드, 원래 키워드)
+        self.targets = []   # 키워드 번호 -> ("course", 과정) 또는 ("route", 라우팅 항목 번호)
+        self.routes = []    # 라우팅 항목 번호 -> {"category", "question", "question_ids": {과정: 질문 ID}}
+        self.categories = {course: set(categories) for course, categories in snapshot.categories.items()}
+        invalid = 0
+        table = self._load(path)
+
+        for course, keywords in table.get("courses", {}).items():
+            for keyword in keywords:
+                self._add_keyword(keyword, ("course", course))
+
+        # 질문은 과정마다 ID가 다르므로 과정별로 찾아 둠
+        question_ids = {(faq["course"], faq["question"]): qid for qid, faq in enumerate(snapshot.data)}
+        for route in table.get("routes", []):
+            category, question = route.get("category"), route.get("question")
+            ids = {course: question_ids[(course, question)] for course in snapshot.course_ids
+                   if (course, question) in question_ids} if question else {}
+            known_category = any(category in categories for categories in snapshot.categories.values())
+            if (question and not ids) or (category and not known_category) or not (category or question):
+                invalid += 1
+                log_error(f"키워드 라우팅 항목의 질문/카테고리를 FAQ 데이터에서 찾을 수 없습니다: {route}")
+                if not known_category and not ids:
+                    continue
+            route_id = len(self.routes)
+            self.routes.append({"category": category if known_category else None, "question": question,
+                                "question_ids": ids})
+            for keyword in route.get("keywords", []):
+                self._add_keyword(keyword, ("route", route_id))
+
+        self.automaton = AhoCorasick([keyword for keyword, _ in self.keywords])
+        with route_stats.lock:
+            route_stats.loaded = {"version": snapshot.data_version, "keywords": len(self.keywords),
+                                  "routes": len(self.routes), "invalid_routes": invalid}
+        log_info(f"키워드 라우팅 표 로드: 키워드 {len(self.keywords)}개, 항목 {len(self.routes)}개 (오류 {invalid}개)")
+
+    @staticmethod
+    def _load(path: str) -> Dict[str, Any]:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            log_error(f"키워드 라우팅 파일을 찾을 수 없습니다: {path}")
+        except json.JSONDecodeError as e:
+            log_error(f"키워드 라우팅 파일 JSON 파싱 오류: {path}", e)
+        return {}
+
+    def _add_keyword(self, keyword: str, target: Tuple[str, Any]):
+        normalized = normalize_text(keyword)
+        if normalized:
+            self.keywords.append((normalized, keyword))
+            self.targets.append(target)
+
+    def _matches(self, text: str) -> Iterator[Tuple[int, int]]:
+        """(키워드 시작 위치, 키워드 번호): 영문/숫자 키워드는 단어 중간에서 일치한 경우 제외 ("ai" in "email")"""
+        for end, keyword_id in self.automaton.find(text):
+            keyword = self.keywords[keyword_id][0]
+            start = end - len(keyword)
+            if ASCII_WORD_PATTERN.match(keyword[0]) and start > 0 and ASCII_WORD_PATTERN.match(text[start - 1]):
+                continue
+            if ASCII_WORD_PATTERN.match(keyword[-1]) and end < len(text) and ASCII_WORD_PATTERN.match(text[end]):
+                continue
+            yield start, keyword_id
+
+    def route(self, text: str, default_course: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """멘션 문장 -> {"course", "category", "question_id", "keyword"} (일치하는 키워드가 없으면 None)
+
+        문장에 과정 키워드가 하나만 있으면 그 과정, 없으면 기본 과정(사용자가 마지막으로 본 과정)을 씁니다.
+        주제 키워드만 있고 과정을 정할 수 없으면 None입니다.
+        """
+        started = time.perf_counter()
+        courses = {}  # 과정 -> 처음 일치한 키워드
+        candidates = []
+        for start, keyword_id in self._matches(normalize_text(text)):
+            kind, target = self.targets[keyword_id]
+            if kind == "course":
+                courses.setdefault(target, keyword_id)
+            else:
+                candidates.append((start, keyword_id, target))
+
+        course = next(iter(courses)) if len(courses) == 1 else default_course
+        if course is None:
+            route_stats.record(started, no_course=bool(candidates))
+            return None
+
+        # 과정에 있는 질문/카테고리 중 우선순위가 가장 높은 항목
+        best = None
+        for start, keyword_id, route_id in candidates:
+            route = self.routes[route_id]
+            question_id = route["question_ids"].get(course)
+            category = route["category"]
+            if question_id is None and category not in self.categories.get(course, ()):
+                continue
+            rank = (question_id is not None, len(self.keywords[keyword_id][0]), -start)
+            if best is None or rank > best[0]:
+                best = (rank, keyword_id, route, question_id)
+
+        if best is None:
+            if len(courses) == 1:
+                # 과정만 말한 경우 ("@봇 BDA") 그 과정의 카테고리 선택 화면으로
+                keyword_id = courses[course]
+                route_stats.record(started, self.keywords[keyword_id][1], f"course:{course}")
+                return {"course": course, "category": None, "question_id": None,
+                        "keyword": self.keywords[keyword_id][1]}
+            route_stats.record(started)
+            return None
+
+        _, keyword_id, route, question_id = best
+        keyword = self.keywords[keyword_id][1]
+        target = f"question:{route['question']}" if question_id is not None else f"category:{route['category']}"
+        route_stats.record(started, keyword, target)
+        return {"course": course, "category": route["category"], "question_id": question_id, "keyword": keyword}
+
+
+# 전역 키워드 라우팅 집계 인스턴스
+route_stats = RouteStats()
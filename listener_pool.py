@@ -0,0 +1,164 @@
+import time
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Any
+from config import env_int, env_str
+
+# 리스너 실행 스레드 수와 대기 허용 개수 (넘으면 대기열에 넣지 않고 버림)
+LISTENER_WORKERS = env_int("LISTENER_WORKERS", 8)
+LISTENER_MAX_QUEUE = env_int("LISTENER_MAX_QUEUE", 50)
+# 대기열이 절반 이상 찼을 때 정책: defer (먼저 ack 응답 후 대기열에서 실행) 또는 reject (ack 응답 후 처리하지 않음)
+# 대기열이 가득 차면 정책과 관계없이 reject
+LISTENER_SATURATION_POLICY = env_str("LISTENER_SATURATION_POLICY", "defer")
+
+BUSY_TEXT = "⏳ 요청이 많아 처리하지 못했습니다. 잠시 후 다시 시도해주세요."
+
+
+class ListenerQueueFull(RuntimeError):
+    """리스너 대기열이 가득 차서 실행하지 않고 버린 경우"""
+
+
+class ListenerExecutor(ThreadPoolExecutor):
+    """Bolt 리스너 실행 스레드 풀 (사용률, 대기열 길이, 대기 시간 집계)
+
+    Bolt는 리스너를 이 풀에 넣은 뒤 리스너가 ack()를 호출할 때까지 기다리므로,
+    풀이 포화되면 ack가 늦어집니다. admit()을 미들웨어로 등록하면 대기열이 절반 이상 찼을 때
+    정책에 따라 먼저 ack를 보내고 나중에 실행(defer)하거나 처리하지 않고 응답(reject)합니다.
+    대기열 자리는 admit()에서 미리 예약하므로 자리가 없으면 미들웨어에서 바로 거절 응답하고,
+    예약 없이 들어온 제출(lazy 리스너 등)은 대기열이 가득 차면 실행하지 않고 버립니다(shed).
+    """
+
+    def __init__(self, workers: int = LISTENER_WORKERS, max_queue: int = LISTENER_MAX_QUEUE,
+                 policy: str = LISTENER_SATURATION_POLICY):
+        super().__init__(max_workers=workers, thread_name_prefix="bolt-listener")
+        self.workers = workers
+        self.max_queue = max_queue
+        self.policy = policy
+        self.lock = threading.Lock()
+        self.queued = 0
+        self.reserved = 0           # admit()에서 예약했지만 아직 제출되지 않은 자리 수
+        self.busy = 0
+        self.local = threading.local()
+        self.counts = {
+            "submitted": 0,
+            "completed": 0,
+            "deferred": 0,
+            "rejected": 0,
+            "shed": 0,
+            "max_queued": 0,
+            "total_wait_seconds": 0.0,
+            "max_wait_seconds": 0.0,
+            "total_run_seconds": 0.0,
+        }
+
+    def submit(self, fn, *args, **kwargs):
+        submitted = time.perf_counter()
+        reserved = getattr(self.local, "reserved", False)
+        self.local.reserved = False
+        with self.lock:
+            if reserved:
+                # 같은 스레드의 admit()에서 예약한 자리 사용 (Bolt는 미들웨어와 같은 스레드에서 제출)
+                self.reserved -= 1
+            elif self.queued + self.reserved >= self.max_queue:
+                # 예약 없이 들어온 제출은 대기열이 가득 찼으면 실행하지 않음
+                self.counts["shed"] += 1
+                future = Future()
+                future.set_exception(ListenerQueueFull(f"listener queue full ({self.max_queue})"))
+                return future
+            self.queued += 1
+            self.counts["submitted"] += 1
+            self.counts["max_queued"] = max(self.counts["max_queued"], self.queued)
+
+        def run():
+            started = time.perf_counter()
+            wait = started - submitted
+            with self.lock:
+                self.queued -= 1
+                self.busy += 1
+                self.counts["total_wait_seconds"] += wait
+                self.counts["max_wait_seconds"] = max(self.counts["max_wait_seconds"], wait)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self.lock:
+                    self.busy -= 1
+                    self.counts["completed"] += 1
+                    self.counts["total_run_seconds"] += time.perf_counter() - started
+
+        return super().submit(run)
+
+    def saturated(self) -> bool:
+        """모든 스레드가 사용 중이고 대기열이 절반 이상 찼으면 True"""
+        return self.busy >= self.workers and self.queued + self.reserved >= self.max_queue // 2
+
+    def full(self) -> bool:
+        """대기열이 가득 차서 더 받을 수 없으면 True"""
+        return self.queued + self.reserved >= self.max_queue
+
+    def reserve(self) -> bool:
+        """현재 스레드의 다음 제출을 위해 대기열 자리 예약 (자리가 없으면 False)"""
+        self.release()
+        with self.lock:
+            if self.queued + self.reserved >= self.max_queue:
+                return False
+            self.reserved += 1
+        self.local.reserved = True
+        return True
+
+    def release(self):
+        """현재 스레드가 예약하고 쓰지 않은 자리 반납 (처리할 리스너가 없던 요청 등)"""
+        if getattr(self.local, "reserved", False):
+            self.local.reserved = False
+            with self.lock:
+                self.reserved -= 1
+
+    def reject(self, body: Dict[Any, Any], ack):
+        """리스너를 실행하지 않고 바로 거절 응답"""
+        self.release()
+        with self.lock:
+            self.counts["rejected"] += 1
+        if body.get("type") == "block_suggestion":
+            return ack(options=[])
+        if body.get("command"):
+            return ack(response_type="ephemeral", text=BUSY_TEXT)
+        return ack()
+
+    def admit(self, body: Dict[Any, Any], ack, context, next):
+        """미들웨어에서 호출: 대기열 자리를 예약하고, 자리가 없거나 포화 상태면 정책에 따라 먼저 응답"""
+        saturated = self.saturated()
+        # 자리가 없으면 제출해도 실행되지 않고 Bolt가 ack_timeout까지 기다리므로 여기서 바로 거절
+        if not self.reserve():
+            return self.reject(body, ack)
+        if not saturated:
+            return next()
+
+        # 옵션 요청은 ack 본문이 곧 결과이므로 나중에 실행할 수 없음
+        if self.policy == "reject" or body.get("type") == "block_suggestion":
+            return self.reject(body, ack)
+
+        # ack-then-defer: Slack에는 바로 응답하고 리스너는 대기열에서 순서대로 실행
+        # (ack 본문으로 답하는 리스너는 context["deferred_ack"]를 보고 respond()로 보내야 함)
+        ack()
+        context["deferred_ack"] = True
+        with self.lock:
+            self.counts["deferred"] += 1
+        return next()
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            result = dict(self.counts)
+            result["queued"] = self.queued
+            result["reserved"] = self.reserved
+            result["busy"] = self.busy
+        result["workers"] = self.workers
+        result["max_queue"] = self.max_queue
+        result["policy"] = self.policy
+        result["utilization"] = result["busy"] / self.workers if self.workers else 0
+        started = result["submitted"] - result["queued"]
+        result["avg_wait_seconds"] = result["total_wait_seconds"] / started if started else 0.0
+        result["avg_run_seconds"] = result["total_run_seconds"] / result["completed"] if result["completed"] else 0.0
+        return result
+
+
+# 전역 리스너 실행 풀 인스턴스
+listener_executor = ListenerExecutor()
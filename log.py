@@ -3,33 +3,55 @@ import json
 import csv
 import logging
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import sys
+from state import state_backend
+from config import env_bool, env_str
+from event_store import SQLiteEventSink, make_row
+from event_filter import event_filter
+from log_archive import log_archiver
+from usage_rollup import usage_rollup
+
+# 로그 파일(bot_*.log, bot_events_*.json, bot_data_*.csv)을 쓸 디렉토리
+LOG_DIR = env_str("LOG_DIR", "logs")
+# 정규화된 이벤트를 SQLite에도 저장할지 여부 (분석 쿼리용)
+EVENT_STORE_ENABLED = env_bool("EVENT_STORE_ENABLED", True)
+
+class LogFileHandler(logging.FileHandler):
+    """첫 로그를 쓸 때 로그 디렉토리를 만들고 파일을 여는 핸들러 (import만으로는 디렉토리/파일이 생기지 않음)"""
+    
+    def __init__(self, filename):
+        super().__init__(filename, encoding='utf-8', delay=True)
+    
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
 
 class SlackBotLogger:
-    def __init__(self, log_dir="logs"):
+    def __init__(self, log_dir=LOG_DIR):
         self.log_dir = log_dir
-        self.create_log_directory()
         self.setup_logging()
         self.json_logs = []
         self.csv_headers = set()
         self.csv_data = []
+        self.event_sink = SQLiteEventSink() if EVENT_STORE_ENABLED else None
         
     def create_log_directory(self):
-        """로그 디렉토리 생성"""
-        if not os.path.exists(self.log_dir):
-            os.makedirs(self.log_dir)
+        """로그 디렉토리 생성 (JSON/CSV 로그를 처음 저장할 때 호출)"""
+        os.makedirs(self.log_dir, exist_ok=True)
     
     def setup_logging(self):
         """기본 로그 파일 설정"""
-        log_filename = f"{self.log_dir}/bot_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+        # 파일 이름에 프로세스 ID를 넣어 로그 압축이 실행 중인 프로세스의 파일을 건너뛸 수 있도록 함
+        suffix = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_p{os.getpid()}"
+        log_filename = f"{self.log_dir}/bot_{suffix}.log"
         
         # 로거 설정
         self.logger = logging.getLogger('slack_bot')
         self.logger.setLevel(logging.INFO)
         
-        # 파일 핸들러
-        file_handler = logging.FileHandler(log_filename, encoding='utf-8')
+        # 파일 핸들러 (첫 로그를 쓸 때 파일을 열어 import만으로는 빈 로그 파일이 생기지 않도록)
+        file_handler = LogFileHandler(log_filename)
         file_handler.setLevel(logging.INFO)
         
         # 콘솔 핸들러
@@ -45,11 +67,47 @@ class SlackBotLogger:
         console_handler.setFormatter(formatter)
         
         # 핸들러 추가
+        self.file_handler = file_handler
         self.logger.addHandler(file_handler)
         self.logger.addHandler(console_handler)
         
-        self.json_filename = f"{self.log_dir}/bot_events_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        self.csv_filename = f"{self.log_dir}/bot_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+        self.json_filename = f"{self.log_dir}/bot_events_{suffix}.json"
+        self.csv_filename = f"{self.log_dir}/bot_data_{suffix}.csv"
+
+    def reopen_for_worker(self, worker_id):
+        """pre-fork 워커에서 호출: 마스터가 연 로그 파일을 공유하지 않도록 워커별 파일로 교체"""
+        suffix = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_w{worker_id}"
+        
+        self.logger.removeHandler(self.file_handler)
+        self.file_handler.close()
+        
+        file_handler = LogFileHandler(f"{self.log_dir}/bot_{suffix}.log")
+        file_handler.setLevel(logging.INFO)
+        file_handler.setFormatter(self.file_handler.formatter)
+        self.file_handler = file_handler
+        self.logger.addHandler(file_handler)
+        
+        self.json_filename = f"{self.log_dir}/bot_events_{suffix}.json"
+        self.csv_filename = f"{self.log_dir}/bot_data_{suffix}.csv"
+        self.json_logs = []
+        self.csv_headers = set()
+        self.csv_data = []
+        if self.event_sink:
+            self.event_sink.reset_for_worker()
+
+    def prepare_fork(self):
+        """fork 전 마스터에서 호출: 쌓인 이벤트를 저장해 두어 워커마다 중복 저장되지 않도록 함"""
+        if self.event_sink:
+            self.event_sink.close()
+
+    def start(self):
+        """이벤트 저장소의 백그라운드 저장 스레드 시작 (pre-fork 서버에서는 fork 이후 워커에서 호출)"""
+        if self.event_sink:
+            self.event_sink.start()
+
+    def active_files(self):
+        """이 프로세스가 쓰고 있는 로그 파일 목록 (압축 제외 대상)"""
+        return [self.file_handler.baseFilename, self.json_filename, self.csv_filename]
 
     def log_info(self, message: str, extra_data: Dict[Any, Any] = None):
         """INFO 레벨 로깅"""
@@ -79,9 +137,17 @@ class SlackBotLogger:
             self.csv_data.append(csv_row)
             self.update_csv_headers(csv_row.keys())
             self.save_csv_log()
+        
+        # 4. SQLite 이벤트 저장소
+        if self.event_sink:
+            self.event_sink.write(make_row("info", timestamp, message, level="INFO", payload=extra_data))
 
     def log_event(self, event_type: str, event_data: Dict[Any, Any]):
         """슬랙 이벤트 로깅"""
+        # 0. 종류별 규칙으로 거르기 (직렬화 전에 처리해 버리는 이벤트는 비용이 들지 않음)
+        if not event_filter.allow(event_type, event_data):
+            return
+        
         timestamp = datetime.now()
         
         message = f"[{event_type}] 이벤트 수신"
@@ -113,13 +179,25 @@ class SlackBotLogger:
         self.csv_data.append(csv_row)
         self.update_csv_headers(csv_row.keys())
         self.save_csv_log()
+        
+        # 4. SQLite 이벤트 저장소
+        if self.event_sink:
+            self.event_sink.write(make_row(
+                "event", timestamp, message, event_type=event_type,
+                user_id=event_data.get("user"), channel_id=event_data.get("channel"), payload=event_data
+            ))
 
-    def log_user_interaction(self, action_type: str, user_id: str, selected_value: str, interaction_data: Dict[Any, Any] = None):
-        """사용자 상호작용 로깅"""
+    def log_user_interaction(self, action_type: str, user_id: str, selected_value: str, interaction_data: Dict[Any, Any] = None,
+                             question_id: Optional[int] = None):
+        """사용자 상호작용 로깅 (question_id: 핸들러가 찾은 질문의 ID)"""
         timestamp = datetime.now()
         
         message = f"[사용자 상호작용] {action_type} - 사용자: {user_id}, 선택값: {selected_value}"
         
+        # 0. 프로세스 간 공유되는 상호작용 집계
+        state_backend.incr("interactions", action_type)
+        usage_rollup.record(action_type, user_id, selected_value)
+        
         # 1. 기본 로그 파일에 기록
         self.logger.info(message)
         
@@ -129,6 +207,7 @@ class SlackBotLogger:
             "action_type": action_type,
             "user_id": user_id,
             "selected_value": selected_value,
+            "question_id": question_id,
             "message": message,
             "interaction_data": interaction_data or {}
         }
@@ -141,12 +220,21 @@ class SlackBotLogger:
             "action_type": action_type,
             "user_id": user_id,
             "selected_value": selected_value,
+            "question_id": "" if question_id is None else question_id,
             "message": message,
             **self._flatten_dict(interaction_data or {}, prefix="interaction_")
         }
         self.csv_data.append(csv_row)
         self.update_csv_headers(csv_row.keys())
         self.save_csv_log()
+        
+        # 4. SQLite 이벤트 저장소
+        if self.event_sink:
+            channel_id = ((interaction_data or {}).get("channel") or {}).get("id")
+            self.event_sink.write(make_row(
+                "interaction", timestamp, message, action_type=action_type,
+                user_id=user_id, channel_id=channel_id, selected_value=selected_value, question_id=question_id
+            ))
 
     def _flatten_dict(self, d: Dict[Any, Any], prefix: str = "", max_depth: int = 3) -> Dict[str, Any]:
         """중첩된 딕셔너리를 평면화"""
@@ -171,6 +259,7 @@ class SlackBotLogger:
     def save_json_log(self):
         """JSON 로그 파일 저장"""
         try:
+            self.create_log_directory()
             with open(self.json_filename, 'w', encoding='utf-8') as f:
                 json.dump(self.json_logs, f, ensure_ascii=False, indent=2)
         except Exception as e:
@@ -184,6 +273,7 @@ class SlackBotLogger:
                 
             headers = sorted(list(self.csv_headers))
             
+            self.create_log_directory()
             with open(self.csv_filename, 'w', newline='', encoding='utf-8') as f:
                 writer = csv.DictWriter(f, fieldnames=headers)
                 writer.writeheader()
@@ -226,9 +316,16 @@ class SlackBotLogger:
         self.csv_data.append(csv_row)
         self.update_csv_headers(csv_row.keys())
         self.save_csv_log()
+        
+        # 4. SQLite 이벤트 저장소
+        if self.event_sink:
+            self.event_sink.write(make_row(
+                "error", timestamp, message, level="ERROR", payload={"error": str(error)} if error else None
+            ))
 
 # 전역 로거 인스턴스
 bot_logger = SlackBotLogger()
+log_archiver.protect(bot_logger.active_files)
 
 # 편의 함수들
 def log_info(message: str, extra_data: Dict[Any, Any] = None):
@@ -237,8 +334,9 @@ def log_info(message: str, extra_data: Dict[Any, Any] = None):
 def log_event(event_type: str, event_data: Dict[Any, Any]):
     bot_logger.log_event(event_type, event_data)
 
-def log_user_interaction(action_type: str, user_id: str, selected_value: str, interaction_data: Dict[Any, Any] = None):
-    bot_logger.log_user_interaction(action_type, user_id, selected_value, interaction_data)
+def log_user_interaction(action_type: str, user_id: str, selected_value: str, interaction_data: Dict[Any, Any] = None,
+                         question_id: Optional[int] = None):
+    bot_logger.log_user_interaction(action_type, user_id, selected_value, interaction_data, question_id)
 
 def log_error(message: str, error: Exception = None):
     bot_logger.log_error(message, error) 
\ No newline at end of file
@@ -0,0 +1,237 @@
+import io
+import os
+import re
+import sys
+import glob
+import gzip
+import time
+import shutil
+import argparse
+import threading
+from typing import Dict, Any, Callable, List
+from config import env_bool, env_str, env_float
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# 닫힌 로그 파일 자동 압축 (기본 켜짐)
+LOG_ARCHIVE_ENABLED = env_bool("LOG_ARCHIVE_ENABLED", True)
+LOG_ARCHIVE_DIR = env_str("LOG_ARCHIVE_DIR", env_str("LOG_DIR", "logs"))
+# 압축 형식: gzip 또는 zstd (zstd는 zstandard 패키지가 있을 때만, 없으면 gzip)
+LOG_ARCHIVE_FORMAT = env_str("LOG_ARCHIVE_FORMAT", "gzip")
+# 이 시간(초) 동안 수정되지 않은 로그 파일을 닫힌 것으로 보고 압축
+LOG_ARCHIVE_IDLE_SECONDS = env_float("LOG_ARCHIVE_IDLE_SECONDS", 3600)
+LOG_ARCHIVE_CHECK_SECONDS = env_float("LOG_ARCHIVE_CHECK_SECONDS", 600)
+
+# 압축 대상 로그 파일 (프로세스 시작/워커별로 새로 생성되는 파일)
+LOG_PATTERNS = ["bot_*.log", "bot_events_*.json", "bot_data_*.csv"]
+COMPRESSED_SUFFIXES = (".gz", ".zst")
+# 로그 파일 이름의 프로세스 ID (_p123: 단독 실행/마스터, _w123: HTTP 모드 워커)
+OWNER_PATTERN = re.compile(r"_[pw](\d+)\.[a-z]+$")
+
+
+def open_log(path: str, mode: str = "rt", newline: str = None):
+    """로그 파일 열기 (.gz/.zst는 디스크에 풀지 않고 스트리밍으로 읽음)"""
+    text = "b" not in mode
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt" if text else "rb", encoding="utf-8" if text else None, newline=newline)
+    if path.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError(f"{path}: zstd 압축 파일을 읽으려면 'pip install zstandard'가 필요합니다.")
+        stream = zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+        return io.TextIOWrapper(stream, encoding="utf-8", newline=newline) if text else stream
+    if text:
+        return open(path, "r", encoding="utf-8", newline=newline)
+    return open(path, "rb")
+
+
+def pid_alive(pid: int) -> bool:
+    """프로세스가 실행 중인지 확인"""
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # 다른 사용자의 프로세스
+    except OSError:
+        return False
+    return True
+
+
+def find_logs(pattern: str) -> List[str]:
+    """압축 전/후 파일을 모두 포함해 패턴에 맞는 로그 파일 목록 (이름순)"""
+    paths = glob.glob(pattern)
+    for suffix in COMPRESSED_SUFFIXES:
+        paths.extend(glob.glob(pattern + suffix))
+    return sorted(paths)
+
+
+class LogArchiver:
+    """닫힌 로그 파일을 백그라운드에서 압축
+
+    파일 이름의 프로세스 ID가 아직 실행 중이면(현재 프로세스, 다른 봇, HTTP 모드 마스터/다른 워커)
+    파일이 열려 있을 수 있으므로 제외하고, 종료된 프로세스의 파일도 일정 시간 동안 수정되지 않았을 때만
+    압축합니다. 프로세스 ID가 없는 파일(저장소에 포함된 예시 로그, 이전 버전 로그)은 owned_only면
+    건드리지 않습니다. 임시 파일에 압축한 뒤 이름을 바꾸고 원본을 지우므로 중간에 중단되어도
+    원본이나 반쯤 쓴 압축 파일이 남지 않습니다.
+    """
+
+    def __init__(self, directory: str = LOG_ARCHIVE_DIR, fmt: str = LOG_ARCHIVE_FORMAT,
+                 idle_seconds: float = LOG_ARCHIVE_IDLE_SECONDS, check_seconds: float = LOG_ARCHIVE_CHECK_SECONDS,
+                 enabled: bool = LOG_ARCHIVE_ENABLED, owned_only: bool = True):
+        if fmt == "zstd" and zstandard is None:
+            print("zstandard 패키지가 없어 로그를 gzip으로 압축합니다.")
+            fmt = "gzip"
+        self.directory = directory
+        self.format = fmt
+        self.idle_seconds = idle_seconds
+        self.check_seconds = check_seconds
+        self.enabled = enabled
+        self.owned_only = owned_only
+        self.active_files = []  # 현재 쓰고 있는 파일 목록을 반환하는 함수들
+        self.lock = threading.Lock()
+        self.counts = {"archived": 0, "bytes_before": 0, "bytes_after": 0, "errors": 0}
+        self._pid = None
+
+    def protect(self, active_files: Callable[[], List[str]]):
+        """압축하면 안 되는 (현재 쓰고 있는) 파일 목록 함수 등록"""
+        self.active_files.append(active_files)
+
+    def start(self):
+        """백그라운드 압축 스레드 시작 (프로세스당 한 번, pre-fork 서버에서는 워커마다)"""
+        if not self.enabled or self._pid == os.getpid():
+            return
+        with self.lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            threading.Thread(target=self._loop, name="log-archive", daemon=True).start()
+
+    def _loop(self):
+        pid = os.getpid()
+        while pid == os.getpid():
+            try:
+                self.archive_idle()
+            except Exception as e:
+                print(f"로그 압축 오류: {e}")
+            time.sleep(self.check_seconds)
+
+    def candidates(self, idle_seconds: float = None) -> List[str]:
+        """압축할 닫힌 로그 파일 목록"""
+        idle_seconds = self.idle_seconds if idle_seconds is None else idle_seconds
+        active = set()
+        for active_files in self.active_files:
+            active.update(os.path.abspath(path) for path in active_files())
+        cutoff = time.time() - idle_seconds
+        paths = []
+        for pattern in LOG_PATTERNS:
+            for path in glob.glob(os.path.join(self.directory, pattern)):
+                if os.path.abspath(path) in active:
+                    continue
+                owner = OWNER_PATTERN.search(path)
+                if owner is None and self.owned_only:
+                    continue
+                if owner is not None and pid_alive(int(owner.group(1))):
+                    continue
+                try:
+                    if os.path.getmtime(path) <= cutoff:
+                        paths.append(path)
+                except OSError:
+                    continue
+        return sorted(paths)
+
+    def compress(self, path: str) -> str:
+        """파일 하나를 압축하고 원본 삭제 -> 압축 파일 경로"""
+        target = path + (".zst" if self.format == "zstd" else ".gz")
+        temp = f"{target}.{os.getpid()}.tmp"
+        stat = os.stat(path)
+        try:
+            with open(path, "rb") as src:
+                if self.format == "zstd":
+                    with open(temp, "wb") as raw, zstandard.ZstdCompressor(level=10).stream_writer(raw) as dst:
+                        shutil.copyfileobj(src, dst, 1024 * 1024)
+                else:
+                    # 파일 이름/시각을 헤더에 넣지 않아 같은 로그는 항상 같은 압축 결과
+                    with open(temp, "wb") as raw, gzip.GzipFile(filename="", mode="wb", fileobj=raw, mtime=0) as dst:
+                        shutil.copyfileobj(src, dst, 1024 * 1024)
+            # 압축 파일도 원본의 수정 시각을 유지 (기간별 조회용)
+            os.utime(temp, (stat.st_atime, stat.st_mtime))
+            os.replace(temp, target)
+        except BaseException:
+            if os.path.exists(temp):
+                os.remove(temp)
+            raise
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass  # 다른 프로세스가 먼저 압축함
+        with self.lock:
+            self.counts["archived"] += 1
+            self.counts["bytes_before"] += stat.st_size
+            self.counts["bytes_after"] += os.path.getsize(target)
+        return target
+
+    def archive_idle(self, idle_seconds: float = None) -> List[str]:
+        """닫힌 로그 파일을 모두 압축 -> 압축 파일 경로 목록"""
+        archived = []
+        for path in self.candidates(idle_seconds):
+            try:
+                archived.append(self.compress(path))
+            except FileNotFoundError:
+                continue
+            except OSError as e:
+                with self.lock:
+                    self.counts["errors"] += 1
+                print(f"로그 압축 실패 ({path}): {e}")
+        return archived
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            result = dict(self.counts)
+        result["format"] = self.format
+        result["ratio"] = round(result["bytes_after"] / result["bytes_before"], 3) if result["bytes_before"] else None
+        return result
+
+
+# 전역 로그 압축 인스턴스
+log_archiver = LogArchiver()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="로그 파일 압축/조회 도구")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    compress_parser = subparsers.add_parser("compress", help="닫힌 로그 파일 압축")
+    compress_parser.add_argument("--idle", type=float, default=LOG_ARCHIVE_IDLE_SECONDS,
+                                 help=f"이 시간(초) 동안 수정되지 않은 파일만 압축 (기본 {LOG_ARCHIVE_IDLE_SECONDS:g})")
+    compress_parser.add_argument("--dir", default=LOG_ARCHIVE_DIR, help="로그 디렉토리")
+    compress_parser.add_argument("--format", choices=["gzip", "zstd"], default=LOG_ARCHIVE_FORMAT)
+
+    cat_parser = subparsers.add_parser("cat", help="로그 파일 내용 출력 (압축 파일도 그대로 읽음)")
+    cat_parser.add_argument("paths", nargs="+")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "cat":
+        for path in args.paths:
+            with open_log(path, "rb") as f:
+                shutil.copyfileobj(f, sys.stdout.buffer)
+        return 0
+
+    # 직접 실행할 때는 프로세스 ID가 없는 이전 로그도 압축
+    archiver = LogArchiver(directory=args.dir, fmt=args.format, enabled=False, owned_only=False)
+    for path in archiver.archive_idle(args.idle):
+        print(path)
+    stats = archiver.stats()
+    if stats["archived"]:
+        print(f"{stats['archived']}개 파일 압축: {stats['bytes_before']:,} -> {stats['bytes_after']:,} bytes "
+              f"({stats['ratio']:.1%})", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,67 @@
 import os
 import json
 import re
-from slack_bolt import App
-from slack_bolt.adapter.socket_mode import SocketModeHandler
+import time
+import threading
+from slack_bolt import App, BoltResponse
 from dotenv import load_dotenv
+from outbound import queued_say, outbound_queue
+from dedup import dedup_cache
+from session import session_store
+from event_store import set_known_courses
+from faq_store import FAQStore
+from faq_search import QuestionIndex
+from profiler import profiled, profiler
+from health import health
+from listener_pool import listener_executor
+from slack_http import PooledWebClient, attach_pooled_client, http_stats
+from socket_pool import SocketModePool
+from popularity import popularity, FAQ_ORDER
 
 # .env 파일에서 환경 변수 로드
 load_dotenv()
 
-# Slack 앱 초기화
-app = App(token=os.environ.get("SLACK_BOT_TOKEN2"))
+# Slack 앱 초기화 (signing secret은 HTTP 모드 요청 서명 검증에 사용, Web API 호출은 keep-alive 연결 풀 사용)
+app = App(
+    client=PooledWebClient(token=os.environ.get("SLACK_BOT_TOKEN2")),
+    signing_secret=os.environ.get("SLACK_SIGNING_SECRET2"),
+    listener_executor=listener_executor
+)
+
+# 중복 요청 차단 (Slack 재전송, 버튼 더블 클릭) - 핸들러 실행 전에 처리
+@app.middleware
+def skip_duplicate_requests(body, next):
+    if dedup_cache.is_duplicate(body):
+        return BoltResponse(status=200, body="")
+    return next()
+
+# 리스너 실행 풀이 포화되면 정책에 따라 먼저 ack 응답 후 대기(defer) 또는 거절(reject)
+@app.middleware
+def apply_listener_backpressure(body, ack, context, next):
+    return listener_executor.admit(body, ack, context, next)
+
+# Bolt가 요청마다 새로 만드는 WebClient를 연결 풀을 쓰는 클라이언트로 교체 (say 등이 사용)
+@app.middleware
+def use_pooled_client(context, next):
+    attach_pooled_client(context)
+    return next()
+
+# 메시지 발송 큐 깊이, 대기 시간, 재시도/버린 메시지 수 조회
+health.add_route("/stats/outbound", lambda: (200, outbound_queue.stats()))
+# 리스너 실행 풀 사용률과 대기 시간 조회
+health.add_route("/stats/listeners", lambda: (200, listener_executor.stats()))
+# Slack API 메서드별 호출 지연 시간과 연결 재사용 현황 조회
+health.add_route("/stats/slack_http", lambda: (200, http_stats()))
+# 중복 요청(Slack 재전송, 버튼 연속 클릭) 판별 수와 보관 중인 키 수 조회
+health.add_route("/stats/dedup", lambda: (200, dedup_cache.stats()))
+# 사용자별 탐색 세션 수, 최대 크기 초과로 정리한 세션 수, 대략적인 메모리 사용량 조회
+health.add_route("/stats/sessions", lambda: (200, session_store.stats()))
+# 리스너 프로파일링 상태와 저장한 프로파일 수 조회 (PROFILE_ENABLED)
+health.add_route("/stats/profile", lambda: (200, profiler.stats()))
+# 인기순 정렬용 클릭 수 집계와 많이 본 질문 상위 5개 조회
+health.add_route("/stats/popularity", lambda: (200, popularity.stats()))
+# 질문 검색 횟수와 평균 검색 시간 조회
+health.add_route("/stats/search", lambda: (200, search_index().stats()))
 
 # FAQ 데이터 로드 (4개 파일 통합)
 def load_faq_data():
@@ -40,6 +92,23 @@ def load_faq_data():
     print(f"전체 FAQ 데이터 로드 완료: 총 {len(all_faq_data)}개 항목")
     return all_faq_data
 
+# FAQ 데이터는 한 번만 로드해 두고 파일이 바뀌면 다시 로드
+faq_store = FAQStore(load_faq_data)
+# 이벤트 저장소가 버튼 값에서 과정을 구분할 때 현재 FAQ 데이터의 과정 목록 사용
+faq_store.on_data_reload(lambda snapshot: set_known_courses(snapshot.course_ids))
+
+def search_index(snapshot=None):
+    """현재 정렬 순서의 질문 검색 인덱스 (색인은 FAQ 데이터를 다시 로드할 때만 새로 만듦)"""
+    return faq_store.render(
+        "search_index",
+        lambda snap: faq_store.render("search_data", QuestionIndex, snap, per_data=True).reordered(snap),
+        snapshot
+    )
+
+# 인기순 정렬 모드면 클릭 수를 기준으로 질문을 정렬 (이후 순서 갱신은 start_background에서 시작)
+if FAQ_ORDER == "popular":
+    popularity.attach(faq_store)
+
 def format_answer(answer_data):
     """답변을 슬랙 메시지 형식으로 포맷팅"""
     if isinstance(answer_data, dict):
@@ -53,11 +122,9 @@ def format_answer(answer_data):
     else:
         return answer_data
 
-# 봇 멘션 이벤트 처리
-@app.event("app_mention")
-def handle_mention(event, say):
-    # 과정 선택 블록 생성
-    blocks = [
+def create_course_blocks(snapshot=None):
+    """과정 선택 블록 생성"""
+    return [
         {
             "type": "section",
             "text": {
@@ -94,45 +161,85 @@ def handle_mention(event, say):
             ]
         }
     ]
-    
-    say(blocks=blocks, text="과정을 선택해주세요.")
 
-# 과정 선택 버튼 처리
-@app.action("select_ai_course")
-@app.action("select_bda_course")
-def handle_course_selection(ack, body, say):
-    ack()
-    
-    # 선택된 과정 정보
-    selected_course = body["actions"][0]["value"]
-    user_id = body["user"]["id"]
-    
-    print(f"사용자 {user_id}가 {selected_course}를 선택했습니다.")
-    
-    # FAQ 데이터 로드
-    faq_data = load_faq_data()
+def create_search_block(course):
+    """질문 검색 선택 메뉴 블록 생성 (입력할 때마다 Slack이 옵션을 요청)"""
+    return {
+        "type": "actions",
+        "block_id": f"question_search|{course}",  # 옵션 요청에서 과정을 알 수 있도록 저장
+        "elements": [
+            {
+                "type": "external_select",
+                "action_id": "question_search",
+                "placeholder": {
+                    "type": "plain_text",
+                    "text": "🔍 질문 검색 (예: 출석, 강의자료)",
+                    "emoji": True
+                },
+                "min_query_length": 1
+            }
+        ]
+    }
+
+def create_recent_blocks(snapshot, course, question_ids):
+    """최근 본 질문 바로가기 블록 생성 (사용자마다 다르므로 캐시하지 않음)"""
+    button_elements = []
+    for question_id in question_ids:
+        faq = snapshot.data[question_id]
+        if faq["course"] != course:
+            continue
+        question_text = faq["question"]
+        if len(question_text) > 75:
+            question_text = question_text[:72] + "..."
+        button_elements.append({
+            "type": "button",
+            "text": {
+                "type": "plain_text",
+                "text": question_text,
+                "emoji": True
+            },
+            "value": f"{course}|{snapshot.question_ref(question_id)}",
+            "action_id": f"recent_question_{len(button_elements)}"
+        })
     
-    # 선택된 과정에 해당하는 모든 질문들 추출
-    course_questions = [faq for faq in faq_data if faq["course"] == selected_course]
+    if not button_elements:
+        return []
+    return [
+        {
+            "type": "context",
+            "elements": [{"type": "mrkdwn", "text": "🕘 최근 본 질문"}]
+        },
+        {
+            "type": "actions",
+            "elements": button_elements
+        }
+    ]
+
+def create_question_blocks(snapshot, selected_course):
+    """질문 선택 블록 생성 (과정의 모든 질문)"""
+    question_ids = snapshot.questions(selected_course)
     
-    # 질문 선택 블록 생성
     blocks = [
         {
             "type": "section",
             "text": {
                 "type": "mrkdwn",
-                "text": f"*{selected_course}*에 대한 모든 FAQ입니다.\n\n*궁금한 질문을 선택해주세요:*\n총 {len(course_questions)}개의 질문이 있습니다."
+                "text": f"*{selected_course}*에 대한 모든 FAQ입니다.\n\n*궁금한 질문을 선택해주세요:*\n총 {len(question_ids)}개의 질문이 있습니다."
             }
         },
         {
             "type": "divider"
-        }
+        },
+        # 질문이 많으므로 목록을 훑지 않고 바로 찾는 검색 메뉴
+        create_search_block(selected_course)
     ]
     
     # 질문 버튼들 생성
     button_elements = []
     
-    for i, faq in enumerate(course_questions):
+    for i, question_id in enumerate(question_ids):
+        faq = snapshot.data[question_id]
+        
         # 카테고리 아이콘 설정
         category_icon = ""
         if "출석" in faq["category"]:
@@ -158,7 +265,8 @@ def handle_course_selection(ack, body, say):
                 "text": question_text,
                 "emoji": True
             },
-            "value": f"{selected_course}|{i}",  # 과정명과 인덱스를 저장
+            # 과정명, 질문 ID와 질문 키를 저장 (순서가 바뀌거나 FAQ를 다시 로드해도 누른 질문 그대로 찾음)
+            "value": f"{selected_course}|{snapshot.question_ref(question_id)}",
             "action_id": f"question_{i}"
         })
     
@@ -187,110 +295,29 @@ def handle_course_selection(ack, body, say):
         ]
     })
     
-    say(blocks=blocks, text="질문을 선택해주세요.")
+    return blocks
 
-# 질문 선택 버튼 처리
-@app.action(re.compile(r"question_\d+"))
-def handle_question_selection(ack, body, say):
-    ack()
-    
-    # 선택된 질문 정보 파싱
-    button_value = body["actions"][0]["value"]
-    course, question_index = button_value.split("|")
-    question_index = int(question_index)
-    user_id = body["user"]["id"]
-    
-    print(f"사용자 {user_id}가 {course}의 {question_index}번 질문을 선택했습니다.")
-    
-    # FAQ 데이터 로드
-    faq_data = load_faq_data()
+def create_answer_blocks(snapshot, question_id):
+    """답변 블록 생성"""
+    selected_faq = snapshot.data[question_id]
+    course = selected_faq["course"]
     
-    # 해당 과정의 질문들 필터링
-    course_questions = [faq for faq in faq_data if faq["course"] == course]
-    
-    if question_index < len(course_questions):
-        selected_faq = course_questions[question_index]
-        
-        # 답변 블록 생성
-        blocks = [
-            {
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": f"*Q: {selected_faq['question']}*\n📂 카테고리: {selected_faq['category']}\n🎓 과정: {selected_faq['course']}"
-                }
-            },
-            {
-                "type": "divider"
-            },
-            {
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": f"*A:* {format_answer(selected_faq['answer'])}"
-                }
-            },
-            {
-                "type": "divider"
-            },
-            {
-                "type": "actions",
-                "elements": [
-                    {
-                        "type": "button",
-                        "text": {
-                            "type": "plain_text",
-                            "text": "🔄 다른 질문 보기",
-                            "emoji": True
-                        },
-                        "value": course,
-                        "action_id": f"back_to_questions_{course.replace(' ', '_')}"
-                    },
-                    {
-                        "type": "button",
-                        "text": {
-                            "type": "plain_text",
-                            "text": "🏠 처음으로 돌아가기",
-                            "emoji": True
-                        },
-                        "value": "back_to_start",
-                        "action_id": "back_to_start"
-                    }
-                ]
+    return [
+        {
+            "type": "section",
+            "text": {
+                "type": "mrkdwn",
+                "text": f"*Q: {selected_faq['question']}*\n📂 카테고리: {selected_faq['category']}\n🎓 과정: {selected_faq['course']}"
             }
-        ]
-        
-        say(blocks=blocks, text="FAQ 답변입니다.")
-
-# 다른 질문 보기 버튼 처리
-@app.action(re.compile(r"back_to_questions_.*"))
-def handle_back_to_questions(ack, body, say):
-    ack()
-    
-    # 과정명 추출
-    course = body["actions"][0]["value"]
-    user_id = body["user"]["id"]
-    
-    print(f"사용자 {user_id}가 {course}의 질문 목록으로 돌아갑니다.")
-    
-    # 다시 같은 과정의 질문 선택 화면으로
-    handle_course_selection_direct(course, say)
-
-# 처음으로 돌아가기 버튼 처리
-@app.action("back_to_start")
-def handle_back_to_start(ack, body, say):
-    ack()
-    
-    user_id = body["user"]["id"]
-    print(f"사용자 {user_id}가 처음 화면으로 돌아갑니다.")
-    
-    # 처음 과정 선택 화면으로
-    blocks = [
+        },
+        {
+            "type": "divider"
+        },
         {
             "type": "section",
             "text": {
                 "type": "mrkdwn",
-                "text": "안녕하세요! 🤖 커널아카데미 부트캠프 FAQ 봇입니다.\n현재 진행중인 과정명을 선택해주세요."
+                "text": f"*A:* {format_answer(selected_faq['answer'])}"
             }
         },
         {
@@ -303,107 +330,291 @@ def handle_back_to_start(ack, body, say):
                     "type": "button",
                     "text": {
                         "type": "plain_text",
-                        "text": "🧠 AI 과정",
+                        "text": "🔄 다른 질문 보기",
                         "emoji": True
                     },
-                    "value": "AI 과정",
-                    "action_id": "select_ai_course"
+                    "value": course,
+                    "action_id": f"back_to_questions_{course.replace(' ', '_')}"
                 },
                 {
                     "type": "button",
                     "text": {
                         "type": "plain_text",
-                        "text": "📊 BDA 과정",
+                        "text": "🏠 처음으로 돌아가기",
                         "emoji": True
                     },
-                    "value": "BDA 과정",
-                    "action_id": "select_bda_course"
+                    "value": "back_to_start",
+                    "action_id": "back_to_start"
                 }
             ]
         }
     ]
-    
-    say(blocks=blocks, text="과정을 선택해주세요.")
 
-def handle_course_selection_direct(selected_course, say):
-    """과정 선택 로직을 직접 호출하는 헬퍼 함수"""
-    # FAQ 데이터 로드
-    faq_data = load_faq_data()
-    
-    # 선택된 과정에 해당하는 모든 질문들 추출
-    course_questions = [faq for faq in faq_data if faq["course"] == selected_course]
+def create_command_answer_blocks(snapshot, question_ids, multiple_courses=False):
+    """/faq 명령 답변 블록 생성 (본인에게만 보이는 메시지이므로 버튼 없이 답변과 관련 질문만 표시)"""
+    selected_faq = snapshot.data[question_ids[0]]
     
-    # 질문 선택 블록 생성
     blocks = [
         {
             "type": "section",
             "text": {
                 "type": "mrkdwn",
-                "text": f"*{selected_course}*에 대한 모든 FAQ입니다.\n\n*궁금한 질문을 선택해주세요:*\n총 {len(course_questions)}개의 질문이 있습니다."
+                "text": f"*Q: {selected_faq['question']}*\n📂 카테고리: {selected_faq['category']}\n🎓 과정: {selected_faq['course']}"
             }
         },
         {
             "type": "divider"
+        },
+        {
+            "type": "section",
+            "text": {
+                "type": "mrkdwn",
+                "text": f"*A:* {format_answer(selected_faq['answer'])}"
+            }
         }
     ]
     
-    # 질문 버튼들 생성
-    button_elements = []
+    # 함께 검색된 다른 질문
+    context_texts = []
+    if len(question_ids) > 1:
+        related = "\n".join(f"• {snapshot.data[qid]['question']}" for qid in question_ids[1:])
+        context_texts.append(f"*관련 질문*\n{related}")
+    if multiple_courses:
+        context_texts.append("과정명을 함께 입력하면 해당 과정의 답변을 볼 수 있습니다. (예: `/faq BDA 출석`)")
+    if context_texts:
+        blocks.append({
+            "type": "context",
+            "elements": [{"type": "mrkdwn", "text": text} for text in context_texts]
+        })
     
-    for i, faq in enumerate(course_questions):
-        # 카테고리 아이콘 설정
-        category_icon = ""
-        if "출석" in faq["category"]:
-            category_icon = "📋"
-        elif "실시간" in faq["category"]:
-            category_icon = "🏫"
-        elif "온라인" in faq["category"]:
-            category_icon = "💻"
-        elif "수업 외" in faq["category"]:
-            category_icon = "📚"
-        else:
-            category_icon = "❓"
+    return blocks
+
+def warm_up():
+    """FAQ 데이터를 로드하고 모든 화면 블록과 검색 인덱스를 미리 만들어 둠 (단계별 소요 시간 기록)"""
+    with health.phase("faq_load"):
+        snapshot = faq_store.snapshot()
+    with health.phase("render_screens"):
+        faq_store.render("courses", create_course_blocks)
+        for course in snapshot.course_ids:
+            faq_store.render(("questions", course), lambda snap, course=course: create_question_blocks(snap, course))
+    with health.phase("render_answers"):
+        for question_id in range(len(snapshot.data)):
+            faq_store.render(("answer", question_id), lambda snap, qid=question_id: create_answer_blocks(snap, qid))
+    with health.phase("search_index"):
+        # 질문 검색 인덱스도 스냅샷별로 한 번만 생성
+        search_index()
+    print(f"화면 블록 사전 생성 완료: {len(snapshot.blocks)}개")
+    return snapshot
+
+def start_background():
+    """발송 워커와 인기순 정렬 갱신 스레드 시작 (pre-fork 서버에서는 fork 이후 워커마다 호출)"""
+    with health.phase("outbound_workers"):
+        outbound_queue.start()
+    # 인기순 정렬 모드면 질문 순서 갱신 스레드 시작
+    popularity.start()
+
+# 봇 멘션 이벤트 처리
+@app.event("app_mention")
+@profiled
+def handle_mention(event, say):
+    say = queued_say(say, event["channel"])
+    
+    # 과정 선택 블록
+    blocks = faq_store.render("courses", create_course_blocks)
+    
+    say(blocks=blocks, text="과정을 선택해주세요.")
+
+# /faq 슬래시 명령 처리 (검색 결과를 본인에게만 보이는 메시지로 ack와 함께 바로 응답)
+@app.command("/faq")
+@profiled
+def handle_faq_command(ack, command, respond, context):
+    started = time.perf_counter()
+    
+    # 실행 풀 포화로 ack를 먼저 보낸 경우에는 response_url로 응답
+    reply = respond if context.get("deferred_ack") else ack
+    query = command.get("text", "").strip()
+    user_id = command["user_id"]
+    
+    # 과정명이 없으면 사용자가 마지막으로 본 과정에서 검색
+    snapshot = faq_store.snapshot()
+    index = search_index(snapshot)
+    session = session_store.get(user_id)
+    courses, question_ids = index.resolve_query(query, session.course if session else None, limit=5)
+    
+    if not query:
+        reply(response_type="ephemeral", text="사용법: `/faq [과정] 검색어` (예: `/faq BDA 출석`)")
+    elif not question_ids:
+        reply(response_type="ephemeral",
+              text=f"'{query}'에 해당하는 질문을 찾지 못했습니다. 다른 검색어로 찾거나 봇을 멘션해 메뉴에서 선택해주세요.")
+    else:
+        # 과정을 정하지 못해 여러 과정(AI, BDA)에서 찾은 경우 안내 추가
+        multiple_courses = len({course.split()[0] for course in courses}) > 1
+        blocks = create_command_answer_blocks(snapshot, question_ids, multiple_courses)
+        reply(response_type="ephemeral", blocks=blocks, text="FAQ 답변입니다.")
+    
+    # 응답까지 걸린 시간 (로깅은 응답을 보낸 뒤 처리)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    question_id = question_ids[0] if question_ids else None
+    if question_id is not None:
+        session_store.add_recent(user_id, question_id, snapshot.data_version)
+        popularity.record(snapshot.data[question_id])
+    
+    print(f"사용자 {user_id}의 /faq '{query}' 응답: 결과 {len(question_ids)}개, {elapsed_ms:.1f}ms")
+
+# 과정 선택 버튼 처리
+@app.action("select_ai_course")
+@app.action("select_bda_course")
+@profiled
+def handle_course_selection(ack, body, say):
+    ack()
+    say = queued_say(say, body["channel"]["id"])
+    
+    # 선택된 과정 정보
+    selected_course = body["actions"][0]["value"]
+    user_id = body["user"]["id"]
+    
+    print(f"사용자 {user_id}가 {selected_course}를 선택했습니다.")
+    
+    # 질문 선택 화면으로
+    handle_course_selection_direct(selected_course, say, user_id)
+
+# 질문 선택 버튼 처리 (최근 본 질문 바로가기 포함)
+@app.action(re.compile(r"^(recent_)?question_\d+$"))
+@profiled
+def handle_question_selection(ack, body, say):
+    ack()
+    say = queued_say(say, body["channel"]["id"])
+    
+    # 선택된 질문 정보 파싱 (과정명|질문 ID|질문 키)
+    button_value = body["actions"][0]["value"]
+    course = button_value.split("|", 1)[0]
+    user_id = body["user"]["id"]
+    
+    # 버튼을 보여준 뒤 FAQ 데이터가 다시 로드되었으면 질문 키로 같은 질문을 찾음
+    snapshot = faq_store.snapshot()
+    question_id = snapshot.resolve_ref(button_value)
+    
+    print(f"사용자 {user_id}가 {course}의 {question_id}번 질문을 선택했습니다.")
+    
+    if question_id is None:
+        handle_stale_question(course, say, user_id)
+    else:
+        session_store.add_recent(user_id, question_id, snapshot.data_version)
+        popularity.record(snapshot.data[question_id])
         
-        # 질문 텍스트 (카테고리 포함)
-        question_text = f"{category_icon} {faq['question']}"
+        # 답변 블록
+        blocks = faq_store.render(("answer", question_id), lambda snap: create_answer_blocks(snap, question_id))
+        
+        say(blocks=blocks, text="FAQ 답변입니다.")
+
+# 질문 검색 옵션 요청 처리 (응답 제한 시간이 짧으므로 미리 만든 인덱스에서 검색)
+@app.options("question_search")
+@profiled
+def handle_question_search_options(ack, body):
+    course = body["block_id"].split("|", 1)[1]
+    snapshot = faq_store.snapshot()
+    index = search_index(snapshot)
+    
+    options = []
+    for question_id in index.search(course, body.get("value", "")):
+        # 옵션 텍스트는 최대 75자
+        question_text = snapshot.data[question_id]["question"]
         if len(question_text) > 75:
             question_text = question_text[:72] + "..."
         
-        button_elements.append({
-            "type": "button",
+        options.append({
             "text": {
                 "type": "plain_text",
                 "text": question_text,
                 "emoji": True
             },
-            "value": f"{selected_course}|{i}",
-            "action_id": f"question_{i}"
+            "value": f"{course}|{snapshot.question_ref(question_id)}"
         })
     
-    # 버튼을 actions 블록에 추가 (최대 5개씩)
-    for i in range(0, len(button_elements), 5):
-        chunk = button_elements[i:i+5]
-        blocks.append({
-            "type": "actions",
-            "elements": chunk
-        })
+    ack(options=options)
+
+# 검색한 질문 선택 처리
+@app.action("question_search")
+@profiled
+def handle_question_search_selection(ack, body, say):
+    ack()
+    say = queued_say(say, body["channel"]["id"])
     
-    # 뒤로가기 버튼 추가
-    blocks.append({
-        "type": "actions",
-        "elements": [
-            {
-                "type": "button",
-                "text": {
-                    "type": "plain_text",
-                    "text": "◀️ 과정 선택으로 돌아가기",
-                    "emoji": True
-                },
-                "value": "back_to_start",
-                "action_id": "back_to_start"
-            }
-        ]
-    })
+    # 선택된 질문 정보 파싱 (과정명|질문 ID|질문 키)
+    selected_value = body["actions"][0]["selected_option"]["value"]
+    course = selected_value.split("|", 1)[0]
+    user_id = body["user"]["id"]
+    
+    print(f"사용자 {user_id}가 {course}에서 검색한 질문을 선택했습니다.")
+    
+    # 옵션을 보여준 뒤 FAQ 데이터가 다시 로드되었으면 질문 키로 같은 질문을 찾음
+    snapshot = faq_store.snapshot()
+    question_id = snapshot.resolve_ref(selected_value)
+    if question_id is None:
+        handle_stale_question(course, say, user_id)
+    else:
+        session_store.add_recent(user_id, question_id, snapshot.data_version)
+        popularity.record(snapshot.data[question_id])
+        
+        # 답변 블록
+        blocks = faq_store.render(("answer", question_id), lambda snap: create_answer_blocks(snap, question_id))
+        
+        say(blocks=blocks, text="FAQ 답변입니다.")
+
+# 다른 질문 보기 버튼 처리
+@app.action(re.compile(r"back_to_questions_.*"))
+@profiled
+def handle_back_to_questions(ack, body, say):
+    ack()
+    say = queued_say(say, body["channel"]["id"])
+    
+    # 과정명 추출
+    course = body["actions"][0]["value"]
+    user_id = body["user"]["id"]
+    
+    print(f"사용자 {user_id}가 {course}의 질문 목록으로 돌아갑니다.")
+    
+    # 다시 같은 과정의 질문 선택 화면으로
+    handle_course_selection_direct(course, say, user_id)
+
+# 처음으로 돌아가기 버튼 처리
+@app.action("back_to_start")
+@profiled
+def handle_back_to_start(ack, body, say):
+    ack()
+    say = queued_say(say, body["channel"]["id"])
+    
+    user_id = body["user"]["id"]
+    print(f"사용자 {user_id}가 처음 화면으로 돌아갑니다.")
+    
+    # 처음 과정 선택 화면으로
+    blocks = faq_store.render("courses", create_course_blocks)
+    
+    say(blocks=blocks, text="과정을 선택해주세요.")
+
+def handle_stale_question(course, say, user_id=None):
+    """FAQ 데이터가 바뀌어 버튼/옵션의 질문을 찾을 수 없을 때 안내 후 최신 질문 목록 표시"""
+    say(text="FAQ 내용이 업데이트되어 이전 목록의 질문을 열 수 없습니다. 최신 목록에서 다시 선택해주세요.")
+    if course in faq_store.snapshot().course_ids:
+        handle_course_selection_direct(course, say, user_id)
+    else:
+        blocks = faq_store.render("courses", create_course_blocks)
+        say(blocks=blocks, text="과정을 선택해주세요.")
+
+def handle_course_selection_direct(selected_course, say, user_id=None):
+    """과정 선택 로직을 직접 호출하는 헬퍼 함수"""
+    snapshot = faq_store.snapshot()
+    recent = []
+    if user_id:
+        session_store.update(user_id, selected_course, page="questions")
+        recent = session_store.recent(user_id, snapshot.data_version)
+    
+    # 질문 선택 블록 (최근 본 질문이 있으면 검색 메뉴 아래에 바로가기 추가)
+    blocks = faq_store.render(("questions", selected_course), lambda snap: create_question_blocks(snap, selected_course),
+                              snapshot)
+    recent_blocks = create_recent_blocks(snapshot, selected_course, recent)
+    if recent_blocks:
+        blocks = blocks[:3] + recent_blocks + blocks[3:]
     
     say(blocks=blocks, text="질문을 선택해주세요.")
 
@@ -417,11 +628,29 @@ if __name__ == "__main__":
     }
     print("토큰 설정 상태 확인:", token_status)
     
+    # 헬스 체크 서버 시작 (준비가 끝나기 전까지 readiness는 503)
+    health.start()
+    
+    # Slack 연결 전에 FAQ 데이터, 화면 블록, 검색 인덱스, 발송 워커를 미리 준비
+    warm_up()
+    start_background()
+    
     # Socket Mode 사용 (개발용)
     try:
-        handler = SocketModeHandler(app, os.environ.get("SLACK_APP_TOKEN2"))
+        # SOCKET_MODE_CONNECTIONS개 연결을 유지 (Slack이 이벤트를 연결들에 나눠 보내고, 하나가 재연결 중이어도 나머지로 수신)
+        handler = SocketModePool(app, os.environ.get("SLACK_APP_TOKEN2"))
         print("Socket Mode Handler 생성 완료")
         print("웹소켓 연결을 시작합니다...")
-        handler.start()
+        with health.phase("socket_connect"):
+            handler.connect()
+        
+        # 연결이 모두 끊기면 readiness 실패로 표시
+        health.add_check("socket_mode", handler.is_connected)
+        health.add_route("/stats/socket_mode", lambda: (200, handler.stats()))
+        health.mark_ready()
+        print("시작 준비 완료:", health.startup_report())
+        
+        # 연결 유지
+        threading.Event().wait()
     except Exception as e:
-        print("봇 시작 중 오류 발생:", e)
+        print("봇 시작 중 오류 발생:", e)
\ No newline at end of file
@@ -1,16 +1,83 @@
 import os
 import json
 import re
-from slack_bolt import App
-from slack_bolt.adapter.socket_mode import SocketModeHandler
+import time
+import threading
+from slack_bolt import App, BoltResponse
 from dotenv import load_dotenv
-from log import log_info, log_event, log_user_interaction, log_error
+from log import bot_logger, log_info, log_event, log_user_interaction, log_error
+from event_filter import event_filter
+from log_archive import log_archiver
+from usage_rollup import usage_rollup
+from outbound import queued_say, outbound_queue
+from dedup import dedup_cache
+from session import session_store
+from event_store import set_known_courses
+from faq_store import FAQStore, FAQ_FILES
+from faq_search import QuestionIndex
+from profiler import profiled, profiler
+from health import health
+from listener_pool import listener_executor
+from slack_http import PooledWebClient, attach_pooled_client, http_stats
+from socket_pool import SocketModePool
+from popularity import popularity, FAQ_ORDER
+from home_publisher import home_publisher
+from keyword_router import KeywordRoutes, KEYWORD_ROUTES_PATH, route_stats
 
 # .env 파일에서 환경 변수 로드
 load_dotenv()
 
-# Slack 앱 초기화
-app = App(token=os.environ.get("SLACK_BOT_TOKEN1"))
+# Slack 앱 초기화 (signing secret은 HTTP 모드 요청 서명 검증에 사용, Web API 호출은 keep-alive 연결 풀 사용)
+app = App(
+    client=PooledWebClient(token=os.environ.get("SLACK_BOT_TOKEN1")),
+    signing_secret=os.environ.get("SLACK_SIGNING_SECRET1"),
+    listener_executor=listener_executor
+)
+
+# 중복 요청 차단 (Slack 재전송, 버튼 더블 클릭) - 핸들러 실행 전에 처리
+@app.middleware
+def skip_duplicate_requests(body, next):
+    if dedup_cache.is_duplicate(body):
+        return BoltResponse(status=200, body="")
+    return next()
+
+# 리스너 실행 풀이 포화되면 정책에 따라 먼저 ack 응답 후 대기(defer) 또는 거절(reject)
+@app.middleware
+def apply_listener_backpressure(body, ack, context, next):
+    return listener_executor.admit(body, ack, context, next)
+
+# Bolt가 요청마다 새로 만드는 WebClient를 연결 풀을 쓰는 클라이언트로 교체 (say 등이 사용)
+@app.middleware
+def use_pooled_client(context, next):
+    attach_pooled_client(context)
+    return next()
+
+# 메시지 발송 큐 깊이, 대기 시간, 재시도/버린 메시지 수 조회
+health.add_route("/stats/outbound", lambda: (200, outbound_queue.stats()))
+# 리스너 실행 풀 사용률과 대기 시간 조회
+health.add_route("/stats/listeners", lambda: (200, listener_executor.stats()))
+# Slack API 메서드별 호출 지연 시간과 연결 재사용 현황 조회
+health.add_route("/stats/slack_http", lambda: (200, http_stats()))
+# 중복 요청(Slack 재전송, 버튼 연속 클릭) 판별 수와 보관 중인 키 수 조회
+health.add_route("/stats/dedup", lambda: (200, dedup_cache.stats()))
+# 사용자별 탐색 세션 수, 최대 크기 초과로 정리한 세션 수, 대략적인 메모리 사용량 조회
+health.add_route("/stats/sessions", lambda: (200, session_store.stats()))
+# 리스너 프로파일링 상태와 저장한 프로파일 수 조회 (PROFILE_ENABLED)
+health.add_route("/stats/profile", lambda: (200, profiler.stats()))
+# 인기순 정렬용 클릭 수 집계와 많이 본 질문 상위 5개 조회
+health.add_route("/stats/popularity", lambda: (200, popularity.stats()))
+# 질문 검색 횟수와 평균 검색 시간 조회
+health.add_route("/stats/search", lambda: (200, search_index().stats()))
+# 이벤트 로깅 필터 규칙과 종류별 기록/제외 건수 조회
+health.add_route("/stats/log_filter", lambda: (200, event_filter.stats()))
+# 로그 압축 건수와 압축률 조회
+health.add_route("/stats/log_archive", lambda: (200, log_archiver.stats()))
+# 최근 USAGE_ROLLUP_MINUTES분(기본 1시간) 분당 사용량 (액션/과정/카테고리별 건수, 고유 사용자 수)
+health.add_route("/stats/usage", lambda: (200, usage_rollup.snapshot()))
+# 홈 탭 게시/건너뜀/재게시 건수와 재게시 대기 사용자 수
+health.add_route("/stats/home", lambda: (200, home_publisher.stats()))
+# 멘션 키워드 라우팅 결과 (키워드/대상별 건수, 일치 없음, 평균 스캔 시간)
+health.add_route("/stats/keyword_routes", lambda: (200, route_stats.stats()))
 
 # FAQ 데이터 로드 (3개 파일 통합)
 def load_faq_data():
@@ -41,6 +108,23 @@ def load_faq_data():
     log_info(f"전체 FAQ 데이터 로드 완료: 총 {len(all_faq_data)}개 항목")
     return all_faq_data
 
+# FAQ 데이터는 한 번만 로드해 두고 파일이 바뀌면 다시 로드 (키워드 라우팅 표를 고쳐도 함께 다시 로드)
+faq_store = FAQStore(load_faq_data, files=FAQ_FILES + [KEYWORD_ROUTES_PATH])
+# 이벤트 저장소가 버튼 값에서 과정을 구분할 때 현재 FAQ 데이터의 과정 목록 사용
+faq_store.on_data_reload(lambda snapshot: set_known_courses(snapshot.course_ids))
+
+def search_index(snapshot=None):
+    """현재 정렬 순서의 질문 검색 인덱스 (색인은 FAQ 데이터를 다시 로드할 때만 새로 만듦)"""
+    return faq_store.render(
+        "search_index",
+        lambda snap: faq_store.render("search_data", QuestionIndex, snap, per_data=True).reordered(snap),
+        snapshot
+    )
+
+# 인기순 정렬 모드면 클릭 수를 기준으로 질문을 정렬 (이후 순서 갱신은 start_background에서 시작)
+if FAQ_ORDER == "popular":
+    popularity.attach(faq_store)
+
 def format_answer(answer_data):
     """답변을 슬랙 메시지 형식으로 포맷팅"""
     if isinstance(answer_data, dict):
@@ -54,17 +138,9 @@ def format_answer(answer_data):
     else:
         return answer_data
 
-# 모든 이벤트 로깅 (디버깅용)
-@app.event("message")
-def handle_message_events(message, say):
-    log_event("message", message)
-
-# 봇 멘션 이벤트 처리
-@app.event("app_mention")
-def handle_mention(event, say):
-    log_event("app_mention", event)
-    # 과정 선택 블록 생성
-    blocks = [
+def create_course_blocks(snapshot=None):
+    """과정 선택 블록 생성"""
+    return [
         {
             "type": "section",
             "text": {
@@ -101,30 +177,28 @@ def handle_mention(event, say):
             ]
         }
     ]
-    
-    say(blocks=blocks, text="과정을 선택해주세요.")
 
-# 과정 선택 버튼 처리
-@app.action("select_ai_course")
-@app.action("select_bda_course")
-def handle_course_selection(ack, body, say):
-    ack()
-    
-    # 선택된 과정 정보
-    selected_course = body["actions"][0]["value"]
-    user_id = body["user"]["id"]
-    
-    # 사용자 상호작용 로깅
-    log_user_interaction("course_selection", user_id, selected_course, body)
-    
-    # FAQ 데이터 로드
-    faq_data = load_faq_data()
-    
-    # 선택된 과정에 해당하는 카테고리들 추출
-    course_questions = [faq for faq in faq_data if faq["course"] == selected_course]
-    categories = list(set([faq["category"] for faq in course_questions]))
-    
-    # 카테고리 선택 블록 생성
+def create_search_block(course):
+    """질문 검색 선택 메뉴 블록 생성 (입력할 때마다 Slack이 옵션을 요청)"""
+    return {
+        "type": "actions",
+        "block_id": f"question_search|{course}",  # 옵션 요청에서 과정을 알 수 있도록 저장
+        "elements": [
+            {
+                "type": "external_select",
+                "action_id": "question_search",
+                "placeholder": {
+                    "type": "plain_text",
+                    "text": "🔍 질문 검색 (예: 출석, 강의자료)",
+                    "emoji": True
+                },
+                "min_query_length": 1
+            }
+        ]
+    }
+
+def create_category_blocks(snapshot, selected_course):
+    """카테고리 선택 블록 생성"""
     blocks = [
         {
             "type": "section",
@@ -141,14 +215,9 @@ def handle_course_selection(ack, body, say):
     # 카테고리 버튼들 생성
     category_elements = []
     
-    for category in categories:
+    for category in snapshot.categories.get(selected_course, []):
         # 카테고리별 이모지 설정
-        if "실시간" in category:
-            emoji = "🏫"
-        elif "온라인" in category:
-            emoji = "💻"
-        else:
-            emoji = "📋"
+        emoji = category_emoji(category)
         
         category_elements.append({
             "type": "button",
@@ -167,28 +236,46 @@ def handle_course_selection(ack, body, say):
         "elements": category_elements
     })
     
-    say(blocks=blocks, text="카테고리를 선택해주세요.")
-
-# 카테고리 선택 버튼 처리
-@app.action(re.compile(r"category_.*"))
-def handle_category_selection(ack, body, say):
-    ack()
-    
-    # 선택된 카테고리 정보 파싱
-    button_value = body["actions"][0]["value"]
-    course, category = button_value.split("|", 1)
-    user_id = body["user"]["id"]
-    
-    # 사용자 상호작용 로깅
-    log_user_interaction("category_selection", user_id, button_value, body)
+    # 카테고리를 거치지 않고 과정의 질문을 바로 찾는 검색 메뉴
+    blocks.append(create_search_block(selected_course))
     
-    # FAQ 데이터 로드
-    faq_data = load_faq_data()
+    return blocks
+
+def create_recent_blocks(snapshot, course, question_ids):
+    """최근 본 질문 바로가기 블록 생성 (사용자마다 다르므로 캐시하지 않음)"""
+    button_elements = []
+    for question_id in question_ids:
+        faq = snapshot.data[question_id]
+        if faq["course"] != course:
+            continue
+        button_elements.append({
+            "type": "button",
+            "text": {
+                "type": "plain_text",
+                "text": faq["question"][:75] + ("..." if len(faq["question"]) > 75 else ""),
+                "emoji": True
+            },
+            "value": f"{course}|{faq['category']}|{snapshot.question_ref(question_id)}",
+            "action_id": f"recent_question_{len(button_elements)}"
+        })
     
-    # 선택된 과정과 카테고리에 해당하는 질문들 필터링
-    filtered_questions = [faq for faq in faq_data if faq["course"] == course and faq["category"] == category]
+    if not button_elements:
+        return []
+    return [
+        {
+            "type": "context",
+            "elements": [{"type": "mrkdwn", "text": "🕘 최근 본 질문"}]
+        },
+        {
+            "type": "actions",
+            "elements": button_elements
+        }
+    ]
+
+def create_question_blocks(snapshot, course, category):
+    """질문 선택 블록 생성"""
+    question_ids = snapshot.questions(course, category)
     
-    # 질문 선택 블록 생성
     blocks = [
         {
             "type": "section",
@@ -205,7 +292,8 @@ def handle_category_selection(ack, body, say):
     # 질문 버튼들 생성
     button_elements = []
     
-    for i, faq in enumerate(filtered_questions):
+    for i, question_id in enumerate(question_ids):
+        faq = snapshot.data[question_id]
         button_elements.append({
             "type": "button",
             "text": {
@@ -213,7 +301,8 @@ def handle_category_selection(ack, body, say):
                 "text": faq["question"][:75] + ("..." if len(faq["question"]) > 75 else ""),
                 "emoji": True
             },
-            "value": f"{course}|{category}|{i}",  # 과정명, 카테고리, 인덱스를 저장
+            # 과정명, 카테고리, 질문 ID와 질문 키를 저장 (순서가 바뀌거나 FAQ를 다시 로드해도 누른 질문 그대로 찾음)
+            "value": f"{course}|{category}|{snapshot.question_ref(question_id)}",
             "action_id": f"question_{i}"
         })
     
@@ -242,86 +331,451 @@ def handle_category_selection(ack, body, say):
         ]
     })
     
-    say(blocks=blocks, text="질문을 선택해주세요.")
+    return blocks
 
-# 질문 선택 버튼 처리
-@app.action(re.compile(r"question_\d+"))
-def handle_question_selection(ack, body, say):
-    ack()
-    
-    # 선택된 질문 정보 파싱
-    button_value = body["actions"][0]["value"]
-    course, category, question_index = button_value.split("|")
-    question_index = int(question_index)
-    user_id = body["user"]["id"]
+def create_answer_blocks(snapshot, question_id):
+    """답변 블록 생성"""
+    selected_faq = snapshot.data[question_id]
+    course, category = selected_faq["course"], selected_faq["category"]
     
-    # 사용자 상호작용 로깅
-    log_user_interaction("question_selection", user_id, button_value, body)
+    return [
+        {
+            "type": "section",
+            "text": {
+                "type": "mrkdwn",
+                "text": f"*Q: {selected_faq['question']}*\n📂 카테고리: {selected_faq['category']}\n🎓 과정: {selected_faq['course']}"
+            }
+        },
+        {
+            "type": "divider"
+        },
+        {
+            "type": "section",
+            "text": {
+                "type": "mrkdwn",
+                "text": f"*A:* {format_answer(selected_faq['answer'])}"
+            }
+        },
+        {
+            "type": "divider"
+        },
+        {
+            "type": "actions",
+            "elements": [
+                {
+                    "type": "button",
+                    "text": {
+                        "type": "plain_text",
+                        "text": "🔄 같은 카테고리 다른 질문 보기",
+                        "emoji": True
+                    },
+                    "value": f"{course}|{category}",
+                    "action_id": f"back_to_questions_{course.replace(' ', '_')}"
+                },
+                {
+                    "type": "button",
+                    "text": {
+                        "type": "plain_text",
+                        "text": "◀️ 카테고리 선택으로 돌아가기",
+                        "emoji": True
+                    },
+                    "value": course,
+                    "action_id": f"back_to_categories_{course.replace(' ', '_')}"
+                }
+            ]
+        }
+    ]
+
+def create_command_answer_blocks(snapshot, question_ids, multiple_courses=False):
+    """/faq 명령 답변 블록 생성 (본인에게만 보이는 메시지이므로 버튼 없이 답변과 관련 질문만 표시)"""
+    selected_faq = snapshot.data[question_ids[0]]
     
-    # FAQ 데이터 로드
-    faq_data = load_faq_data()
+    blocks = [
+        {
+            "type": "section",
+            "text": {
+                "type": "mrkdwn",
+                "text": f"*Q: {selected_faq['question']}*\n📂 카테고리: {selected_faq['category']}\n🎓 과정: {selected_faq['course']}"
+            }
+        },
+        {
+            "type": "divider"
+        },
+        {
+            "type": "section",
+            "text": {
+                "type": "mrkdwn",
+                "text": f"*A:* {format_answer(selected_faq['answer'])}"
+            }
+        }
+    ]
     
-    # 해당 과정과 카테고리의 질문들 필터링
-    filtered_questions = [faq for faq in faq_data if faq["course"] == course and faq["category"] == category]
+    # 함께 검색된 다른 질문
+    context_texts = []
+    if len(question_ids) > 1:
+        related = "\n".join(f"• {snapshot.data[qid]['question']}" for qid in question_ids[1:])
+        context_texts.append(f"*관련 질문*\n{related}")
+    if multiple_courses:
+        context_texts.append("과정명을 함께 입력하면 해당 과정의 답변을 볼 수 있습니다. (예: `/faq BDA 출석`)")
+    if context_texts:
+        blocks.append({
+            "type": "context",
+            "elements": [{"type": "mrkdwn", "text": text} for text in context_texts]
+        })
     
-    if question_index < len(filtered_questions):
-        selected_faq = filtered_questions[question_index]
-        
-        # 답변 블록 생성
-        blocks = [
-            {
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": f"*Q: {selected_faq['question']}*\n📂 카테고리: {selected_faq['category']}\n🎓 과정: {selected_faq['course']}"
-                }
-            },
-            {
-                "type": "divider"
-            },
-            {
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": f"*A:* {format_answer(selected_faq['answer'])}"
-                }
-            },
-            {
-                "type": "divider"
-            },
+    return blocks
+
+def category_emoji(category):
+    """카테고리별 이모지"""
+    if "실시간" in category:
+        return "🏫"
+    elif "온라인" in category:
+        return "💻"
+    return "📋"
+
+def create_home_view(snapshot, course):
+    """App Home 탭 화면 생성 (과정을 고르기 전에는 과정 선택, 고른 뒤에는 카테고리별 질문 목록)"""
+    course_buttons = {
+        "type": "actions",
+        "elements": [
             {
+                "type": "button",
+                "text": {"type": "plain_text", "text": f"{emoji} {name}", "emoji": True},
+                "value": name,
+                "action_id": f"home_course_{name.split()[0].lower()}",
+                **({"style": "primary"} if name == course else {})
+            }
+            for emoji, name in (("🧠", "AI 과정"), ("📊", "BDA 과정"))
+        ]
+    }
+    
+    if course not in snapshot.categories:
+        return {
+            "type": "home",
+            "blocks": [
+                {
+                    "type": "section",
+                    "text": {
+                        "type": "mrkdwn",
+                        "text": "안녕하세요! 🤖 커널아카데미 부트캠프 FAQ 봇입니다.\n현재 진행중인 과정명을 선택해주세요."
+                    }
+                },
+                {
+                    "type": "divider"
+                },
+                course_buttons
+            ]
+        }
+    
+    blocks = [
+        {
+            "type": "section",
+            "text": {
+                "type": "mrkdwn",
+                "text": f"*{course}* FAQ입니다. 질문을 누르면 답변을 보여드립니다."
+            }
+        },
+        course_buttons
+    ]
+    
+    # 카테고리별 질문 버튼 (actions 블록 하나에 5개씩)
+    for category in snapshot.categories[course]:
+        blocks.append({"type": "divider"})
+        blocks.append({
+            "type": "section",
+            "text": {
+                "type": "mrkdwn",
+                "text": f"*{category_emoji(category)} {category}*"
+            }
+        })
+        question_ids = snapshot.questions(course, category)
+        for start in range(0, len(question_ids), 5):
+            blocks.append({
                 "type": "actions",
                 "elements": [
                     {
                         "type": "button",
                         "text": {
                             "type": "plain_text",
-                            "text": "🔄 같은 카테고리 다른 질문 보기",
-                            "emoji": True
-                        },
-                        "value": f"{course}|{category}",
-                        "action_id": f"back_to_questions_{course.replace(' ', '_')}"
-                    },
-                    {
-                        "type": "button",
-                        "text": {
-                            "type": "plain_text",
-                            "text": "◀️ 카테고리 선택으로 돌아가기",
+                            "text": snapshot.data[qid]["question"][:75],
                             "emoji": True
                         },
-                        "value": course,
-                        "action_id": f"back_to_categories_{course.replace(' ', '_')}"
+                        "value": f"{course}|{snapshot.question_ref(qid)}",
+                        "action_id": f"home_faq_{qid}"
                     }
+                    for qid in question_ids[start:start + 5]
                 ]
-            }
-        ]
+            })
+    
+    # 홈 탭은 블록을 최대 100개까지 표시
+    return {"type": "home", "blocks": blocks[:100]}
+
+def create_home_answer_view(snapshot, question_id):
+    """홈 탭에서 누른 질문의 답변 모달"""
+    return {
+        "type": "modal",
+        "title": {"type": "plain_text", "text": "FAQ 답변"},
+        "close": {"type": "plain_text", "text": "닫기"},
+        "blocks": create_command_answer_blocks(snapshot, [question_id])
+    }
+
+# 홈 탭 화면도 스냅샷별로 캐시하고, FAQ 데이터가 바뀌면 최근 사용자에게 다시 게시
+home_publisher.attach(faq_store, app.client, create_home_view)
+
+def warm_up():
+    """FAQ 데이터를 로드하고 모든 화면 블록과 검색 인덱스를 미리 만들어 둠 (단계별 소요 시간 기록)"""
+    with health.phase("faq_load"):
+        snapshot = faq_store.snapshot()
+    with health.phase("render_screens"):
+        faq_store.render("courses", create_course_blocks)
+        for course, categories in snapshot.categories.items():
+            faq_store.render(("categories", course), lambda snap, course=course: create_category_blocks(snap, course))
+            for category in categories:
+                faq_store.render(("questions", course, category),
+                                 lambda snap, course=course, category=category: create_question_blocks(snap, course, category))
+    with health.phase("render_answers"):
+        for question_id in range(len(snapshot.data)):
+            faq_store.render(("answer", question_id), lambda snap, qid=question_id: create_answer_blocks(snap, qid))
+    with health.phase("render_home"):
+        for course in [None] + list(snapshot.categories):
+            home_publisher.view(course, snapshot)
+    with health.phase("search_index"):
+        # 질문 검색 인덱스와 키워드 라우팅 표도 스냅샷별로 한 번만 생성
+        search_index()
+        faq_store.render("keyword_routes", KeywordRoutes, per_data=True)
+    log_info(f"화면 블록 사전 생성 완료: {len(snapshot.blocks)}개")
+    return snapshot
+
+def start_background():
+    """발송 워커, 이벤트 저장, 로그 압축 스레드 시작 (pre-fork 서버에서는 fork 이후 워커마다 호출)"""
+    with health.phase("outbound_workers"):
+        outbound_queue.start()
+    bot_logger.start()
+    # 인기순 정렬 모드면 질문 순서 갱신 스레드 시작
+    popularity.start()
+    # 닫힌 로그 파일 압축은 백그라운드에서 진행
+    log_archiver.start()
+
+# 모든 이벤트 로깅 (디버깅용, LOG_EVENT_RULES 규칙에 따라 샘플링)
+@app.event("message")
+@profiled
+def handle_message_events(message, say):
+    log_event("message", message)
+
+# 봇 멘션 이벤트 처리
+@app.event("app_mention")
+@profiled
+def handle_mention(event, say):
+    log_event("app_mention", event)
+    say = queued_say(say, event["channel"])
+    user_id = event.get("user")
+    
+    # 멘션 문장에 키워드(지각, Zoom, 강의자료 등)가 있으면 해당 화면이나 답변으로 바로 이동
+    # 과정명이 없으면 사용자가 마지막으로 본 과정 기준
+    snapshot = faq_store.snapshot()
+    session = session_store.get(user_id) if user_id else None
+    routes = faq_store.render("keyword_routes", KeywordRoutes, snapshot, per_data=True)
+    route = routes.route(event.get("text", ""), session.course if session else None)
+    
+    if route is None:
+        # 과정 선택 블록
+        blocks = faq_store.render("courses", create_course_blocks)
+        say(blocks=blocks, text="과정을 선택해주세요.")
+        return
+    
+    question_id = route["question_id"]
+    if question_id is not None:
+        session_store.add_recent(user_id, question_id, snapshot.data_version)
+        popularity.record(snapshot.data[question_id])
+        blocks = faq_store.render(("answer", question_id), lambda snap: create_answer_blocks(snap, question_id), snapshot)
+        say(blocks=blocks, text="FAQ 답변입니다.")
+    elif route["category"]:
+        handle_category_selection_direct(route["course"], route["category"], say, user_id)
+    else:
+        handle_course_selection_direct(route["course"], say, user_id)
+    
+    # 사용자 상호작용 로깅
+    selected_value = "|".join(str(part) for part in (route["course"], route["category"], question_id) if part is not None)
+    log_user_interaction("keyword_route", user_id, selected_value, {
+        "user_id": user_id,
+        "channel": {"id": event.get("channel")},
+        "keyword": route["keyword"],
+        "question_id": question_id
+    }, question_id)
+
+# /faq 슬래시 명령 처리 (검색 결과를 본인에게만 보이는 메시지로 ack와 함께 바로 응답)
+@app.command("/faq")
+@profiled
+def handle_faq_command(ack, command, respond, context):
+    started = time.perf_counter()
+    
+    # 실행 풀 포화로 ack를 먼저 보낸 경우에는 response_url로 응답
+    reply = respond if context.get("deferred_ack") else ack
+    query = command.get("text", "").strip()
+    user_id = command["user_id"]
+    
+    # 과정명이 없으면 사용자가 마지막으로 본 과정에서 검색
+    snapshot = faq_store.snapshot()
+    index = search_index(snapshot)
+    session = session_store.get(user_id)
+    courses, question_ids = index.resolve_query(query, session.course if session else None, limit=5)
+    
+    if not query:
+        reply(response_type="ephemeral", text="사용법: `/faq [과정] 검색어` (예: `/faq BDA 출석`)")
+    elif not question_ids:
+        reply(response_type="ephemeral",
+              text=f"'{query}'에 해당하는 질문을 찾지 못했습니다. 다른 검색어로 찾거나 봇을 멘션해 메뉴에서 선택해주세요.")
+    else:
+        # 과정을 정하지 못해 여러 과정(AI, BDA)에서 찾은 경우 안내 추가
+        multiple_courses = len({course.split()[0] for course in courses}) > 1
+        blocks = create_command_answer_blocks(snapshot, question_ids, multiple_courses)
+        reply(response_type="ephemeral", blocks=blocks, text="FAQ 답변입니다.")
+    
+    # 응답까지 걸린 시간 (로깅은 응답을 보낸 뒤 처리)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    question_id = question_ids[0] if question_ids else None
+    if question_id is not None:
+        session_store.add_recent(user_id, question_id, snapshot.data_version)
+        popularity.record(snapshot.data[question_id])
+    
+    # 사용자 상호작용 로깅
+    log_user_interaction("faq_command", user_id, query, {
+        "user_id": user_id,
+        "channel": {"id": command.get("channel_id")},
+        "courses": courses,
+        "question_id": question_id,
+        "results": len(question_ids),
+        "elapsed_ms": round(elapsed_ms, 3)
+    }, question_id)
+
+# 과정 선택 버튼 처리
+@app.action("select_ai_course")
+@app.action("select_bda_course")
+@profiled
+def handle_course_selection(ack, body, say):
+    ack()
+    say = queued_say(say, body["channel"]["id"])
+    
+    # 선택된 과정 정보
+    selected_course = body["actions"][0]["value"]
+    user_id = body["user"]["id"]
+    
+    # 사용자 상호작용 로깅
+    log_user_interaction("course_selection", user_id, selected_course, body)
+    
+    # 카테고리 선택 화면으로
+    handle_course_selection_direct(selected_course, say, user_id)
+
+# 카테고리 선택 버튼 처리
+@app.action(re.compile(r"category_.*"))
+@profiled
+def handle_category_selection(ack, body, say):
+    ack()
+    say = queued_say(say, body["channel"]["id"])
+    
+    # 선택된 카테고리 정보 파싱
+    button_value = body["actions"][0]["value"]
+    course, category = button_value.split("|", 1)
+    user_id = body["user"]["id"]
+    
+    # 사용자 상호작용 로깅
+    log_user_interaction("category_selection", user_id, button_value, body)
+    
+    # 질문 선택 화면으로
+    handle_category_selection_direct(course, category, say, user_id)
+
+# 질문 선택 버튼 처리 (최근 본 질문 바로가기 포함)
+@app.action(re.compile(r"^(recent_)?question_\d+$"))
+@profiled
+def handle_question_selection(ack, body, say):
+    ack()
+    say = queued_say(say, body["channel"]["id"])
+    
+    # 선택된 질문 정보 파싱 (과정명|카테고리|질문 ID|질문 키)
+    button_value = body["actions"][0]["value"]
+    course = button_value.split("|", 1)[0]
+    user_id = body["user"]["id"]
+    
+    # 버튼을 보여준 뒤 FAQ 데이터가 다시 로드되었으면 질문 키로 같은 질문을 찾음
+    snapshot = faq_store.snapshot()
+    question_id = snapshot.resolve_ref(button_value)
+    
+    # 사용자 상호작용 로깅
+    log_user_interaction("question_selection", user_id, button_value, body, question_id)
+    
+    if question_id is None:
+        handle_stale_question(course, say, user_id)
+    else:
+        session_store.add_recent(user_id, question_id, snapshot.data_version)
+        popularity.record(snapshot.data[question_id])
+        
+        # 답변 블록
+        blocks = faq_store.render(("answer", question_id), lambda snap: create_answer_blocks(snap, question_id))
+        
+        say(blocks=blocks, text="FAQ 답변입니다.")
+
+# 질문 검색 옵션 요청 처리 (응답 제한 시간이 짧으므로 미리 만든 인덱스에서 검색)
+@app.options("question_search")
+@profiled
+def handle_question_search_options(ack, body):
+    course = body["block_id"].split("|", 1)[1]
+    snapshot = faq_store.snapshot()
+    index = search_index(snapshot)
+    
+    options = []
+    for question_id in index.search(course, body.get("value", "")):
+        # 옵션 텍스트는 최대 75자
+        question_text = snapshot.data[question_id]["question"]
+        if len(question_text) > 75:
+            question_text = question_text[:72] + "..."
+        
+        options.append({
+            "text": {
+                "type": "plain_text",
+                "text": question_text,
+                "emoji": True
+            },
+            "value": f"{course}|{snapshot.question_ref(question_id)}"
+        })
+    
+    ack(options=options)
+
+# 검색한 질문 선택 처리
+@app.action("question_search")
+@profiled
+def handle_question_search_selection(ack, body, say):
+    ack()
+    say = queued_say(say, body["channel"]["id"])
+    
+    # 선택된 질문 정보 파싱 (과정명|질문 ID|질문 키)
+    selected_value = body["actions"][0]["selected_option"]["value"]
+    course = selected_value.split("|", 1)[0]
+    user_id = body["user"]["id"]
+    
+    # 옵션을 보여준 뒤 FAQ 데이터가 다시 로드되었으면 질문 키로 같은 질문을 찾음
+    snapshot = faq_store.snapshot()
+    question_id = snapshot.resolve_ref(selected_value)
+    
+    # 사용자 상호작용 로깅
+    log_user_interaction("question_search", user_id, selected_value, body, question_id)
+    
+    if question_id is None:
+        handle_stale_question(course, say, user_id)
+    else:
+        session_store.add_recent(user_id, question_id, snapshot.data_version)
+        popularity.record(snapshot.data[question_id])
+        
+        # 답변 블록
+        blocks = faq_store.render(("answer", question_id), lambda snap: create_answer_blocks(snap, question_id))
         
         say(blocks=blocks, text="FAQ 답변입니다.")
 
 # 다른 질문 보기 버튼 처리 (같은 카테고리 내)
 @app.action(re.compile(r"back_to_questions_.*"))
+@profiled
 def handle_back_to_questions(ack, body, say):
     ack()
+    say = queued_say(say, body["channel"]["id"])
     
     # 과정명과 카테고리 추출
     button_value = body["actions"][0]["value"]
@@ -332,12 +786,14 @@ def handle_back_to_questions(ack, body, say):
     log_user_interaction("back_to_questions", user_id, button_value, body)
     
     # 다시 같은 카테고리의 질문 선택 화면으로
-    handle_category_selection_direct(course, category, say)
+    handle_category_selection_direct(course, category, say, user_id)
 
 # 카테고리 선택으로 돌아가기 버튼 처리
 @app.action(re.compile(r"back_to_categories_.*"))
+@profiled
 def handle_back_to_categories(ack, body, say):
     ack()
+    say = queued_say(say, body["channel"]["id"])
     
     # 과정명 추출
     course = body["actions"][0]["value"]
@@ -347,123 +803,99 @@ def handle_back_to_categories(ack, body, say):
     log_user_interaction("back_to_categories", user_id, course, body)
     
     # 다시 카테고리 선택 화면으로
-    handle_course_selection_direct(course, say)
+    handle_course_selection_direct(course, say, user_id)
 
-def handle_course_selection_direct(selected_course, say):
-    """과정 선택 로직을 직접 호출하는 헬퍼 함수 (카테고리 선택 화면)"""
-    # FAQ 데이터 로드
-    faq_data = load_faq_data()
+# 홈 탭 열기 (이미 최신 화면이면 다시 게시하지 않음)
+@app.event("app_home_opened")
+@profiled
+def handle_app_home_opened(event, client):
+    if event.get("tab") != "home":
+        return
+    user_id = event["user"]
+    session = session_store.get(user_id)
+    course = home_publisher.course_of(user_id) or (session.course if session else None)
+    home_publisher.open(user_id, course, event.get("view"), client)
     
-    # 선택된 과정에 해당하는 카테고리들 추출
-    course_questions = [faq for faq in faq_data if faq["course"] == selected_course]
-    categories = list(set([faq["category"] for faq in course_questions]))
+    # 사용자 상호작용 로깅
+    log_user_interaction("home_opened", user_id, course, {
+        "user_id": user_id,
+        "channel": {"id": event.get("channel")},
+        "tab": event.get("tab")
+    })
+
+# 홈 탭 과정 선택 버튼 처리
+@app.action(re.compile(r"home_course_.*"))
+@profiled
+def handle_home_course_selection(ack, body, client):
+    ack()
     
-    # 카테고리 선택 블록 생성
-    blocks = [
-        {
-            "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": f"*{selected_course}*에 대한 FAQ입니다.\n\n*카테고리를 선택해주세요:*"
-            }
-        },
-        {
-            "type": "divider"
-        }
-    ]
+    course = body["actions"][0]["value"]
+    user_id = body["user"]["id"]
+    session_store.update(user_id, course, page="home")
+    home_publisher.open(user_id, course, client=client)
     
-    # 카테고리 버튼들 생성
-    category_elements = []
+    # 사용자 상호작용 로깅
+    log_user_interaction("home_course_selection", user_id, course, body)
+
+# 홈 탭 질문 버튼 처리 (답변을 모달로 표시)
+@app.action(re.compile(r"home_faq_\d+"))
+@profiled
+def handle_home_question(ack, body, client):
+    ack()
     
-    for category in categories:
-        # 카테고리별 이모지 설정
-        if "실시간" in category:
-            emoji = "🏫"
-        elif "온라인" in category:
-            emoji = "💻"
-        else:
-            emoji = "📋"
-        
-        category_elements.append({
-            "type": "button",
-            "text": {
-                "type": "plain_text",
-                "text": f"{emoji} {category}",
-                "emoji": True
-            },
-            "value": f"{selected_course}|{category}",
-            "action_id": f"category_{category.replace(' ', '_').replace('(', '_').replace(')', '_')}"
-        })
+    button_value = body["actions"][0]["value"]
+    course = button_value.split("|", 1)[0]
+    user_id = body["user"]["id"]
     
-    # 카테고리 버튼을 actions 블록에 추가
-    blocks.append({
-        "type": "actions",
-        "elements": category_elements
-    })
+    # 홈 화면을 게시한 뒤 FAQ 데이터가 다시 로드되었으면 질문 키로 같은 질문을 찾음
+    snapshot = faq_store.snapshot()
+    question_id = snapshot.resolve_ref(button_value)
+    if question_id is not None:
+        view = faq_store.render(("home_answer", question_id),
+                                lambda snap: create_home_answer_view(snap, question_id), snapshot)
+        client.views_open(trigger_id=body["trigger_id"], view=view)
+        session_store.add_recent(user_id, question_id, snapshot.data_version)
+        popularity.record(snapshot.data[question_id])
+    else:
+        # 없어진 질문이면 홈 탭을 최신 화면으로 다시 게시
+        home_publisher.open(user_id, course if course in snapshot.course_ids else None, client=client)
+    
+    # 사용자 상호작용 로깅
+    log_user_interaction("home_question", user_id, button_value, body, question_id)
+
+def handle_stale_question(course, say, user_id=None):
+    """FAQ 데이터가 바뀌어 버튼/옵션의 질문을 찾을 수 없을 때 안내 후 최신 과정 화면 표시"""
+    say(text="FAQ 내용이 업데이트되어 이전 목록의 질문을 열 수 없습니다. 최신 목록에서 다시 선택해주세요.")
+    if course in faq_store.snapshot().course_ids:
+        handle_course_selection_direct(course, say, user_id)
+    else:
+        blocks = faq_store.render("courses", create_course_blocks)
+        say(blocks=blocks, text="과정을 선택해주세요.")
+
+def handle_course_selection_direct(selected_course, say, user_id=None):
+    """과정 선택 로직을 직접 호출하는 헬퍼 함수 (카테고리 선택 화면)"""
+    snapshot = faq_store.snapshot()
+    recent = []
+    if user_id:
+        session_store.update(user_id, selected_course, page="categories")
+        recent = session_store.recent(user_id, snapshot.data_version)
+    
+    # 카테고리 선택 블록 (최근 본 질문이 있으면 카테고리 아래에 바로가기 추가)
+    blocks = faq_store.render(("categories", selected_course), lambda snap: create_category_blocks(snap, selected_course),
+                              snapshot)
+    recent_blocks = create_recent_blocks(snapshot, selected_course, recent)
+    if recent_blocks:
+        blocks = blocks[:3] + recent_blocks + blocks[3:]
     
     say(blocks=blocks, text="카테고리를 선택해주세요.")
 
-def handle_category_selection_direct(course, category, say):
+def handle_category_selection_direct(course, category, say, user_id=None):
     """카테고리 선택 로직을 직접 호출하는 헬퍼 함수 (질문 선택 화면)"""
-    # FAQ 데이터 로드
-    faq_data = load_faq_data()
+    if user_id:
+        session_store.update(user_id, course, category, page="questions")
     
-    # 선택된 과정과 카테고리에 해당하는 질문들 필터링
-    filtered_questions = [faq for faq in faq_data if faq["course"] == course and faq["category"] == category]
-    
-    # 질문 선택 블록 생성
-    blocks = [
-        {
-            "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": f"*{course}* > *{category}*\n\n*궁금한 질문을 선택해주세요:*"
-            }
-        },
-        {
-            "type": "divider"
-        }
-    ]
-    
-    # 질문 버튼들 생성
-    button_elements = []
-    
-    for i, faq in enumerate(filtered_questions):
-        button_elements.append({
-            "type": "button",
-            "text": {
-                "type": "plain_text",
-                "text": faq["question"][:75] + ("..." if len(faq["question"]) > 75 else ""),
-                "emoji": True
-            },
-            "value": f"{course}|{category}|{i}",
-            "action_id": f"question_{i}"
-        })
-    
-    # 버튼을 actions 블록에 추가 (최대 5개씩)
-    for i in range(0, len(button_elements), 5):
-        chunk = button_elements[i:i+5]
-        blocks.append({
-            "type": "actions",
-            "elements": chunk
-        })
-    
-    # 뒤로가기 버튼 추가
-    blocks.append({
-        "type": "actions",
-        "elements": [
-            {
-                "type": "button",
-                "text": {
-                    "type": "plain_text",
-                    "text": "◀️ 카테고리 선택으로 돌아가기",
-                    "emoji": True
-                },
-                "value": course,
-                "action_id": f"back_to_categories_{course.replace(' ', '_')}"
-            }
-        ]
-    })
+    # 질문 선택 블록
+    blocks = faq_store.render(("questions", course, category), lambda snap: create_question_blocks(snap, course, category))
     
     say(blocks=blocks, text="질문을 선택해주세요.")
 
@@ -477,11 +909,29 @@ if __name__ == "__main__":
     }
     log_info("토큰 설정 상태 확인", token_status)
     
+    # 헬스 체크 서버 시작 (준비가 끝나기 전까지 readiness는 503)
+    health.start()
+    
+    # Slack 연결 전에 FAQ 데이터, 화면 블록, 검색 인덱스, 발송 워커를 미리 준비
+    warm_up()
+    start_background()
+    
     # Socket Mode 사용 (개발용)
     try:
-        handler = SocketModeHandler(app, os.environ.get("SLACK_APP_TOKEN1"))
+        # SOCKET_MODE_CONNECTIONS개 연결을 유지 (Slack이 이벤트를 연결들에 나눠 보내고, 하나가 재연결 중이어도 나머지로 수신)
+        handler = SocketModePool(app, os.environ.get("SLACK_APP_TOKEN1"))
         log_info("Socket Mode Handler 생성 완료")
         log_info("웹소켓 연결을 시작합니다...")
-        handler.start()
+        with health.phase("socket_connect"):
+            handler.connect()
+        
+        # 연결이 모두 끊기면 readiness 실패로 표시
+        health.add_check("socket_mode", handler.is_connected)
+        health.add_route("/stats/socket_mode", lambda: (200, handler.stats()))
+        health.mark_ready()
+        log_info("시작 준비 완료", health.startup_report())
+        
+        # 연결 유지
+        threading.Event().wait()
     except Exception as e:
         log_error("봇 시작 중 오류 발생", e)
\ No newline at end of file
@@ -0,0 +1,348 @@
+import os
+import time
+import heapq
+import random
+import socket
+import itertools
+import threading
+import http.client
+from collections import deque
+from urllib.error import URLError, HTTPError
+from typing import Dict, Any, Callable
+from slack_sdk.errors import SlackApiError
+from config import env_int, env_float
+from log import log_error
+
+# Slack Web API 티어별 분당 호출 한도 (https://api.slack.com/docs/rate-limits)
+SLACK_TIER_LIMITS_PER_MINUTE = {
+    1: 1,
+    2: 20,
+    3: 50,
+    4: 100,
+}
+
+# 발송 큐로 보내는 메서드의 티어 ("special": 채널당 초당 1건의 특수 한도가 있는 chat.postMessage)
+SLACK_METHOD_TIERS = {
+    "chat.postMessage": "special",
+    "chat.postEphemeral": 4,
+    "chat.update": 3,
+    "chat.delete": 3,
+    "views.publish": 4,
+}
+DEFAULT_METHOD = "chat.postMessage"
+
+# chat.postMessage는 특수 한도: 채널당 초당 1건 (짧은 버스트 허용)
+CHANNEL_RATE_PER_SECOND = env_float("SLACK_CHANNEL_RATE", 1)
+CHANNEL_BURST = env_int("SLACK_CHANNEL_BURST", 3)
+
+# chat.postMessage 워크스페이스 전체 상한 (티어가 없는 특수 한도라 환경 변수로 조정)
+WORKSPACE_RATE_PER_SECOND = env_float("SLACK_WORKSPACE_RATE", 10)
+WORKSPACE_BURST = env_int("SLACK_WORKSPACE_BURST", 20)
+
+OUTBOUND_WORKERS = env_int("SLACK_OUTBOUND_WORKERS", 4)
+OUTBOUND_MAX_QUEUE = env_int("SLACK_OUTBOUND_MAX_QUEUE", 1000)
+OUTBOUND_MAX_RETRIES = env_int("SLACK_OUTBOUND_MAX_RETRIES", 5)
+OUTBOUND_ENQUEUE_TIMEOUT = env_float("SLACK_OUTBOUND_ENQUEUE_TIMEOUT", 2)
+# 발송이 끝난 채널의 속도 제한 상태를 정리하는 주기(초)
+OUTBOUND_IDLE_SWEEP_SECONDS = 60
+
+# 다시 보내면 성공할 수 있는 연결 오류 (channel_not_found 같은 Slack 오류 응답은 재시도하지 않음)
+RETRYABLE_ERRORS = (URLError, ConnectionError, TimeoutError, socket.timeout, http.client.HTTPException)
+
+
+def method_limit(method: str):
+    """메서드의 워크스페이스 전체 한도 -> (초당 호출 수, 버스트 허용량)"""
+    tier = SLACK_METHOD_TIERS.get(method, 3)
+    if tier == "special":
+        return WORKSPACE_RATE_PER_SECOND, WORKSPACE_BURST
+    per_minute = SLACK_TIER_LIMITS_PER_MINUTE[tier]
+    # 티어 한도는 분 단위이므로 10초 분량까지 몰아서 보낼 수 있게 함
+    return per_minute / 60, max(1, per_minute // 6)
+
+
+def is_retryable(error: Exception) -> bool:
+    """일시적인 오류(429, 5xx, 연결 오류)만 재시도"""
+    if isinstance(error, SlackApiError):
+        status = getattr(error.response, "status_code", None)
+        return status is not None and (status == 429 or status >= 500)
+    if isinstance(error, HTTPError):
+        return error.code == 429 or error.code >= 500
+    return isinstance(error, RETRYABLE_ERRORS)
+
+
+class TokenBucket:
+    """토큰 버킷 방식의 호출 속도 제한기"""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self) -> float:
+        """토큰을 하나 소비합니다. 성공하면 0, 실패하면 다음 토큰까지 기다릴 시간(초)을 반환"""
+        with self.lock:
+            self._refill(time.monotonic())
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+    def wait_time(self) -> float:
+        """토큰을 소비하지 않고 다음 토큰까지 기다릴 시간(초)만 계산"""
+        with self.lock:
+            self._refill(time.monotonic())
+            return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def idle_for(self, now: float) -> bool:
+        """마지막 사용 후 버킷이 다시 가득 찰 만큼 지났으면 True (새 버킷과 같은 상태)"""
+        with self.lock:
+            return now - self.updated >= self.capacity / self.rate
+
+
+class OutboundMessage:
+    __slots__ = ("channel", "send", "method", "kwargs", "enqueued_at", "attempts")
+
+    def __init__(self, channel: str, send: Callable, method: str, kwargs: Dict[str, Any]):
+        self.channel = channel
+        self.send = send
+        self.method = method
+        self.kwargs = kwargs
+        self.enqueued_at = time.monotonic()
+        self.attempts = 0
+
+
+class OutboundQueue:
+    """채널/워크스페이스 단위 속도 제한, Retry-After 대기, 지터 재시도를 적용한 메시지 발송 큐
+
+    같은 채널의 메시지는 순서대로, 서로 다른 채널의 메시지는 여러 워커가 병렬로 발송합니다.
+    워크스페이스 한도는 메서드의 Slack 티어에서, 채널 한도는 chat.postMessage의 특수 한도에서 정합니다.
+    속도 제한이나 재시도 대기에 걸린 채널은 워커가 기다리지 않고 발송 가능 시각과 함께 대기열에
+    다시 넣으므로, 한 채널이 멈춰도 다른 채널은 계속 발송됩니다.
+    """
+
+    def __init__(self, workers: int = OUTBOUND_WORKERS, max_queue: int = OUTBOUND_MAX_QUEUE,
+                 max_retries: int = OUTBOUND_MAX_RETRIES, enqueue_timeout: float = OUTBOUND_ENQUEUE_TIMEOUT):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.max_retries = max_retries
+        self.enqueue_timeout = enqueue_timeout
+        self.cond = threading.Condition()
+        self.pending = {}           # 채널 ID -> 발송 대기 메시지 deque
+        self.ready = deque()        # 발송 가능한 채널 ID (처리 중이 아닌 채널만)
+        self.delayed = []           # (발송 가능 시각, 순번, 채널 ID) 힙: 속도 제한/재시도 대기 중인 채널
+        self.sequence = itertools.count()
+        self.in_flight = set()
+        self.channel_buckets = {}
+        self.channel_blocked_until = {}
+        self.method_buckets = {}        # 메서드 -> 워크스페이스 전체 버킷
+        self.method_blocked_until = {}  # 메서드 -> 429 Retry-After가 끝나는 시각
+        self.swept_at = time.monotonic()
+        self.depth = 0
+        self.stats_data = {
+            "enqueued": 0,
+            "sent": 0,
+            "retried": 0,
+            "rate_limited": 0,
+            "delayed": 0,
+            "dropped_queue_full": 0,
+            "dropped_failed": 0,
+            "dropped_permanent": 0,
+            "max_depth": 0,
+            "total_wait_seconds": 0.0,
+            "max_wait_seconds": 0.0,
+        }
+        self._pid = None
+
+    def _ensure_started(self):
+        # fork 이후에는 스레드가 복제되지 않으므로 프로세스별로 워커를 띄움
+        if self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+        for i in range(self.workers):
+            threading.Thread(target=self._worker, name=f"slack-outbound-{i}", daemon=True).start()
+
+    def start(self):
+        """발송 워커를 미리 시작 (첫 메시지가 워커 생성을 기다리지 않도록)"""
+        self._ensure_started()
+
+    def enqueue(self, channel: str, send: Callable, method: str = DEFAULT_METHOD, **kwargs) -> bool:
+        """메시지를 발송 큐에 추가합니다. 큐가 가득 차서 버려지면 False"""
+        with self.cond:
+            self._ensure_started()
+            deadline = time.monotonic() + self.enqueue_timeout
+            while self.depth >= self.max_queue:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.stats_data["dropped_queue_full"] += 1
+                    log_error(f"발송 큐가 가득 차 메시지를 버립니다: 채널 {channel}")
+                    return False
+                self.cond.wait(remaining)
+
+            queue = self.pending.setdefault(channel, deque())
+            queue.append(OutboundMessage(channel, send, method, kwargs))
+            # 채널에 먼저 들어온 메시지가 있으면 이미 발송 대기/처리/지연 중 하나에 들어 있음
+            if len(queue) == 1 and channel not in self.in_flight:
+                self.ready.append(channel)
+            self.depth += 1
+            self.stats_data["enqueued"] += 1
+            self.stats_data["max_depth"] = max(self.stats_data["max_depth"], self.depth)
+            self.cond.notify_all()
+        return True
+
+    def _worker(self):
+        while True:
+            channel, message = self._next_message()
+
+            done = self._deliver(message)
+
+            with self.cond:
+                queue = self.pending[channel]
+                if done:
+                    queue.popleft()
+                    self.depth -= 1
+                self.in_flight.discard(channel)
+                if not queue:
+                    del self.pending[channel]
+                elif done:
+                    self.ready.append(channel)
+                else:
+                    self._schedule(channel, self.channel_blocked_until[channel])
+                self._sweep_idle()
+                self.cond.notify_all()
+
+    def _next_message(self):
+        """발송할 (채널, 메시지): 속도 제한에 걸린 채널은 발송 가능 시각에 다시 꺼내도록 미뤄 둠"""
+        with self.cond:
+            while True:
+                now = time.monotonic()
+                while self.delayed and self.delayed[0][0] <= now:
+                    self.ready.append(heapq.heappop(self.delayed)[2])
+                if self.ready:
+                    channel = self.ready.popleft()
+                    message = self.pending[channel][0]
+                    delay = self._slot_delay(message, now)
+                    if delay > 0:
+                        self.stats_data["delayed"] += 1
+                        self._schedule(channel, now + delay)
+                        continue
+                    self.in_flight.add(channel)
+                    return channel, message
+                self.cond.wait(self.delayed[0][0] - now if self.delayed else None)
+
+    def _schedule(self, channel: str, due: float):
+        heapq.heappush(self.delayed, (due, next(self.sequence), channel))
+        # 다른 워커가 더 이른 발송 시각에 깨어나도록 대기 시간을 다시 계산하게 함
+        self.cond.notify_all()
+
+    def _bucket(self, buckets: Dict[str, TokenBucket], key: str, rate: float, capacity: int) -> TokenBucket:
+        bucket = buckets.get(key)
+        if bucket is None:
+            bucket = buckets[key] = TokenBucket(rate, capacity)
+        return bucket
+
+    def _slot_delay(self, message: OutboundMessage, now: float) -> float:
+        """지금 보낼 수 있으면 토큰을 소비하고 0, 아니면 기다릴 시간(초)"""
+        blocked = max(self.method_blocked_until.get(message.method, 0.0),
+                      self.channel_blocked_until.get(message.channel, 0.0))
+        if blocked > now:
+            return blocked - now
+        # 채널 버킷은 한 번에 한 워커만 쓰므로 확인 후 소비해도 됨 (워크스페이스 토큰을 헛되이 쓰지 않도록 먼저 확인)
+        channel_bucket = None
+        if SLACK_METHOD_TIERS.get(message.method) == "special":
+            channel_bucket = self._bucket(self.channel_buckets, message.channel, CHANNEL_RATE_PER_SECOND, CHANNEL_BURST)
+            delay = channel_bucket.wait_time()
+            if delay > 0:
+                return delay
+        delay = self._bucket(self.method_buckets, message.method, *method_limit(message.method)).try_acquire()
+        if delay > 0:
+            return delay
+        if channel_bucket is not None:
+            channel_bucket.try_acquire()
+        return 0.0
+
+    def _sweep_idle(self):
+        """발송이 끝나고 버킷이 다시 가득 찬 채널의 상태 정리 (채널 수만큼 계속 늘어나지 않도록)"""
+        now = time.monotonic()
+        if now - self.swept_at < OUTBOUND_IDLE_SWEEP_SECONDS:
+            return
+        self.swept_at = now
+        for channel in [channel for channel in self.channel_blocked_until
+                        if channel not in self.pending and self.channel_blocked_until[channel] <= now]:
+            del self.channel_blocked_until[channel]
+        for channel in [channel for channel, bucket in self.channel_buckets.items()
+                        if channel not in self.pending and bucket.idle_for(now)]:
+            del self.channel_buckets[channel]
+
+    def _deliver(self, message: OutboundMessage) -> bool:
+        """메시지 1건 발송을 시도합니다. 성공 또는 포기 시 True, 재시도가 필요하면 False"""
+        message.attempts += 1
+        try:
+            message.send(**message.kwargs)
+        except Exception as e:
+            status = getattr(getattr(e, "response", None), "status_code", None)
+            if isinstance(e, SlackApiError) and status == 429:
+                retry_after = float(e.response.headers.get("Retry-After", 1))
+                # 429는 앱/워크스페이스/메서드 단위로 적용되므로 같은 메서드 발송을 모두 멈춤
+                with self.cond:
+                    self.method_blocked_until[message.method] = time.monotonic() + retry_after + random.uniform(0, 0.5)
+                    self.stats_data["rate_limited"] += 1
+            return self._retry_or_drop(message, e)
+
+        waited = time.monotonic() - message.enqueued_at
+        with self.cond:
+            self.stats_data["sent"] += 1
+            self.stats_data["total_wait_seconds"] += waited
+            self.stats_data["max_wait_seconds"] = max(self.stats_data["max_wait_seconds"], waited)
+        return True
+
+    def _retry_or_drop(self, message: OutboundMessage, error: Exception) -> bool:
+        if not is_retryable(error):
+            with self.cond:
+                self.stats_data["dropped_permanent"] += 1
+            log_error(f"메시지 발송 실패 (재시도하지 않는 오류): 채널 {message.channel}", error)
+            return True
+        if message.attempts > self.max_retries:
+            with self.cond:
+                self.stats_data["dropped_failed"] += 1
+            log_error(f"메시지 발송 실패로 버립니다: 채널 {message.channel}, 시도 {message.attempts}회", error)
+            return True
+
+        # 지수 백오프 + 지터 (429는 Retry-After가 끝난 뒤부터)
+        backoff = min(30.0, 0.5 * (2 ** (message.attempts - 1))) * random.uniform(0.5, 1.5)
+        with self.cond:
+            self.channel_blocked_until[message.channel] = max(
+                self.channel_blocked_until.get(message.channel, 0.0),
+                self.method_blocked_until.get(message.method, 0.0),
+                time.monotonic() + backoff,
+            )
+            self.stats_data["retried"] += 1
+        return False
+
+    def stats(self) -> Dict[str, Any]:
+        """큐 깊이, 대기 시간, 버린 메시지 수 등 발송 통계"""
+        with self.cond:
+            result = dict(self.stats_data)
+            result["depth"] = self.depth
+            result["channels_pending"] = len(self.pending)
+            result["channels_delayed"] = len(self.delayed)
+            result["channels_tracked"] = len(self.channel_buckets)
+        result["avg_wait_seconds"] = result["total_wait_seconds"] / result["sent"] if result["sent"] else 0.0
+        return result
+
+
+# 전역 발송 큐 인스턴스
+outbound_queue = OutboundQueue()
+
+def queued_say(say: Callable, channel: str) -> Callable:
+    """say()와 같은 방식으로 호출하면 발송 큐를 거쳐 메시지를 보내는 함수를 반환"""
+    def send(text: str = "", blocks=None, **kwargs):
+        if blocks is not None:
+            kwargs["blocks"] = blocks
+        return outbound_queue.enqueue(channel, say, "chat.postMessage", text=text, **kwargs)
+    return send
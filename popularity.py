@@ -0,0 +1,170 @@
+import os
+import json
+import math
+import time
+import atexit
+import threading
+from typing import Dict, Any, List, Tuple
+from config import env_str, env_float
+from state import state_backend
+
+# 질문 정렬 방식: file (JSON 파일 순서) 또는 popular (최근 클릭이 많은 순)
+FAQ_ORDER = env_str("FAQ_ORDER", "file")
+# 클릭 수가 절반으로 줄어드는 시간(시간 단위) - 오래된 클릭일수록 영향이 작아짐
+POPULARITY_HALF_LIFE_HOURS = env_float("POPULARITY_HALF_LIFE_HOURS", 168)
+POPULARITY_SNAPSHOT_PATH = env_str("POPULARITY_SNAPSHOT_PATH", "logs/popularity.json")
+# 카운터를 파일에 저장하는 주기(초)와 질문 순서를 다시 계산하는 주기(초)
+POPULARITY_SNAPSHOT_SECONDS = env_float("POPULARITY_SNAPSHOT_SECONDS", 60)
+POPULARITY_RESORT_SECONDS = env_float("POPULARITY_RESORT_SECONDS", 30)
+
+
+def question_key(faq: Dict[str, Any]) -> str:
+    """FAQ 파일이 다시 로드되어도 유지되는 질문 키 (과정 + 질문)"""
+    return f"{faq['course']}|{faq['question']}"
+
+
+class PopularityCounter:
+    """질문별 클릭 수를 시간에 따라 감쇠시키며 세는 카운터 (공유 상태 저장소에 저장)
+
+    클릭마다 기간 시작 시각(landmark) 대비 가중치 2^((t - landmark) / 반감기)를 더하므로,
+    저장된 값끼리의 크기 비교가 곧 감쇠된 클릭 수 비교가 됩니다. (클릭마다 전체를 감쇠시킬 필요 없음)
+    기간은 반감기 32배 단위로 고정되어 있어 여러 프로세스가 같은 기준으로 카운터를 더합니다.
+    """
+
+    # 한 기간의 길이 (반감기 배수): 가중치가 2^32를 넘지 않음
+    PERIOD_HALF_LIVES = 32
+
+    def __init__(self, half_life_hours: float = POPULARITY_HALF_LIFE_HOURS,
+                 snapshot_path: str = POPULARITY_SNAPSHOT_PATH,
+                 snapshot_seconds: float = POPULARITY_SNAPSHOT_SECONDS,
+                 resort_seconds: float = POPULARITY_RESORT_SECONDS,
+                 backend=state_backend):
+        self.half_life = half_life_hours * 3600
+        self.period = self.half_life * self.PERIOD_HALF_LIVES
+        self.snapshot_path = snapshot_path
+        self.snapshot_seconds = snapshot_seconds
+        self.resort_seconds = resort_seconds
+        self.backend = backend
+        self.lock = threading.Lock()
+        self.store = None
+        self.counts = {"clicks": 0, "resorts": 0, "reorders": 0, "snapshots": 0}
+        self._pid = None
+        # 공유 저장소(sqlite)는 카운터가 DB에 남으므로 파일은 메모리 저장소에서만 불러오고 종료 시 저장
+        if not backend.shared:
+            self.load()
+            atexit.register(self.save)
+
+    def _period(self, now: float) -> int:
+        return int(now // self.period)
+
+    def _namespace(self, period: int) -> str:
+        return f"popularity:{period}"
+
+    def record(self, faq: Dict[str, Any]):
+        """질문 클릭 1회 기록"""
+        now = time.time()
+        period = self._period(now)
+        self.backend.incr(self._namespace(period), question_key(faq), 2 ** ((now - period * self.period) / self.half_life))
+        with self.lock:
+            self.counts["clicks"] += 1
+
+    def scores(self) -> Dict[str, float]:
+        """현재 시각 기준으로 감쇠된 클릭 수 (모든 프로세스의 클릭 합)"""
+        now = time.time()
+        period = self._period(now)
+        result = {}
+        # 직전 기간의 클릭도 감쇠해서 더함 (그 이전 기간은 2^-32 이하라 무시)
+        for landmark_period in (period - 1, period):
+            factor = 2 ** (-(now - landmark_period * self.period) / self.half_life)
+            for key, weight in self.backend.counters(self._namespace(landmark_period)).items():
+                result[key] = result.get(key, 0.0) + weight * factor
+        return result
+
+    def top(self, n: int = 10) -> List[Tuple[str, float]]:
+        return sorted(self.scores().items(), key=lambda item: item[1], reverse=True)[:n]
+
+    def ranker(self):
+        """현재 카운터로 정렬 점수 함수 생성 (복사본을 쓰므로 이후 클릭의 영향을 받지 않음)"""
+        scores = self.scores()
+        return lambda faq: scores.get(question_key(faq), 0.0)
+
+    def attach(self, store):
+        """FAQ 저장소를 인기순으로 정렬 (이후 갱신은 start()로 시작하는 백그라운드 스레드에서)"""
+        self.store = store
+        store.reorder(self.ranker())
+
+    def start(self):
+        """질문 순서 갱신 스레드 시작 (attach한 경우만, pre-fork 서버에서는 fork 이후 워커마다 호출)"""
+        if self.store is None or self._pid == os.getpid():
+            return
+        with self.lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+        threading.Thread(target=self._loop, name="popularity", daemon=True).start()
+
+    def resort(self) -> bool:
+        """공유 카운터로 질문 순서를 다시 계산 (순서가 바뀌었으면 True)
+
+        다른 프로세스의 클릭도 반영해야 하므로 매번 계산하고, 순서가 그대로면 스냅샷은 바뀌지 않습니다.
+        """
+        if self.store is None:
+            return False
+        self.counts["resorts"] += 1
+        changed = self.store.reorder(self.ranker())
+        if changed:
+            self.counts["reorders"] += 1
+        return changed
+
+    def _loop(self):
+        pid = os.getpid()
+        while pid == os.getpid():
+            time.sleep(self.resort_seconds)
+            try:
+                self.resort()
+                # 파일 저장은 저장 주기마다 한 프로세스만 (공유 저장소의 키로 담당 프로세스 결정)
+                if self.backend.add_if_absent("popularity", "snapshot", self.snapshot_seconds):
+                    self.save()
+            except Exception as e:
+                print(f"인기순 정렬 갱신 오류: {e}")
+
+    def save(self):
+        """감쇠된 클릭 수를 파일에 저장 (임시 파일에 쓴 뒤 교체)"""
+        scores = self.scores()
+        if not scores:
+            return
+        snapshot = {"saved_at": time.time(), "half_life_hours": self.half_life / 3600, "scores": scores}
+        directory = os.path.dirname(self.snapshot_path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        tmp_path = f"{self.snapshot_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f, ensure_ascii=False)
+        os.replace(tmp_path, self.snapshot_path)
+        self.counts["snapshots"] += 1
+
+    def load(self):
+        """저장된 클릭 수를 불러와 저장 이후 지난 시간만큼 감쇠해 저장소에 더함"""
+        try:
+            with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            return
+        now = time.time()
+        period = self._period(now)
+        # 현재 기간 시작 시각 기준 가중치로 환산
+        factor = 2 ** (-max(0.0, now - snapshot.get("saved_at", now)) / self.half_life)
+        factor *= 2 ** ((now - period * self.period) / self.half_life)
+        for key, score in snapshot.get("scores", {}).items():
+            if isinstance(score, (int, float)) and math.isfinite(score) and score * factor > 1e-6:
+                self.backend.incr(self._namespace(period), key, score * factor)
+
+    def stats(self) -> Dict[str, Any]:
+        result = dict(self.counts)
+        result["questions"] = len(self.scores())
+        result["top"] = self.top(5)
+        return result
+
+
+# 전역 인기도 카운터 인스턴스
+popularity = PopularityCounter()
@@ -0,0 +1,193 @@
+import os
+import sys
+import time
+import functools
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Any
+from config import env_bool, env_str, env_float, env_int
+
+# 프로파일링 모드 (기본 꺼짐, 켜면 리스너 실행 중 스택을 주기적으로 샘플링)
+PROFILE_ENABLED = env_bool("PROFILE_ENABLED", False)
+# 이 시간(ms)보다 오래 걸린 요청은 개별 프로파일을 파일로 저장
+PROFILE_SLOW_MS = env_float("PROFILE_SLOW_MS", 500)
+PROFILE_INTERVAL_MS = env_float("PROFILE_INTERVAL_MS", 5)
+# 전체 요청을 합친 프로파일을 저장하는 주기(초)
+PROFILE_AGGREGATE_SECONDS = env_float("PROFILE_AGGREGATE_SECONDS", 300)
+PROFILE_DIR = env_str("PROFILE_DIR", "logs/profiles")
+# 프로파일 폴더 최대 용량 (넘으면 오래된 파일부터 삭제)
+PROFILE_MAX_BYTES = env_int("PROFILE_MAX_BYTES", 50 * 1024 * 1024)
+PROFILE_MAX_DEPTH = 64
+
+
+class ActiveRequest:
+    __slots__ = ("name", "started", "stacks")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started = time.perf_counter()
+        self.stacks = Counter()  # 접힌 스택("a;b;c") -> 샘플 수
+
+
+class SamplingProfiler:
+    """리스너 실행 중인 스레드의 스택을 일정 간격으로 샘플링하는 프로파일러
+
+    sys._current_frames()로 스택만 읽으므로 리스너 코드에는 추적 훅이 걸리지 않습니다.
+    결과는 flamegraph.pl, speedscope 등에서 바로 쓸 수 있는 접힌 스택(collapsed stack) 형식입니다.
+    """
+
+    def __init__(self, enabled: bool = PROFILE_ENABLED, slow_ms: float = PROFILE_SLOW_MS,
+                 interval_ms: float = PROFILE_INTERVAL_MS, aggregate_seconds: float = PROFILE_AGGREGATE_SECONDS,
+                 directory: str = PROFILE_DIR, max_bytes: int = PROFILE_MAX_BYTES):
+        self.enabled = enabled
+        self.slow_ms = slow_ms
+        self.interval = interval_ms / 1000
+        self.aggregate_seconds = aggregate_seconds
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.active = {}            # 스레드 ID -> ActiveRequest
+        self.aggregate = Counter()  # 주기 동안 전체 요청의 접힌 스택 -> 샘플 수
+        self.lock = threading.Lock()
+        self.write_lock = threading.Lock()
+        self.counts = {"requests": 0, "samples": 0, "slow_dumps": 0, "aggregate_dumps": 0, "deleted_files": 0}
+        self._pid = None
+
+    def _ensure_started(self):
+        # fork 이후에는 프로세스별로 샘플링 스레드를 띄움
+        if self._pid == os.getpid():
+            return
+        with self.lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self.active = {}
+            self.aggregate = Counter()
+            threading.Thread(target=self._loop, name="profiler", daemon=True).start()
+
+    @staticmethod
+    def _collapse(frame) -> str:
+        names = []
+        while frame is not None and len(names) < PROFILE_MAX_DEPTH:
+            code = frame.f_code
+            names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+            frame = frame.f_back
+        return ";".join(reversed(names))
+
+    def sample(self):
+        """실행 중인 리스너 스레드의 스택을 1회 수집"""
+        with self.lock:
+            if not self.active:
+                return
+            active = dict(self.active)
+        frames = sys._current_frames()
+        for thread_id, request in active.items():
+            frame = frames.get(thread_id)
+            if frame is None:
+                continue
+            stack = self._collapse(frame)
+            with self.lock:
+                request.stacks[stack] += 1
+                self.aggregate[stack] += 1
+                self.counts["samples"] += 1
+
+    def _loop(self):
+        pid = os.getpid()
+        next_aggregate = time.monotonic() + self.aggregate_seconds
+        while pid == os.getpid():
+            time.sleep(self.interval)
+            try:
+                self.sample()
+                if time.monotonic() >= next_aggregate:
+                    next_aggregate = time.monotonic() + self.aggregate_seconds
+                    self.dump_aggregate()
+            except Exception as e:
+                print(f"프로파일러 오류: {e}")
+
+    def begin(self, name: str):
+        self._ensure_started()
+        with self.lock:
+            self.active[threading.get_ident()] = ActiveRequest(name)
+
+    def end(self):
+        """리스너 종료: 느린 요청이면 해당 요청의 프로파일 저장"""
+        with self.lock:
+            request = self.active.pop(threading.get_ident(), None)
+            self.counts["requests"] += 1
+        if request is None:
+            return
+        elapsed_ms = (time.perf_counter() - request.started) * 1000
+        if elapsed_ms >= self.slow_ms and request.stacks:
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+            if self._write(f"slow_{timestamp}_{os.getpid()}_{request.name}_{int(elapsed_ms)}ms.folded", request.stacks):
+                self.counts["slow_dumps"] += 1
+
+    def dump_aggregate(self):
+        """주기 동안 모인 전체 프로파일을 저장하고 초기화"""
+        with self.lock:
+            stacks, self.aggregate = self.aggregate, Counter()
+        if stacks:
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            if self._write(f"aggregate_{timestamp}_{os.getpid()}.folded", stacks):
+                self.counts["aggregate_dumps"] += 1
+
+    def _write(self, filename: str, stacks: Counter) -> bool:
+        content = "".join(f"{stack} {count}\n" for stack, count in stacks.most_common()).encode('utf-8')
+        if len(content) > self.max_bytes:
+            return False
+        with self.write_lock:
+            if not os.path.exists(self.directory):
+                os.makedirs(self.directory)
+            self._make_room(len(content))
+            with open(os.path.join(self.directory, filename), 'wb') as f:
+                f.write(content)
+        return True
+
+    def _make_room(self, size: int):
+        # 폴더 용량이 최대치를 넘지 않도록 오래된 파일부터 삭제
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file():
+                stat = entry.stat()
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(file_size for _, file_size, _ in files)
+        for _, file_size, path in sorted(files):
+            if total + size <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                self.counts["deleted_files"] += 1
+            except OSError:
+                pass
+            total -= file_size
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            result = dict(self.counts)
+            result["active"] = len(self.active)
+        result["enabled"] = self.enabled
+        return result
+
+
+# 전역 프로파일러 인스턴스
+profiler = SamplingProfiler()
+
+
+def profiled(func):
+    """리스너 실행 구간을 프로파일링하는 데코레이터
+
+    PROFILE_ENABLED가 꺼져 있으면 원래 함수를 그대로 반환하므로 부하가 없습니다.
+    Bolt는 함수 인자 이름으로 ack, body 등을 넘겨주므로 functools.wraps로 시그니처를 유지합니다.
+    """
+    if not profiler.enabled:
+        return func
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        profiler.begin(func.__name__)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profiler.end()
+
+    return wrapper
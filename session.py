@@ -0,0 +1,160 @@
+import sys
+import time
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List
+from config import env_int, env_float
+from state import state_backend
+
+SESSION_TTL_SECONDS = env_float("SESSION_TTL_SECONDS", 1800)
+SESSION_MAX_ENTRIES = env_int("SESSION_MAX_ENTRIES", 5000)
+# 최근 본 질문 보관 개수
+SESSION_RECENT_SIZE = env_int("SESSION_RECENT_SIZE", 5)
+
+
+class NavSession:
+    """사용자 1명의 탐색 상태 (현재 과정/카테고리/화면, 최근 본 질문)
+
+    질문 ID는 FAQ 데이터를 다시 로드하면 다른 질문을 가리킬 수 있으므로 ID를 기록한 데이터 버전을 함께 보관합니다.
+    """
+    __slots__ = ("course", "category", "page", "data_version", "recent", "expires_at")
+
+    def __init__(self):
+        self.course = None
+        self.category = None
+        self.page = None
+        self.data_version = 0
+        self.recent = array("I")
+        self.expires_at = 0.0
+
+    def pack(self) -> str:
+        """공유 상태 저장소에 저장할 문자열로 변환"""
+        return "\x1f".join([
+            self.course or "", self.category or "", self.page or "",
+            str(self.data_version), ",".join(map(str, self.recent)),
+        ])
+
+    @classmethod
+    def unpack(cls, packed: str) -> "NavSession":
+        course, category, page, data_version, recent = packed.split("\x1f")
+        session = cls()
+        session.course = course or None
+        session.category = category or None
+        session.page = page or None
+        # 이전 형식(화면의 질문 ID 목록)으로 저장된 세션은 최근 본 질문을 버림
+        if data_version.isdigit():
+            session.data_version = int(data_version)
+            session.recent = array("I", [int(qid) for qid in recent.split(",") if qid])
+        return session
+
+    def size_bytes(self) -> int:
+        """세션 1건이 차지하는 대략적인 메모리 (문자열은 FAQ 데이터와 공유되므로 제외)"""
+        return sys.getsizeof(self) + sys.getsizeof(self.recent)
+
+
+class SessionStore:
+    """사용자별 탐색 세션 저장소 (최대 크기가 있는 LRU + 만료 시간)"""
+
+    def __init__(self, max_entries: int = SESSION_MAX_ENTRIES, ttl: float = SESSION_TTL_SECONDS,
+                 backend=state_backend):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # 공유 상태 저장소(sqlite)를 쓰면 다른 프로세스에서 만든 세션도 이어서 사용
+        self.shared = backend if backend.shared else None
+        self.sessions = OrderedDict()  # 사용자 ID -> NavSession
+        self.lock = threading.Lock()
+        self.counts = {"evicted": 0}
+
+    def _get_locked(self, user_id: str) -> Optional[NavSession]:
+        session = self.sessions.get(user_id)
+        if session is None:
+            return self._load_shared(user_id)
+        if session.expires_at <= time.monotonic():
+            del self.sessions[user_id]
+            return self._load_shared(user_id)
+        return session
+
+    def _load_shared(self, user_id: str) -> Optional[NavSession]:
+        if self.shared is None:
+            return None
+        packed = self.shared.get_value("session", user_id)
+        if packed is None:
+            return None
+        session = NavSession.unpack(packed)
+        session.expires_at = time.monotonic() + self.ttl
+        self.sessions[user_id] = session
+        self._evict_locked()
+        return session
+
+    def _save_shared(self, user_id: str, session: NavSession):
+        if self.shared is not None:
+            self.shared.set_value("session", user_id, session.pack(), ttl=self.ttl)
+
+    def _evict_locked(self):
+        while len(self.sessions) > self.max_entries:
+            self.sessions.popitem(last=False)
+            self.counts["evicted"] += 1
+
+    def get(self, user_id: str) -> Optional[NavSession]:
+        """만료되지 않은 세션 반환 (없으면 None)"""
+        with self.lock:
+            return self._get_locked(user_id)
+
+    def update(self, user_id: str, course: str, category: Optional[str] = None, page: Optional[str] = None):
+        """사용자의 현재 화면 상태 저장"""
+        with self.lock:
+            session = self._get_locked(user_id)
+            if session is None:
+                session = NavSession()
+                self.sessions[user_id] = session
+            session.course = course
+            session.category = category
+            session.page = page
+            session.expires_at = time.monotonic() + self.ttl
+            self.sessions.move_to_end(user_id)
+            self._evict_locked()
+            self._save_shared(user_id, session)
+
+    def add_recent(self, user_id: str, question_id: int, data_version: int):
+        """최근 본 질문 기록 (중복 제거, 최신순, 데이터 버전이 바뀌었으면 이전 기록은 버림)"""
+        with self.lock:
+            session = self._get_locked(user_id)
+            if session is None:
+                # 메뉴를 거치지 않고 바로 답변을 본 경우(/faq, 멘션 키워드)에도 기록
+                session = self.sessions[user_id] = NavSession()
+                self._evict_locked()
+            session.expires_at = time.monotonic() + self.ttl
+            self.sessions.move_to_end(user_id)
+            recent = [qid for qid in session.recent if qid != question_id] if session.data_version == data_version else []
+            recent.insert(0, question_id)
+            session.data_version = data_version
+            session.recent = array("I", recent[:SESSION_RECENT_SIZE])
+            self._save_shared(user_id, session)
+
+    def recent(self, user_id: str, data_version: int) -> List[int]:
+        """최근 본 질문 ID 목록 (최신순, 다른 데이터 버전에서 기록한 ID는 제외)"""
+        with self.lock:
+            session = self._get_locked(user_id)
+            if session is None or session.data_version != data_version:
+                return []
+            return list(session.recent)
+
+    def memory_usage(self) -> int:
+        """저장소 전체의 대략적인 메모리 사용량 (바이트)"""
+        with self.lock:
+            total = sys.getsizeof(self.sessions)
+            for user_id, session in self.sessions.items():
+                total += sys.getsizeof(user_id) + session.size_bytes()
+            return total
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            result = dict(self.counts)
+            result["sessions"] = len(self.sessions)
+        result["memory_bytes"] = self.memory_usage()
+        return result
+
+
+# 전역 세션 저장소 인스턴스
+session_store = SessionStore()
@@ -0,0 +1,263 @@
+import io
+import ssl
+import time
+import threading
+import http.client
+from collections import deque
+from urllib.error import HTTPError
+from urllib.parse import urlsplit
+from urllib.request import Request
+from typing import Dict, Any
+from slack_sdk import WebClient
+from slack_sdk.errors import SlackRequestError
+from config import env_int, env_float
+from listener_pool import LISTENER_WORKERS
+from outbound import OUTBOUND_WORKERS
+
+# 유지할 연결 수 (기본: 동시에 Slack API를 호출할 수 있는 리스너 + 발송 워커 스레드 수)
+SLACK_HTTP_POOL_SIZE = env_int("SLACK_HTTP_POOL_SIZE", LISTENER_WORKERS + OUTBOUND_WORKERS)
+# 연결 타임아웃 / 응답 읽기 타임아웃(초)
+SLACK_HTTP_CONNECT_TIMEOUT = env_float("SLACK_HTTP_CONNECT_TIMEOUT", 3)
+SLACK_HTTP_READ_TIMEOUT = env_float("SLACK_HTTP_READ_TIMEOUT", 10)
+# 이 시간(초)보다 오래 쉰 연결은 서버가 닫았을 수 있으므로 버리고 새로 연결
+SLACK_HTTP_IDLE_SECONDS = env_float("SLACK_HTTP_IDLE_SECONDS", 50)
+# 최근 호출 지연 시간 표본 수 (p50/p95 계산용)
+SLACK_HTTP_LATENCY_SAMPLES = 1000
+
+# 재사용한 연결이 이미 닫혀 있을 때 나는 오류
+STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+# 요청을 보낸 뒤에도 다시 보내도 되는 메서드 (서버가 이미 처리했어도 결과가 같음)
+IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class ResponseLostError(http.client.HTTPException):
+    """요청을 보낸 뒤 응답을 받기 전에 연결이 끊김
+
+    서버가 이미 처리했을 수 있으므로(chat.postMessage 중복 게시) 연결 풀과 WebClient의 연결 오류 재시도가
+    다시 보내지 않도록 별도 예외로 알립니다. 발송 큐(outbound)는 HTTPException을 일시적 오류로 보고
+    백오프 후 재시도합니다.
+    """
+
+
+class ConnectionPool:
+    """호스트별 keep-alive HTTP 연결 풀
+
+    최근에 쓴 연결부터 재사용하므로 TLS 핸드셰이크는 연결을 처음 만들 때만 일어납니다.
+    풀이 가득 찬 상태에서 동시 호출이 더 많으면 기다리지 않고 임시 연결을 만들었다가 닫습니다.
+    """
+
+    def __init__(self, size: int = SLACK_HTTP_POOL_SIZE, connect_timeout: float = SLACK_HTTP_CONNECT_TIMEOUT,
+                 read_timeout: float = SLACK_HTTP_READ_TIMEOUT, idle_seconds: float = SLACK_HTTP_IDLE_SECONDS):
+        self.size = size
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.idle_seconds = idle_seconds
+        self.idle = {}  # (scheme, host, port) -> [(연결, 마지막 사용 시각), ...]
+        self.default_ssl_context = None
+        self.lock = threading.Lock()
+        self.counts = {"connections_created": 0, "connections_reused": 0, "connections_discarded": 0,
+                       "stale_retries": 0, "responses_lost": 0}
+
+    def acquire(self, scheme: str, host: str, port: int, ssl_context=None):
+        """(연결, 재사용 여부)"""
+        key = (scheme, host, port)
+        now = time.monotonic()
+        with self.lock:
+            idle = self.idle.get(key)
+            while idle:
+                conn, last_used = idle.pop()
+                if now - last_used < self.idle_seconds:
+                    self.counts["connections_reused"] += 1
+                    return conn, True
+                conn.close()
+                self.counts["connections_discarded"] += 1
+            self.counts["connections_created"] += 1
+        if scheme == "https":
+            if ssl_context is None:
+                # 인증서 목록 로드 비용이 있으므로 기본 SSL 설정은 한 번만 생성
+                if self.default_ssl_context is None:
+                    self.default_ssl_context = ssl.create_default_context()
+                ssl_context = self.default_ssl_context
+            conn = http.client.HTTPSConnection(host, port, timeout=self.connect_timeout, context=ssl_context)
+        else:
+            conn = http.client.HTTPConnection(host, port, timeout=self.connect_timeout)
+        return conn, False
+
+    def release(self, scheme: str, host: str, port: int, conn):
+        key = (scheme, host, port)
+        with self.lock:
+            idle = self.idle.setdefault(key, [])
+            if len(idle) < self.size:
+                idle.append((conn, time.monotonic()))
+                return
+            self.counts["connections_discarded"] += 1
+        conn.close()
+
+    def request(self, url: str, req: Request, ssl_context=None):
+        """요청을 보내고 (상태 코드, 사유, 헤더, 본문 bytes) 반환"""
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        port = parts.port or (443 if scheme == "https" else 80)
+        path = parts.path + (f"?{parts.query}" if parts.query else "")
+        headers = dict(req.header_items())
+        method = req.get_method()
+        while True:
+            conn, reused = self.acquire(scheme, parts.hostname, port, ssl_context)
+            # 1. 요청 보내기: 재사용한 연결이 닫혀 있었으면 서버에 닿지 않았으므로 새 연결로 다시 보냄
+            try:
+                if conn.sock is None:
+                    conn.connect()
+                    # 연결이 끝나면 읽기 타임아웃으로 교체
+                    conn.sock.settimeout(self.read_timeout)
+                conn.request(method, path, body=req.data, headers=headers)
+            except STALE_CONNECTION_ERRORS:
+                conn.close()
+                if not reused:
+                    raise
+                with self.lock:
+                    self.counts["stale_retries"] += 1
+                continue
+            except BaseException:
+                conn.close()
+                raise
+            # 2. 응답 받기: 요청은 이미 나갔으므로 멱등 메서드만 다시 보내고, 나머지는 호출한 쪽에 알림
+            try:
+                resp = conn.getresponse()
+                body = resp.read()
+            except STALE_CONNECTION_ERRORS as e:
+                conn.close()
+                if reused and method in IDEMPOTENT_METHODS:
+                    with self.lock:
+                        self.counts["stale_retries"] += 1
+                    continue
+                with self.lock:
+                    self.counts["responses_lost"] += 1
+                raise ResponseLostError(f"{method} {parts.path}: 요청을 보낸 뒤 연결이 끊겼습니다 ({e!r})") from e
+            except BaseException:
+                conn.close()
+                raise
+            if resp.will_close:
+                conn.close()
+            else:
+                self.release(scheme, parts.hostname, port, conn)
+            return resp.status, resp.reason, resp.msg, body
+
+    def close(self):
+        with self.lock:
+            idle, self.idle = self.idle, {}
+        for connections in idle.values():
+            for conn, _ in connections:
+                conn.close()
+
+
+class HttpMetrics:
+    """Slack API 메서드별 호출 수, 오류 수, 지연 시간"""
+
+    def __init__(self, samples: int = SLACK_HTTP_LATENCY_SAMPLES):
+        self.lock = threading.Lock()
+        self.methods = {}  # API 메서드 -> {"calls", "errors", "total_ms", "max_ms"}
+        self.recent = deque(maxlen=samples)
+
+    def record(self, method: str, elapsed_ms: float, error: bool):
+        with self.lock:
+            stats = self.methods.get(method)
+            if stats is None:
+                stats = self.methods[method] = {"calls": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0}
+            stats["calls"] += 1
+            stats["errors"] += int(error)
+            stats["total_ms"] += elapsed_ms
+            stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+            self.recent.append(elapsed_ms)
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            methods = {name: dict(stats) for name, stats in self.methods.items()}
+            recent = sorted(self.recent)
+        for stats in methods.values():
+            stats["avg_ms"] = round(stats["total_ms"] / stats["calls"], 2)
+            stats["total_ms"] = round(stats["total_ms"], 1)
+            stats["max_ms"] = round(stats["max_ms"], 2)
+        result = {"methods": methods}
+        if recent:
+            result["p50_ms"] = round(recent[len(recent) // 2], 2)
+            result["p95_ms"] = round(recent[min(len(recent) - 1, int(len(recent) * 0.95))], 2)
+        return result
+
+
+# 전역 연결 풀 / 호출 지표 인스턴스 (모든 PooledWebClient가 공유)
+connection_pool = ConnectionPool()
+http_metrics = HttpMetrics()
+
+
+class PooledWebClient(WebClient):
+    """연결 풀(keep-alive)과 연결/읽기 타임아웃을 적용한 WebClient
+
+    재시도(Retry-After, 연결 오류)와 응답 처리는 WebClient 그대로이고, 실제 HTTP 요청만
+    urlopen 대신 공유 연결 풀로 보냅니다. 프록시를 설정한 경우에는 기본 방식으로 보냅니다.
+    """
+
+    def __init__(self, *args, pool: ConnectionPool = None, metrics: HttpMetrics = None, **kwargs):
+        self.pool = pool or connection_pool
+        self.metrics = metrics or http_metrics
+        kwargs.setdefault("timeout", int(self.pool.connect_timeout + self.pool.read_timeout))
+        super().__init__(*args, **kwargs)
+
+    def _perform_urllib_http_request_internal(self, url: str, req: Request) -> Dict[str, Any]:
+        if self.proxy is not None:
+            return super()._perform_urllib_http_request_internal(url, req)
+        if not url.lower().startswith("http"):
+            raise SlackRequestError(f"Invalid URL detected: {url}")
+        method = urlsplit(url).path.rsplit("/", 1)[-1]
+        started = time.perf_counter()
+        error = True
+        try:
+            status, reason, headers, body = self.pool.request(url, req, self.ssl)
+            error = not 200 <= status < 300
+        finally:
+            self.metrics.record(method, (time.perf_counter() - started) * 1000, error)
+        if error:
+            # urlopen과 같이 HTTPError로 알려야 WebClient가 429 Retry-After 등을 처리함
+            raise HTTPError(url, status, reason, headers, io.BytesIO(body))
+        if headers.get_content_type() == "application/gzip":
+            return {"status": status, "headers": headers, "body": body}
+        charset = headers.get_content_charset() or "utf-8"
+        return {"status": status, "headers": headers, "body": body.decode(charset)}
+
+
+def pooled_copy(client: WebClient) -> PooledWebClient:
+    """Bolt가 요청마다 만드는 WebClient를 같은 설정의 PooledWebClient로 교체할 때 사용"""
+    return PooledWebClient(
+        token=client.token,
+        base_url=client.base_url,
+        ssl=client.ssl,
+        proxy=client.proxy,
+        headers=client.headers,
+        team_id=client.default_params.get("team_id"),
+        logger=client.logger,
+        retry_handlers=client.retry_handlers.copy() if client.retry_handlers is not None else None,
+    )
+
+
+def attach_pooled_client(context):
+    """미들웨어에서 호출: 요청 context의 WebClient를 연결 풀 클라이언트로 교체
+
+    Bolt는 미들웨어 인자를 만들 때 say 등을 미리 생성하므로, 기존 클라이언트로 만들어진
+    say, set_status 등도 새 클라이언트를 쓰도록 함께 바꿉니다.
+    """
+    original = context.client
+    if original is None or isinstance(original, PooledWebClient):
+        return
+    pooled = pooled_copy(original)
+    context["client"] = pooled
+    for value in list(context.values()):
+        if getattr(value, "client", None) is original:
+            value.client = pooled
+
+
+def http_stats() -> Dict[str, Any]:
+    result = http_metrics.stats()
+    with connection_pool.lock:
+        result.update(connection_pool.counts)
+        result["idle_connections"] = sum(len(idle) for idle in connection_pool.idle.values())
+    result["pool_size"] = connection_pool.size
+    return result
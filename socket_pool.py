@@ -0,0 +1,176 @@
+import time
+import threading
+from typing import Dict, Any, List
+from slack_bolt.adapter.socket_mode import SocketModeHandler
+from config import env_int, env_float
+
+# 동시에 유지할 Socket Mode 연결 수 (Slack은 앱당 최대 10개, 받은 이벤트를 연결들에 나눠 보냄)
+SOCKET_MODE_CONNECTIONS = env_int("SOCKET_MODE_CONNECTIONS", 1)
+# 재연결 사이 최소 간격(초): 여러 연결이 한꺼번에 끊겨도 하나씩 다시 연결해 나머지가 계속 이벤트를 받도록 함
+SOCKET_MODE_RECONNECT_STAGGER_SECONDS = env_float("SOCKET_MODE_RECONNECT_STAGGER_SECONDS", 2)
+# 연결 상태 확인 / 이벤트 수신률 계산 주기(초)
+SOCKET_MODE_CHECK_SECONDS = env_float("SOCKET_MODE_CHECK_SECONDS", 10)
+SOCKET_MODE_MAX_CONNECTIONS = 10
+
+
+class PooledConnection:
+    """연결 하나의 핸들러와 수신/재연결 집계"""
+
+    def __init__(self, name: str, handler: SocketModeHandler):
+        self.name = name
+        self.handler = handler
+        self.started = False  # 첫 연결을 시도했는지 여부
+        self.lock = threading.Lock()
+        self.events = 0
+        self.events_per_minute = 0.0
+        self.rate_checked = (time.monotonic(), 0)  # (시각, 그때까지 받은 이벤트 수)
+        self.disconnected_at = None
+        self.reconnects = 0
+        self.reconnect_ms = []  # 최근 재연결 소요 시간 (끊긴 시점부터 다시 연결될 때까지)
+
+    @property
+    def client(self):
+        return self.handler.client
+
+    def is_connected(self) -> bool:
+        return self.client.is_connected()
+
+    def on_request(self, client, request):
+        with self.lock:
+            self.events += 1
+
+    def on_close(self, code: int, reason: str = None):
+        with self.lock:
+            if self.disconnected_at is None:
+                self.disconnected_at = time.monotonic()
+
+    def update_rate(self):
+        now = time.monotonic()
+        with self.lock:
+            checked_at, checked_events = self.rate_checked
+            if now > checked_at:
+                self.events_per_minute = (self.events - checked_events) * 60 / (now - checked_at)
+            self.rate_checked = (now, self.events)
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            recent = list(self.reconnect_ms)
+            result = {
+                "connected": self.is_connected(),
+                "session_id": self.client.session_id() if hasattr(self.client, "session_id") else None,
+                "events": self.events,
+                "events_per_minute": round(self.events_per_minute, 1),
+                "reconnects": self.reconnects,
+                "disconnected_seconds": round(time.monotonic() - self.disconnected_at, 1)
+                if self.disconnected_at is not None else 0,
+            }
+        if recent:
+            result["last_reconnect_ms"] = recent[-1]
+            result["avg_reconnect_ms"] = round(sum(recent) / len(recent), 1)
+            result["max_reconnect_ms"] = max(recent)
+        return result
+
+
+class SocketModePool:
+    """Socket Mode 연결 여러 개를 유지하는 핸들러 묶음
+
+    Slack은 이벤트를 열린 연결들에 나눠 보내므로 연결 하나가 재연결하는 동안에도 나머지 연결로
+    이벤트를 계속 받습니다. 재연결은 풀 전체에서 한 번에 하나씩, 다른 연결이 살아 있으면
+    SOCKET_MODE_RECONNECT_STAGGER_SECONDS 간격을 두고 진행합니다.
+    """
+
+    def __init__(self, app, app_token: str, size: int = SOCKET_MODE_CONNECTIONS,
+                 stagger_seconds: float = SOCKET_MODE_RECONNECT_STAGGER_SECONDS,
+                 check_seconds: float = SOCKET_MODE_CHECK_SECONDS):
+        self.size = max(1, min(size, SOCKET_MODE_MAX_CONNECTIONS))
+        self.stagger_seconds = stagger_seconds
+        self.check_seconds = check_seconds
+        self.reconnect_lock = threading.Lock()
+        self.last_reconnect = 0.0
+        self.connections: List[PooledConnection] = []
+        for i in range(self.size):
+            connection = PooledConnection(f"socket-{i + 1}", SocketModeHandler(app, app_token))
+            connection.client.socket_mode_request_listeners.append(connection.on_request)
+            connection.client.on_close_listeners.append(connection.on_close)
+            self._wrap_reconnect(connection)
+            self.connections.append(connection)
+
+    def _wrap_reconnect(self, connection: PooledConnection):
+        # SDK의 자동 재연결(끊김 감지, disconnect 메시지)도 이 경로를 거치도록 인스턴스 메서드를 감쌈
+        original = connection.client.connect_to_new_endpoint
+
+        def connect_to_new_endpoint(force: bool = False):
+            if not force and connection.is_connected():
+                return
+            with self.reconnect_lock:
+                # 기다리는 동안 다른 경로(SDK 자동 재연결, 상태 확인)에서 이미 다시 연결했을 수 있음
+                if not force and connection.is_connected():
+                    return
+                others_alive = any(other.is_connected() for other in self.connections if other is not connection)
+                wait = self.last_reconnect + self.stagger_seconds - time.monotonic()
+                if others_alive and wait > 0:
+                    time.sleep(wait)
+                with connection.lock:
+                    if connection.disconnected_at is None:
+                        connection.disconnected_at = time.monotonic()
+                try:
+                    original(force=force)
+                finally:
+                    self.last_reconnect = time.monotonic()
+            if connection.is_connected():
+                with connection.lock:
+                    if connection.disconnected_at is None:
+                        return
+                    elapsed_ms = round((time.monotonic() - connection.disconnected_at) * 1000, 1)
+                    connection.disconnected_at = None
+                    connection.reconnects += 1
+                    connection.reconnect_ms = (connection.reconnect_ms + [elapsed_ms])[-20:]
+
+        connection.client.connect_to_new_endpoint = connect_to_new_endpoint
+
+    def connect(self):
+        """첫 연결은 바로 맺고, 나머지는 간격을 두고 백그라운드에서 연결"""
+        self.connections[0].started = True
+        self.connections[0].handler.connect()
+        self.last_reconnect = time.monotonic()
+        threading.Thread(target=self._connect_rest, name="socket-pool-connect", daemon=True).start()
+        threading.Thread(target=self._check_loop, name="socket-pool-check", daemon=True).start()
+
+    def _connect_rest(self):
+        for connection in self.connections[1:]:
+            time.sleep(self.stagger_seconds)
+            connection.started = True
+            try:
+                connection.handler.connect()
+            except Exception as e:
+                print(f"Socket Mode 연결 실패 ({connection.name}): {e}")
+                connection.on_close(0)
+
+    def _check_loop(self):
+        while True:
+            time.sleep(self.check_seconds)
+            for connection in self.connections:
+                connection.update_rate()
+                # SDK 자동 재연결이 실패한 채로 남은 연결은 여기서 다시 시도
+                if connection.started and not connection.is_connected():
+                    try:
+                        connection.client.connect_to_new_endpoint()
+                    except Exception as e:
+                        print(f"Socket Mode 재연결 실패 ({connection.name}): {e}")
+
+    def is_connected(self) -> bool:
+        """연결이 하나라도 살아 있으면 True (readiness 확인용)"""
+        return any(connection.is_connected() for connection in self.connections)
+
+    def close(self):
+        for connection in self.connections:
+            connection.handler.close()
+
+    def stats(self) -> Dict[str, Any]:
+        connections = {connection.name: connection.stats() for connection in self.connections}
+        return {
+            "size": self.size,
+            "connected": sum(1 for stats in connections.values() if stats["connected"]),
+            "events_per_minute": round(sum(stats["events_per_minute"] for stats in connections.values()), 1),
+            "connections": connections,
+        }
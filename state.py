@@ -0,0 +1,283 @@
+import os
+import time
+import atexit
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+from config import env_str, env_int, env_float
+
+# 상태 저장소 종류: memory (프로세스 내) 또는 sqlite (여러 프로세스 공유)
+STATE_BACKEND = env_str("STATE_BACKEND", "memory")
+STATE_DB_PATH = env_str("STATE_DB_PATH", "logs/state.db")
+# 모아둔 쓰기를 반영하는 주기(초)와 한 번에 반영할 최대 건수
+STATE_FLUSH_SECONDS = env_float("STATE_FLUSH_SECONDS", 1)
+STATE_FLUSH_BATCH = env_int("STATE_FLUSH_BATCH", 500)
+STATE_MAX_KEYS = env_int("STATE_MAX_KEYS", 100000)
+
+# log.py가 설정하는 봇 로거 (log.py가 이 모듈을 import하므로 이름으로 가져옴)
+logger = logging.getLogger("slack_bot")
+
+
+class MemoryStateBackend:
+    """프로세스 내 메모리 상태 저장소 (단일 프로세스용)"""
+
+    shared = False
+
+    def __init__(self, max_keys: int = STATE_MAX_KEYS):
+        self.max_keys = max_keys
+        self.counter_data = {}       # (네임스페이스, 키) -> 값
+        self.keys = OrderedDict()    # (네임스페이스, 키) -> 만료 시각
+        self.values = OrderedDict()  # (네임스페이스, 키) -> (값, 만료 시각)
+        self.lock = threading.Lock()
+
+    def incr(self, namespace: str, key: str, amount: float = 1):
+        with self.lock:
+            self.counter_data[(namespace, key)] = self.counter_data.get((namespace, key), 0) + amount
+
+    def get_counter(self, namespace: str, key: str) -> float:
+        with self.lock:
+            return self.counter_data.get((namespace, key), 0)
+
+    def counters(self, namespace: str) -> Dict[str, float]:
+        with self.lock:
+            return {key: value for (ns, key), value in self.counter_data.items() if ns == namespace}
+
+    def add_if_absent(self, namespace: str, key: str, ttl: float) -> bool:
+        """키가 없거나 만료됐으면 추가하고 True, 이미 있으면 False"""
+        now = time.time()
+        with self.lock:
+            expires_at = self.keys.get((namespace, key))
+            if expires_at is not None and expires_at > now:
+                return False
+            self.keys[(namespace, key)] = now + ttl
+            self.keys.move_to_end((namespace, key))
+            while len(self.keys) > self.max_keys:
+                self.keys.popitem(last=False)
+            return True
+
+    def set_value(self, namespace: str, key: str, value: str, ttl: Optional[float] = None):
+        with self.lock:
+            self.values[(namespace, key)] = (value, time.time() + ttl if ttl else None)
+            self.values.move_to_end((namespace, key))
+            while len(self.values) > self.max_keys:
+                self.values.popitem(last=False)
+
+    def get_value(self, namespace: str, key: str) -> Optional[str]:
+        with self.lock:
+            entry = self.values.get((namespace, key))
+        if entry is None or (entry[1] is not None and entry[1] <= time.time()):
+            return None
+        return entry[0]
+
+    def flush(self):
+        pass
+
+
+class SQLiteStateBackend:
+    """SQLite WAL 기반 상태 저장소 (같은 서버의 여러 봇 프로세스가 공유)
+
+    카운터 증가와 값 저장은 메모리에 모았다가 백그라운드 스레드가 한 트랜잭션으로 반영하므로
+    핸들러는 DB 잠금을 기다리지 않습니다. 중복 판별 키(add_if_absent)만 즉시 기록합니다.
+    """
+
+    shared = True
+
+    def __init__(self, path: str = STATE_DB_PATH, flush_seconds: float = STATE_FLUSH_SECONDS,
+                 flush_batch: int = STATE_FLUSH_BATCH):
+        self.path = path
+        self.flush_seconds = flush_seconds
+        self.flush_batch = flush_batch
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.pending_counters = {}   # (네임스페이스, 키) -> 반영 대기 증가량
+        self.pending_values = {}     # (네임스페이스, 키) -> (값, 만료 시각)
+        self.flushing_values = {}    # 반영 중인 값 (커밋 전까지 조회에 사용)
+        self.flush_event = threading.Event()
+        self._pid = None
+        # 종료 시 아직 반영하지 않은 카운터/세션 저장
+        atexit.register(self.flush)
+
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        conn = self._connection()
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS counters (
+                namespace TEXT NOT NULL, key TEXT NOT NULL, value REAL NOT NULL,
+                PRIMARY KEY (namespace, key)
+            );
+            CREATE TABLE IF NOT EXISTS keys (
+                namespace TEXT NOT NULL, key TEXT NOT NULL, expires_at REAL NOT NULL,
+                PRIMARY KEY (namespace, key)
+            );
+            CREATE INDEX IF NOT EXISTS idx_keys_expires_at ON keys (expires_at);
+            CREATE TABLE IF NOT EXISTS kv (
+                namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, expires_at REAL,
+                PRIMARY KEY (namespace, key)
+            );
+        """)
+
+    def _connection(self):
+        conn = getattr(self.local, "conn", None)
+        if conn is None or getattr(self.local, "pid", None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self.local.conn = conn
+            self.local.pid = os.getpid()
+        return conn
+
+    def _ensure_flusher(self):
+        # fork 이후에는 프로세스별로 반영 스레드를 띄움
+        if self._pid == os.getpid():
+            return
+        with self.lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            threading.Thread(target=self._flush_loop, name="state-flush", daemon=True).start()
+
+    def _flush_loop(self):
+        while True:
+            self.flush_event.wait(self.flush_seconds)
+            self.flush_event.clear()
+            try:
+                self.flush()
+            except sqlite3.Error as e:
+                logger.error(f"상태 저장소 반영 오류: {e}")
+
+    def _pending_size(self) -> int:
+        return len(self.pending_counters) + len(self.pending_values)
+
+    def incr(self, namespace: str, key: str, amount: float = 1):
+        self._ensure_flusher()
+        with self.lock:
+            self.pending_counters[(namespace, key)] = self.pending_counters.get((namespace, key), 0) + amount
+            if self._pending_size() >= self.flush_batch:
+                self.flush_event.set()
+
+    def get_counter(self, namespace: str, key: str) -> float:
+        row = self._connection().execute(
+            "SELECT value FROM counters WHERE namespace = ? AND key = ?", (namespace, key)
+        ).fetchone()
+        with self.lock:
+            pending = self.pending_counters.get((namespace, key), 0)
+        return (row[0] if row else 0) + pending
+
+    def counters(self, namespace: str) -> Dict[str, float]:
+        rows = self._connection().execute(
+            "SELECT key, value FROM counters WHERE namespace = ?", (namespace,)
+        ).fetchall()
+        result = dict(rows)
+        with self.lock:
+            for (ns, key), amount in self.pending_counters.items():
+                if ns == namespace:
+                    result[key] = result.get(key, 0) + amount
+        return result
+
+    def add_if_absent(self, namespace: str, key: str, ttl: float) -> bool:
+        now = time.time()
+        # 문장 하나로 처리: 없으면 추가, 만료된 키면 만료 시각만 갱신, 살아 있는 키면 변경 없음(rowcount 0)
+        cursor = self._connection().execute(
+            "INSERT INTO keys (namespace, key, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT (namespace, key) DO UPDATE SET expires_at = excluded.expires_at "
+            "WHERE keys.expires_at <= ?",
+            (namespace, key, now + ttl, now)
+        )
+        return cursor.rowcount == 1
+
+    def set_value(self, namespace: str, key: str, value: str, ttl: Optional[float] = None):
+        self._ensure_flusher()
+        with self.lock:
+            self.pending_values[(namespace, key)] = (value, time.time() + ttl if ttl else None)
+            if self._pending_size() >= self.flush_batch:
+                self.flush_event.set()
+
+    def get_value(self, namespace: str, key: str) -> Optional[str]:
+        with self.lock:
+            entry = self.pending_values.get((namespace, key)) or self.flushing_values.get((namespace, key))
+        if entry is None:
+            entry = self._connection().execute(
+                "SELECT value, expires_at FROM kv WHERE namespace = ? AND key = ?", (namespace, key)
+            ).fetchone()
+        if entry is None or (entry[1] is not None and entry[1] <= time.time()):
+            return None
+        return entry[0]
+
+    def flush(self):
+        """모아둔 카운터 증가와 값 저장을 한 트랜잭션으로 반영"""
+        with self.lock:
+            counters, self.pending_counters = self.pending_counters, {}
+            values, self.pending_values = self.pending_values, {}
+            self.flushing_values = values
+        if not counters and not values:
+            return
+        conn = self._connection()
+        now = time.time()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            if counters:
+                conn.executemany(
+                    "INSERT INTO counters (namespace, key, value) VALUES (?, ?, ?) "
+                    "ON CONFLICT (namespace, key) DO UPDATE SET value = value + excluded.value",
+                    [(ns, key, amount) for (ns, key), amount in counters.items()]
+                )
+            if values:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO kv (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                    [(ns, key, value, expires_at) for (ns, key), (value, expires_at) in values.items()]
+                )
+            # 만료된 키 정리
+            conn.execute("DELETE FROM keys WHERE expires_at <= ?", (now,))
+            conn.execute("DELETE FROM kv WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+            conn.execute("COMMIT")
+            with self.lock:
+                self.flushing_values = {}
+        except sqlite3.Error:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            # 반영 실패한 데이터는 다음 주기에 다시 시도
+            with self.lock:
+                for k, amount in counters.items():
+                    self.pending_counters[k] = self.pending_counters.get(k, 0) + amount
+                for k, entry in values.items():
+                    self.pending_values.setdefault(k, entry)
+                self.flushing_values = {}
+            raise
+
+
+def create_state_backend(kind: str = STATE_BACKEND):
+    """설정에 맞는 상태 저장소 생성"""
+    if kind == "sqlite":
+        return SQLiteStateBackend()
+    return MemoryStateBackend()
+
+
+class LazyStateBackend:
+    """처음 사용할 때 실제 저장소를 만드는 상태 저장소
+
+    import만으로 SQLite 파일을 만들거나 열지 않도록 합니다. 공유 여부(shared)는 설정으로 알 수 있으므로
+    저장소를 만들지 않고 답합니다.
+    """
+
+    def __init__(self, kind: str = STATE_BACKEND):
+        self.kind = kind
+        self.shared = kind == "sqlite"
+        self.backend = None
+        self.lock = threading.Lock()
+
+    def _backend(self):
+        if self.backend is None:
+            with self.lock:
+                if self.backend is None:
+                    self.backend = create_state_backend(self.kind)
+        return self.backend
+
+    def __getattr__(self, name):
+        return getattr(self._backend(), name)
+
+
+# 전역 상태 저장소 인스턴스
+state_backend = LazyStateBackend()
@@ -0,0 +1,92 @@
+import time
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Any, Optional
+from config import env_int
+from event_store import parse_selected_value
+
+# 분 단위 집계를 보관하는 시간(분), 링 버퍼 크기
+USAGE_ROLLUP_MINUTES = env_int("USAGE_ROLLUP_MINUTES", 60)
+
+
+class MinuteBucket:
+    __slots__ = ("minute", "actions", "categories", "users")
+
+    def __init__(self):
+        self.minute = -1
+        self.actions = Counter()     # 액션 종류 -> 건수
+        self.categories = Counter()  # (과정, 카테고리) -> 건수
+        self.users = set()
+
+    def reset(self, minute: int):
+        self.minute = minute
+        self.actions = Counter()
+        self.categories = Counter()
+        self.users = set()
+
+
+class UsageRollup:
+    """최근 N분 사용량을 분 단위로 집계하는 링 버퍼
+
+    분 번호(epoch // 60)를 버퍼 크기로 나눈 위치에 기록하고, 위치의 분 번호가 다르면
+    (N분 이상 지난 칸이면) 비우고 다시 씁니다. 기록은 O(1)이고 파일 I/O가 없으며,
+    조회할 때만 최근 N분 칸을 합칩니다. 프로세스별 집계이므로 HTTP 모드에서는 워커별 값입니다.
+    """
+
+    def __init__(self, minutes: int = USAGE_ROLLUP_MINUTES):
+        self.minutes = minutes
+        self.buckets = [MinuteBucket() for _ in range(minutes)]
+        self.lock = threading.Lock()
+
+    def record(self, action_type: str, user_id: Optional[str], selected_value: Optional[str] = None,
+               now: float = None):
+        minute = int((now or time.time()) // 60)
+        course, category = parse_selected_value(selected_value)
+        with self.lock:
+            bucket = self.buckets[minute % self.minutes]
+            if bucket.minute != minute:
+                bucket.reset(minute)
+            bucket.actions[action_type] += 1
+            if course:
+                bucket.categories[(course, category or "")] += 1
+            if user_id:
+                bucket.users.add(user_id)
+
+    def snapshot(self, now: float = None) -> Dict[str, Any]:
+        """최근 N분 분당 건수, 액션/과정/카테고리별 합계, 고유 사용자 수"""
+        current = int((now or time.time()) // 60)
+        oldest = current - self.minutes + 1
+        per_minute = []
+        actions = Counter()
+        categories = Counter()
+        users = set()
+        with self.lock:
+            for bucket in self.buckets:
+                if bucket.minute < oldest or bucket.minute > current:
+                    continue
+                per_minute.append({
+                    "minute": datetime.fromtimestamp(bucket.minute * 60).isoformat(timespec="minutes"),
+                    "total": sum(bucket.actions.values()),
+                    "actions": dict(bucket.actions),
+                    "unique_users": len(bucket.users),
+                })
+                actions.update(bucket.actions)
+                categories.update(bucket.categories)
+                users.update(bucket.users)
+        per_minute.sort(key=lambda item: item["minute"])
+        by_course = {}
+        for (course, category), count in categories.most_common():
+            by_course.setdefault(course, {})[category or "(전체)"] = count
+        return {
+            "window_minutes": self.minutes,
+            "total": sum(actions.values()),
+            "unique_users": len(users),
+            "actions": dict(actions.most_common()),
+            "courses": by_course,
+            "per_minute": per_minute,
+        }
+
+
+# 전역 사용량 집계 인스턴스
+usage_rollup = UsageRollup()
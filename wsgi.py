@@ -0,0 +1,40 @@
+import os
+import sys
+import importlib
+from slack_bolt.adapter.wsgi import SlackRequestHandler
+from config import env_str
+from health import health
+from log import bot_logger
+
+# HTTP 모드로 실행할 봇 모듈 (main_case1: 2단계, main_case2: 3단계)
+FAQ_BOT_MODULE = env_str("FAQ_BOT_MODULE", "main_case2")
+
+bot = importlib.import_module(FAQ_BOT_MODULE)
+
+# pre-fork 서버(gunicorn preload_app)에서는 마스터가 데이터 로드만 한 번 실행하고
+# 워커들은 로드된 FAQ 스냅샷과 화면 블록을 copy-on-write로 공유
+bot.warm_up()
+bot.faq_store.freeze()
+
+# 마스터에서 쌓인 이벤트는 fork 전에 저장 (워커마다 복사되어 중복 저장되지 않도록)
+bot_logger.prepare_fork()
+
+health.mark_ready()
+
+
+def start_worker(worker_id=None):
+    """워커 프로세스에서 로그 파일을 분리하고 백그라운드 스레드 시작 (gunicorn post_fork 훅에서 호출)"""
+    if worker_id is not None:
+        bot_logger.reopen_for_worker(worker_id)
+    bot_logger.start()
+    bot.start_background()
+
+
+# gunicorn 마스터가 preload 중이면 fork 이후 post_fork 훅에서 시작하고,
+# 이미 워커 안에서 로드됐거나(preload 끔) 다른 WSGI 서버면 바로 시작
+if os.environ.get("FAQ_WORKER_ID") or "gunicorn" not in sys.modules:
+    start_worker(os.environ.get("FAQ_WORKER_ID"))
+
+# Slack Request URL 엔드포인트 (요청 서명 검증은 Bolt App의 signing secret으로 처리)
+# /healthz, /readyz는 같은 포트에서 헬스 체크로 응답
+application = health.wsgi(SlackRequestHandler(bot.app))